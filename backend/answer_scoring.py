@@ -0,0 +1,123 @@
+"""
+Scoring of interview answers.
+
+Each answer is scored (rubric scores plus coaching feedback) in the
+background as soon as it is submitted, and the result is stored on its
+transcript item. The summary waits for scoring still in flight, then scores
+whatever is left (background scoring failed, timed out or was shed)
+concurrently, keeping transcript order.
+"""
+import os
+import asyncio
+
+from backend.executors import ExecutorSaturated
+from backend.session_store import SessionConflict
+
+# Answers scored in parallel per summary (LLM calls still go through the rate limiter and scheduler)
+SUMMARY_SCORING_CONCURRENCY = int(os.getenv("SUMMARY_SCORING_CONCURRENCY", "4"))
+# Seconds the summary waits for background scoring before scoring the answers itself
+BACKGROUND_SCORING_WAIT = float(os.getenv("BACKGROUND_SCORING_WAIT", "30"))
+
+
+class AnswerScorer:
+    """
+    score(question, answer) returns the rubric scores, a comment and a
+    "feedback" field; on failure its comment starts with "Scoring failed".
+    Background scoring runs on executor (a BoundedExecutor).
+    """
+
+    def __init__(self, store, executor, score, concurrency: int = SUMMARY_SCORING_CONCURRENCY):
+        self.store = store
+        self.executor = executor
+        self.score = score
+        self.concurrency = concurrency
+        # In-flight background scoring keyed by (session_id, question index)
+        self._futures = {}
+
+    def _score_answer(self, session_id: str, idx: int, question: str, answer: str):
+        """
+        Score one answer and store the result on its transcript item.
+        """
+        try:
+            assessment = self.score(question, answer)
+            if assessment.get("comment", "").startswith("Scoring failed"):
+                return  # Leave it to the summary to try again
+            feedback = assessment.pop("feedback")
+
+            def store(session):
+                item = session["transcript"][idx]
+                if item.get("answer") != answer:
+                    raise SessionConflict("Answer was resubmitted")  # Its own task scores the new one
+                item["score"] = assessment
+                item["feedback"] = feedback
+
+            self.store.update(session_id, store)
+        except (KeyError, SessionConflict):
+            pass
+        except Exception as e:
+            print(f"Background scoring failed for session {session_id}, question {idx}: {e}")
+
+    def start(self, session_id: str, idx: int, item: dict):
+        """
+        Score and write feedback for a just-submitted answer while the interview
+        continues, so the summary only has to aggregate.
+        """
+        key = (session_id, idx)
+        try:
+            future = self.executor.submit(self._score_answer, session_id, idx, item["question"], item["answer"])
+        except ExecutorSaturated:
+            print(f"LLM executor busy, leaving question {idx} of session {session_id} to the summary")
+            return
+        self._futures[key] = future
+
+        def forget(done):
+            # A resubmitted answer may already have replaced this entry
+            if self._futures.get(key) is done:
+                del self._futures[key]
+
+        future.add_done_callback(forget)
+
+    async def wait(self, session_id: str, timeout: float = BACKGROUND_SCORING_WAIT):
+        pending = [asyncio.wrap_future(future) for (sid, _), future in list(self._futures.items()) if sid == session_id]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    @staticmethod
+    def _is_scored(item: dict) -> bool:
+        return "answer" not in item or (item.get("score") is not None and "feedback" in item)
+
+    def assess(self, item: dict):
+        """
+        Score one Q&A pair and attach its feedback. Returns (enhanced_item, score),
+        with score None for unanswered questions.
+        """
+        enhanced_item = item.copy()
+        score = enhanced_item.pop("score", None)
+        if "answer" not in item:  # Only process completed Q&A pairs
+            return enhanced_item, None
+        if self._is_scored(item):
+            return enhanced_item, score  # Already scored in the background
+        # Score the answer and generate feedback in one call (falls back to default scores on failure)
+        assessment = self.score(item["question"], item["answer"])
+        enhanced_item["feedback"] = assessment.pop("feedback")
+        return enhanced_item, assessment
+
+    async def assess_transcript(self, transcript: list):
+        """
+        Assess every transcript item. Answers that still need scoring run on
+        the executor, at most `concurrency` at once; ExecutorSaturated is
+        raised if it is full. Returns (enhanced_transcript, scores) in
+        transcript order.
+        """
+        limit = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def assess(item):
+            if self._is_scored(item):
+                return self.assess(item)  # No LLM call needed
+            async with limit:
+                return await self.executor.run(self.assess, item)
+
+        results = await asyncio.gather(*(assess(item) for item in transcript))
+        enhanced_transcript = [enhanced_item for enhanced_item, _ in results]
+        scores = [score for _, score in results if score is not None]
+        return enhanced_transcript, scores
@@ -1,17 +1,16 @@
-import json
-from backend.llm_client import model
+from backend.llm_client import generate_json_content
+from backend.llm_scheduler import BATCH
+from backend.llm_schemas import ToneAnalysis
+from backend.token_budget import budget_for, truncate_words
 
 def detect_tone_and_suggest_style(answer: str) -> dict:
     """
     Use Gemini to detect tone/confidence and suggest agent style.
     """
+    budget = budget_for("tone_analysis")
+    answer = truncate_words(answer, budget["answer"])
     prompt = f"""Analyze tone and suggest interviewer style for: "{answer}"
 
 Return JSON: {{"tone": "confident/unsure", "suggestion": "supportive/formal/challenging"}}"""
 
-    response = model.generate_content(prompt)
-
-    try:
-        return json.loads(response.text.replace("```json", "").replace("```", "").strip())
-    except:
-        return {"error": "Could not parse Gemini response", "raw_output": response.text}
+    return generate_json_content(prompt, schema=ToneAnalysis, max_tokens=budget["max_tokens"], priority=BATCH)
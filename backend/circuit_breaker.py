@@ -0,0 +1,159 @@
+"""
+Per-model circuit breakers for the Groq fallback chain.
+
+Each model keeps a rolling window of call outcomes and latencies. When the
+error rate (slow calls count as errors) crosses the threshold the breaker
+opens and the model is skipped; after a cool-down one probe request is let
+through (half-open) and its outcome decides whether the breaker closes again.
+"""
+import os
+import time
+import threading
+from collections import deque
+
+CIRCUIT_WINDOW_SECONDS = float(os.getenv("CIRCUIT_WINDOW_SECONDS", "120"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "3"))
+CIRCUIT_ERROR_RATE = float(os.getenv("CIRCUIT_ERROR_RATE", "0.5"))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "20"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+# Decommissioned or unknown models are not worth probing often
+CIRCUIT_FATAL_OPEN_SECONDS = float(os.getenv("CIRCUIT_FATAL_OPEN_SECONDS", "600"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _percentile(values, pct: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, clock=time.monotonic):
+        self.name = name
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.open_seconds = CIRCUIT_OPEN_SECONDS
+        self.probe_started_at = None
+        self.last_error = None
+        self._outcomes = deque()  # (timestamp, failed, latency)
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > CIRCUIT_WINDOW_SECONDS:
+            self._outcomes.popleft()
+
+    def _open(self, now: float, open_seconds: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.open_seconds = open_seconds
+        self.probe_started_at = None
+
+    def allow_request(self) -> bool:
+        """
+        Whether a call may be sent to this model right now.
+        """
+        with self._lock:
+            now = self.clock()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if now - self.opened_at < self.open_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self.probe_started_at = None
+            # Half-open: let a single probe through (a stale probe is replaced)
+            if self.probe_started_at is None or now - self.probe_started_at > self.open_seconds:
+                self.probe_started_at = now
+                return True
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            now = self.clock()
+            slow = latency > CIRCUIT_SLOW_CALL_SECONDS
+            self._outcomes.append((now, slow, latency))
+            self._prune(now)
+            if self.state == HALF_OPEN:
+                if slow:
+                    self._open(now, CIRCUIT_OPEN_SECONDS)
+                else:
+                    self.state = CLOSED
+                    self.probe_started_at = None
+                    self._outcomes.clear()
+                    self._outcomes.append((now, False, latency))
+                return
+            self._evaluate(now)
+
+    def record_failure(self, latency: float = 0.0, error: str = None, fatal: bool = False):
+        with self._lock:
+            now = self.clock()
+            self.last_error = error
+            self._outcomes.append((now, True, latency))
+            self._prune(now)
+            if fatal:
+                self._open(now, CIRCUIT_FATAL_OPEN_SECONDS)
+            elif self.state == HALF_OPEN:
+                self._open(now, CIRCUIT_OPEN_SECONDS)
+            else:
+                self._evaluate(now)
+
+    def _evaluate(self, now: float):
+        if self.state != CLOSED or len(self._outcomes) < CIRCUIT_MIN_CALLS:
+            return
+        failures = sum(1 for _, failed, _ in self._outcomes if failed)
+        if failures / len(self._outcomes) >= CIRCUIT_ERROR_RATE:
+            print(f"Circuit opened for model {self.name} ({failures}/{len(self._outcomes)} failed or slow calls)")
+            self._open(now, CIRCUIT_OPEN_SECONDS)
+
+    def latency_percentile(self, pct: float):
+        with self._lock:
+            self._prune(self.clock())
+            return _percentile([latency for _, failed, latency in self._outcomes if not failed], pct)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, failed, _ in self._outcomes if failed)
+            latencies = [latency for _, failed, latency in self._outcomes if not failed]
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.open_seconds - (now - self.opened_at)), 1)
+            return {
+                "state": self.state,
+                "calls_in_window": calls,
+                "error_rate": round(failures / calls, 3) if calls else 0.0,
+                "latency_p50": _percentile(latencies, 50),
+                "latency_p95": _percentile(latencies, 95),
+                "retry_in_seconds": retry_in,
+                "last_error": self.last_error
+            }
+
+
+class CircuitBreakerRegistry:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, clock=self.clock)
+            return self._breakers[name]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            names = list(self._breakers)
+        return {name: self.get(name).snapshot() for name in names}
+
+
+# Global registry, one breaker per model name
+breakers = CircuitBreakerRegistry()
@@ -0,0 +1,144 @@
+"""
+Bounded executors for blocking work called from async request handlers.
+
+The event loop must never block on synchronous Groq calls, PyMuPDF or
+pymongo. Each kind of blocking work runs on its own sized pool:
+
+- llm_executor:   synchronous LLM calls (parsing, skills comparison, scoring)
+- pdf_executor:   CPU-bound PDF text extraction, in worker processes
+- mongo_executor: pymongo reads/writes and session store operations
+
+Every pool also limits how many tasks may wait for a worker. When the
+queue is full, submit() raises ExecutorSaturated right away. The API turns
+this into 503 + Retry-After, so a burst is shed quickly instead of piling
+up behind slow calls.
+"""
+import os
+import math
+import time
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from backend.metrics import EXECUTOR_QUEUE_SECONDS, EXECUTOR_REJECTED
+
+# Seconds clients are told to wait before retrying a rejected request
+EXECUTOR_RETRY_AFTER = float(os.getenv("EXECUTOR_RETRY_AFTER", "2"))
+
+
+class ExecutorSaturated(Exception):
+    """Raised when an executor's queue is full."""
+
+    def __init__(self, name: str, retry_after: float = EXECUTOR_RETRY_AFTER):
+        super().__init__(f"The {name} executor is saturated, please retry")
+        self.name = name
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        # Retry-After takes whole seconds
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def _timed(name: str, submitted_at: float, fn, *args, **kwargs):
+    EXECUTOR_QUEUE_SECONDS.observe(time.perf_counter() - submitted_at, executor=name)
+    return fn(*args, **kwargs)
+
+
+class BoundedExecutor:
+    """
+    With processes=True tasks run in a spawned process pool: fn and its
+    arguments must be picklable, and worker crashes or CPU-heavy work can't
+    take the API process down with them.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, retry_after: float = EXECUTOR_RETRY_AFTER,
+                 processes: bool = False):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self.processes = processes
+        if processes:
+            # Spawn rather than fork: the API process holds threads and Mongo/HTTP clients
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-executor")
+        self._pending = 0  # Running plus queued
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "rejected": 0}
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedule fn(*args, **kwargs), or raise ExecutorSaturated if all workers
+        are busy and max_queue tasks are already waiting.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.stats["rejected"] += 1
+                EXECUTOR_REJECTED.inc(executor=self.name)
+                raise ExecutorSaturated(self.name, self.retry_after)
+            self._pending += 1
+            self.stats["submitted"] += 1
+        try:
+            if self.processes:
+                # Queue wait can't be observed from inside another process
+                future = self._pool.submit(fn, *args, **kwargs)
+            else:
+                future = self._pool.submit(_timed, self.name, time.perf_counter(), fn, *args, **kwargs)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Await fn(*args, **kwargs) on this executor without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            pending = self._pending
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": min(pending, self.max_workers),
+            "queued": max(0, pending - self.max_workers),
+            **self.stats,
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+# Threads mostly wait in the LLM scheduler and on the network, so allow more
+# than LLM_MAX_CONCURRENCY; the scheduler still bounds requests in flight
+llm_executor = BoundedExecutor(
+    "llm", _env_int("LLM_EXECUTOR_WORKERS", 20), _env_int("LLM_EXECUTOR_QUEUE", 50))
+pdf_executor = BoundedExecutor(
+    "pdf", _env_int("PDF_EXECUTOR_WORKERS", os.cpu_count() or 2), _env_int("PDF_EXECUTOR_QUEUE", 8), processes=True)
+mongo_executor = BoundedExecutor(
+    "mongo", _env_int("MONGO_EXECUTOR_WORKERS", 16), _env_int("MONGO_EXECUTOR_QUEUE", 200))
+
+EXECUTORS = (llm_executor, pdf_executor, mongo_executor)
+
+
+def snapshot() -> dict:
+    return {executor.name: executor.snapshot() for executor in EXECUTORS}
+
+
+def shutdown(wait: bool = True):
+    for executor in EXECUTORS:
+        executor.shutdown(wait=wait)
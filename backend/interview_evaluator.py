@@ -1,9 +1,9 @@
-import json
-import re
 from typing import Dict, List, Tuple, Any
-from backend.llm_client import model
+from backend.llm_client import generate_json_content
+from backend.llm_scheduler import BATCH
+from backend.llm_schemas import QuestionConsistency, HallucinationCheck, FeedbackQuality
+from backend.token_budget import budget_for, trim_to_budget, truncate_words
 from backend.scoring_engine import score_candidate_answer
-from backend.feedback_generator import generate_feedback
 from datetime import datetime
 
 class InterviewEvaluator:
@@ -19,10 +19,11 @@ class InterviewEvaluator:
         Evaluate if questions are consistent with resume and job description.
         """
         try:
+            budget = budget_for("question_consistency")
             prompt = f"""Evaluate the consistency of these interview questions with the provided resume and job description.
 
-Resume: {resume_text[:1000]}...
-Job Description: {jd_text[:1000]}...
+Resume: {trim_to_budget(resume_text, budget["resume"])}
+Job Description: {trim_to_budget(jd_text, budget["jd"])}
 
 Questions:
 {chr(10).join([f"{i+1}. {q}" for i, q in enumerate(questions)])}
@@ -43,30 +44,10 @@ Return JSON format:
     "recommendations": ["Suggestions for improvement"]
 }}"""
 
-            response = model.generate_content(prompt)
-            
-            # Clean the response - handle various formats
-            json_text = response.text.strip()
-            
-            # Remove markdown code blocks
-            if json_text.startswith("```json"):
-                json_text = json_text[7:]
-            elif json_text.startswith("```"):
-                json_text = json_text[3:]
-            if json_text.endswith("```"):
-                json_text = json_text[:-3]
-            
-            # Find the first occurrence of { and last occurrence of }
-            start_idx = json_text.find('{')
-            end_idx = json_text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                json_text = json_text[start_idx:end_idx + 1]
-            else:
-                raise ValueError("No valid JSON object found in response")
-            
-            json_text = json_text.strip()
-            result = json.loads(json_text)
+            result = generate_json_content(prompt, schema=QuestionConsistency, cache=True, max_tokens=budget["max_tokens"],
+                                           priority=BATCH)
+            if "error" in result:
+                return {"error": f"Consistency evaluation failed: {result['error']}"}
             return result
         except Exception as e:
             return {"error": f"Consistency evaluation failed: {str(e)}"}
@@ -76,6 +57,7 @@ Return JSON format:
         Detect potential hallucinations in AI-generated content.
         """
         try:
+            budget = budget_for("hallucination_check")
             prompt = f"""Analyze this AI-generated content for potential hallucinations or fabricated information.
 
 When checking if a claim is supported by the source materials (resume, job description):
@@ -85,11 +67,11 @@ When checking if a claim is supported by the source materials (resume, job descr
 - Only flag as “unsupported_claim” if you are confident the claim is not present in any form.
 
 AI Output:
-{ai_output}
+{truncate_words(ai_output, budget["output"])}
 
 Source Materials:
-Resume: {source_materials.get('resume', '')[:800]}...
-Job Description: {source_materials.get('jd', '')[:800]}...
+Resume: {trim_to_budget(source_materials.get('resume', ''), budget["resume"])}
+Job Description: {trim_to_budget(source_materials.get('jd', ''), budget["jd"])}
 
 Check for:
 1. Claims not supported by source materials
@@ -107,30 +89,10 @@ Return JSON:
     "recommendations": ["How to improve"]
 }}"""
 
-            response = model.generate_content(prompt)
-            
-            # Clean the response - handle various formats
-            json_text = response.text.strip()
-            
-            # Remove markdown code blocks
-            if json_text.startswith("```json"):
-                json_text = json_text[7:]
-            elif json_text.startswith("```"):
-                json_text = json_text[3:]
-            if json_text.endswith("```"):
-                json_text = json_text[:-3]
-            
-            # Find the first occurrence of { and last occurrence of }
-            start_idx = json_text.find('{')
-            end_idx = json_text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                json_text = json_text[start_idx:end_idx + 1]
-            else:
-                raise ValueError("No valid JSON object found in response")
-            
-            json_text = json_text.strip()
-            result = json.loads(json_text)
+            result = generate_json_content(prompt, schema=HallucinationCheck, cache=True, max_tokens=budget["max_tokens"],
+                                           priority=BATCH)
+            if "error" in result:
+                return {"error": f"Hallucination detection failed: {result['error']}"}
             return result
         except Exception as e:
             return {"error": f"Hallucination detection failed: {str(e)}"}
@@ -202,10 +164,12 @@ Return JSON:
         Evaluate the quality and usefulness of generated feedback.
         """
         try:
+            budget = budget_for("feedback_quality")
+            per_feedback_budget = budget["feedback"] // max(1, min(len(feedback_list), 5))
             prompt = f"""Evaluate the quality of these AI-generated feedback responses.
 
 Feedback Samples:
-{chr(10).join([f"{i+1}. {feedback}" for i, feedback in enumerate(feedback_list[:5])])}
+{chr(10).join([f"{i+1}. {truncate_words(feedback, per_feedback_budget)}" for i, feedback in enumerate(feedback_list[:5])])}
 
 Rate each feedback on:
 1. Specificity (1-5): How specific and actionable is the feedback?
@@ -224,30 +188,10 @@ Return JSON:
     "improvement_suggestions": ["How to improve feedback quality"]
 }}"""
 
-            response = model.generate_content(prompt)
-            
-            # Clean the response - handle various formats
-            json_text = response.text.strip()
-            
-            # Remove markdown code blocks
-            if json_text.startswith("```json"):
-                json_text = json_text[7:]
-            elif json_text.startswith("```"):
-                json_text = json_text[3:]
-            if json_text.endswith("```"):
-                json_text = json_text[:-3]
-            
-            # Find the first occurrence of { and last occurrence of }
-            start_idx = json_text.find('{')
-            end_idx = json_text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                json_text = json_text[start_idx:end_idx + 1]
-            else:
-                raise ValueError("No valid JSON object found in response")
-            
-            json_text = json_text.strip()
-            result = json.loads(json_text)
+            result = generate_json_content(prompt, schema=FeedbackQuality, cache=True, max_tokens=budget["max_tokens"],
+                                           priority=BATCH)
+            if "error" in result:
+                return {"error": f"Feedback quality evaluation failed: {result['error']}"}
             return result
         except Exception as e:
             return {"error": f"Feedback quality evaluation failed: {str(e)}"}
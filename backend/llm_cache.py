@@ -0,0 +1,212 @@
+"""
+Content-addressed cache for LLM responses.
+
+Responses are keyed by a hash of the request parameters (model chain,
+temperature, max_tokens, prompt) and stored in two tiers:
+
+- an in-process LRU for hot entries
+- a persistent store shared across restarts: a local SQLite file (default)
+  or a Mongo collection with a TTL index
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from backend.executors import ExecutorSaturated, mongo_executor
+from backend.lru import MemoryLRU
+
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "sqlite").lower()  # sqlite | mongo | none
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("data", "cache", "llm_cache.sqlite3"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+def make_cache_key(params: dict) -> str:
+    """Stable hash of the request parameters."""
+    encoded = json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class SQLiteCacheStore:
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class MongoCacheStore:
+    def __init__(self, collection):
+        self.collection = collection
+        # Mongo removes documents once expires_at has passed
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def get(self, key: str):
+        doc = self.collection.find_one({"_id": key}, {"value": 1, "expires_at": 1})
+        if doc is None or doc["expires_at"] < datetime.utcnow():
+            return None
+        return doc["value"]
+
+    def set(self, key: str, value: str, ttl: int):
+        self.collection.update_one(
+            {"_id": key},
+            {"$set": {"value": value, "expires_at": datetime.utcnow() + timedelta(seconds=ttl)}},
+            upsert=True
+        )
+
+    def clear(self):
+        self.collection.delete_many({})
+
+
+class LLMCache:
+    """
+    Two-tier response cache with hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, store=None, ttl: int = LLM_CACHE_TTL_SECONDS):
+        self.memory = MemoryLRU(max_entries)
+        self.store = store
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _read_store(self, key: str):
+        try:
+            value = self.store.get(key)
+        except Exception as e:
+            print(f"LLM cache read failed: {e}")
+            self._count("errors")
+            return None
+        if value is not None:
+            self._count("disk_hits")
+            self.memory.set(key, value, self.ttl)
+        return value
+
+    def _write_store(self, key: str, value: str):
+        try:
+            self.store.set(key, value, self.ttl)
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
+            self._count("errors")
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.store is not None:
+            value = self._read_store(key)
+            if value is not None:
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value, self.ttl)
+        self._count("stores")
+        if self.store is not None:
+            self._write_store(key, value)
+
+    async def get_async(self, key: str):
+        """
+        get() for the event loop: the memory tier is checked inline and the
+        persistent store (SQLite or Mongo) is read on the mongo executor.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.store is not None:
+            try:
+                value = await mongo_executor.run(self._read_store, key)
+            except ExecutorSaturated:
+                value = None  # Treat as a miss rather than failing the request
+            if value is not None:
+                return value
+
+        self._count("misses")
+        return None
+
+    async def set_async(self, key: str, value: str):
+        """
+        set() for the event loop; the persistent write runs on the mongo executor.
+        """
+        self.memory.set(key, value, self.ttl)
+        self._count("stores")
+        if self.store is not None:
+            try:
+                await mongo_executor.run(self._write_store, key, value)
+            except ExecutorSaturated:
+                pass  # Still cached in memory
+
+    def clear(self):
+        self.memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["evictions"] = self.memory.evictions
+        stats["memory_entries"] = len(self.memory)
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        stats["backend"] = LLM_CACHE_BACKEND
+        return stats
+
+
+def create_cache_store(backend: str = LLM_CACHE_BACKEND):
+    try:
+        if backend == "sqlite":
+            return SQLiteCacheStore(LLM_CACHE_PATH)
+        if backend == "mongo":
+            from backend.mongo import db
+            return MongoCacheStore(db["llm_cache"])
+    except Exception as e:
+        print(f"LLM cache store unavailable ({backend}), using memory only: {e}")
+    return None
+
+
+# Global cache instance
+llm_cache = LLMCache(store=create_cache_store())
@@ -4,7 +4,24 @@ import re
 import requests
 import time
 import random
+import asyncio
+import threading
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from backend.rate_limiter import limiter, estimate_tokens, RateLimitExceeded
+from backend.llm_cache import llm_cache, make_cache_key
+from backend.circuit_breaker import breakers
+from backend.single_flight import SingleFlight
+from backend.executors import llm_executor, ExecutorSaturated
+from backend.token_budget import DEFAULT_MAX_TOKENS
+from backend.llm_scheduler import scheduler, INTERACTIVE, STANDARD, BATCH
+from backend.metrics import (LLM_REQUEST_SECONDS, LLM_QUEUE_SECONDS, LLM_RETRIES, LLM_RATE_LIMITED,
+                             LLM_FALLBACKS, LLM_TOKENS)
+
+try:
+    import httpx  # Optional: enables native async requests and HTTP/2
+except ImportError:
+    httpx = None
 
 # Commented out Gemini implementation
 # import google.generativeai as genai
@@ -17,10 +34,14 @@ from dotenv import load_dotenv
 # Groq implementation
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_BASE_URL = "https://api.groq.com/openai/v1/chat/completions"
+DEFAULT_GROQ_BASE_URL = "https://api.groq.com/openai/v1/chat/completions"
+# Override to point at a compatible server, e.g. the local mock (backend/mock_llm_server.py)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", DEFAULT_GROQ_BASE_URL)
 
 if not GROQ_API_KEY:
-    raise ValueError("GROQ_API_KEY environment variable is required")
+    if GROQ_BASE_URL == DEFAULT_GROQ_BASE_URL:
+        raise ValueError("GROQ_API_KEY environment variable is required")
+    GROQ_API_KEY = "local"
 
 # Available Groq models (all free tier)
 GROQ_MODELS = [
@@ -30,9 +51,135 @@ GROQ_MODELS = [
     "gemma2-9b-it"         # Good for coding
 ]
 
-# Rate limiting variables
-last_request_time = 0
-min_request_interval = 0.2  # 200ms between requests (increased for safety)
+# HTTP transport settings (shared, keep-alive connection pool)
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "60"))
+GROQ_POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", "10"))
+GROQ_HTTP2 = os.getenv("GROQ_HTTP2", "false").lower() in ("1", "true", "yes")
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "3"))
+
+# Request hedging: if the primary model has not answered within its recent
+# latency percentile, send the same prompt to the next model and keep
+# whichever answers first. Only call sites that pass hedge=True are hedged.
+LLM_HEDGING = os.getenv("LLM_HEDGING", "true").lower() in ("1", "true", "yes")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "3"))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+LLM_HEDGE_MAX_DELAY = float(os.getenv("LLM_HEDGE_MAX_DELAY", "10"))
+
+# Error codes meaning the model itself is gone, not just this request
+FATAL_MODEL_ERROR_CODES = ("model_decommissioned", "model_not_found")
+
+class ModelRequestError(Exception):
+    """
+    Non-retryable 4xx response from Groq (bad request, unknown or decommissioned model).
+    """
+    def __init__(self, model_name: str, status_code: int, body: str):
+        super().__init__(f"{status_code} error from {model_name}: {body[:200]}")
+        self.model_name = model_name
+        self.status_code = status_code
+        self.fatal = status_code == 404 or any(code in body for code in FATAL_MODEL_ERROR_CODES)
+
+class AllModelsFailed(Exception):
+    """
+    Every model in GROQ_MODELS failed or was skipped (open circuit).
+    """
+    def __init__(self):
+        super().__init__("All Groq models failed. Please try again later.")
+
+# Identical prompts already in flight share one Groq call
+llm_flight = SingleFlight()
+
+_http_session = None
+_http_session_lock = threading.Lock()
+_async_client = None
+_async_client_loop = None
+
+def _request_headers() -> dict:
+    return {
+        "Authorization": f"Bearer {GROQ_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide requests session so every call reuses pooled
+    keep-alive connections instead of paying TCP+TLS setup each time.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=GROQ_POOL_SIZE, pool_maxsize=GROQ_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(_request_headers())
+                _http_session = session
+    return _http_session
+
+def get_async_http_client():
+    """
+    Return the shared httpx.AsyncClient for the running event loop, or None
+    if httpx is not installed. HTTP/2 is used when GROQ_HTTP2 is set and the
+    h2 package is available.
+    """
+    global _async_client, _async_client_loop
+    if httpx is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop or _async_client.is_closed:
+        limits = httpx.Limits(max_connections=GROQ_POOL_SIZE, max_keepalive_connections=GROQ_POOL_SIZE)
+        try:
+            client = httpx.AsyncClient(http2=GROQ_HTTP2, limits=limits, headers=_request_headers(), timeout=GROQ_TIMEOUT)
+        except ImportError:
+            print("HTTP/2 requested but h2 is not installed, falling back to HTTP/1.1")
+            client = httpx.AsyncClient(limits=limits, headers=_request_headers(), timeout=GROQ_TIMEOUT)
+        _async_client = client
+        _async_client_loop = loop
+    return _async_client
+
+async def close_http_clients():
+    """
+    Close the pooled HTTP clients (called on application shutdown).
+    """
+    global _http_session, _async_client, _async_client_loop
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
+    _async_client_loop = None
+    if _http_session is not None:
+        _http_session.close()
+        _http_session = None
+
+def _retry_wait_time(attempt: int) -> float:
+    return (2 ** attempt) + random.uniform(0, 1)
+
+def _estimate_request_tokens(data: dict) -> int:
+    return sum(estimate_tokens(m.get("content", "")) for m in data.get("messages", []))
+
+def _record_usage(model_name: str, reserved_tokens: int, result: dict):
+    """
+    Charge the rate limiter with the real token usage reported by Groq.
+    """
+    usage = result.get("usage") or {}
+    for token_type in ("prompt_tokens", "completion_tokens"):
+        if usage.get(token_type):
+            LLM_TOKENS.inc(usage[token_type], model=model_name, type=token_type.split("_")[0])
+    total_tokens = usage.get("total_tokens")
+    if total_tokens:
+        limiter.consume(model_name, total_tokens - reserved_tokens)
+
+def _observe_response(model_name: str, status, request_start: float, attempt: int, max_retries: int):
+    """
+    Record latency for one request attempt, plus 429s and retries.
+    """
+    LLM_REQUEST_SECONDS.observe(time.monotonic() - request_start, model=model_name, status=status)
+    if status == 429:
+        LLM_RATE_LIMITED.inc(model=model_name)
+    retryable = status == 429 or status == "error" or (isinstance(status, int) and status >= 500)
+    if retryable and attempt < max_retries - 1:
+        LLM_RETRIES.inc(model=model_name, reason=str(status))
 
 def clean_llm_json(text: str) -> str:
     """
@@ -54,118 +201,475 @@ def clean_llm_json(text: str) -> str:
     # If no JSON braces found, return the cleaned text as is
     return cleaned
 
-def make_groq_request(data, max_retries=3):
+def make_groq_request(data, max_retries=GROQ_MAX_RETRIES, priority=STANDARD):
     """
     Make a request to Groq API with retry logic and rate limiting.
+    Each attempt waits for a scheduler slot of the given priority class.
     """
-    global last_request_time
-    
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    session = get_http_session()
+    model_name = data["model"]
+    reserved_tokens = _estimate_request_tokens(data)
     
     for attempt in range(max_retries):
+        request_start = None
         try:
-            # Rate limiting
-            current_time = time.time()
-            time_since_last = current_time - last_request_time
-            if time_since_last < min_request_interval:
-                sleep_time = min_request_interval - time_since_last
-                time.sleep(sleep_time)
-            
-            last_request_time = time.time()
-            
-            response = requests.post(GROQ_BASE_URL, headers=headers, json=data, timeout=60)
+            queued_at = time.monotonic()
+            with scheduler.slot(priority):
+                # Rate limiting (raises RateLimitExceeded if the budget won't free up in time)
+                limiter.acquire(model_name, reserved_tokens)
+                
+                request_start = time.monotonic()
+                LLM_QUEUE_SECONDS.observe(request_start - queued_at, model=model_name)
+                response = session.post(GROQ_BASE_URL, json=data, timeout=GROQ_TIMEOUT)
+            _observe_response(model_name, response.status_code, request_start, attempt, max_retries)
+            wait_time = limiter.observe_headers(model_name, response.headers, response.status_code,
+                                                default_wait=_retry_wait_time(attempt))
             
             if response.status_code == 429:
-                # Rate limit hit - exponential backoff
-                wait_time = (2 ** attempt) + random.uniform(0, 1)
-                print(f"Rate limit hit, waiting {wait_time:.2f} seconds...")
-                time.sleep(wait_time)
+                # The limiter now blocks this model until the reported reset: the
+                # next acquire() sleeps exactly that long, or raises
+                # RateLimitExceeded so the caller falls back to another model
+                print(f"Rate limit hit on {model_name}, quota resets in {wait_time:.2f} seconds...")
                 continue
-            elif response.status_code == 500:
+            elif response.status_code >= 500:
                 # Server error - retry with backoff
-                wait_time = (2 ** attempt) + random.uniform(0, 1)
+                wait_time = _retry_wait_time(attempt)
                 print(f"Server error, retrying in {wait_time:.2f} seconds...")
                 time.sleep(wait_time)
                 continue
+            elif response.status_code >= 400:
+                # Retrying the same model won't help
+                raise ModelRequestError(model_name, response.status_code, response.text)
             else:
                 response.raise_for_status()
-                return response.json()
+                result = response.json()
+                _record_usage(model_name, reserved_tokens, result)
+                return result
                 
         except requests.exceptions.RequestException as e:
+            if request_start is not None:
+                _observe_response(model_name, "error", request_start, attempt, max_retries)
             if attempt == max_retries - 1:
                 raise e
-            wait_time = (2 ** attempt) + random.uniform(0, 1)
+            wait_time = _retry_wait_time(attempt)
             print(f"Request failed, retrying in {wait_time:.2f} seconds...")
             time.sleep(wait_time)
     
     raise Exception(f"Failed after {max_retries} attempts")
 
-def generate_content(prompt: str) -> str:
+async def make_groq_request_async(data, max_retries=GROQ_MAX_RETRIES, priority=STANDARD):
+    """
+    Async counterpart of make_groq_request. Uses the pooled httpx client when
+    available, otherwise runs the sync request on the bounded LLM executor.
+    """
+    client = get_async_http_client()
+    if client is None:
+        return await llm_executor.run(make_groq_request, data, max_retries, priority)
+    
+    model_name = data["model"]
+    reserved_tokens = _estimate_request_tokens(data)
+    
+    for attempt in range(max_retries):
+        request_start = None
+        try:
+            queued_at = time.monotonic()
+            async with scheduler.slot_async(priority):
+                # Rate limiting
+                await limiter.acquire_async(model_name, reserved_tokens)
+                
+                response = None
+                try:
+                    request_start = time.monotonic()
+                    LLM_QUEUE_SECONDS.observe(request_start - queued_at, model=model_name)
+                    response = await client.post(GROQ_BASE_URL, json=data)
+                finally:
+                    if response is None:
+                        # Cancelled (e.g. the losing side of a hedge) or failed in transit
+                        limiter.release_nowait(model_name, reserved_tokens)
+            _observe_response(model_name, response.status_code, request_start, attempt, max_retries)
+            wait_time = await limiter.observe_headers_async(model_name, response.headers, response.status_code,
+                                                            default_wait=_retry_wait_time(attempt))
+            
+            if response.status_code == 429:
+                # Next acquire_async() waits until the reported reset (or reroutes)
+                print(f"Rate limit hit on {model_name}, quota resets in {wait_time:.2f} seconds...")
+                continue
+            elif response.status_code >= 500:
+                wait_time = _retry_wait_time(attempt)
+                print(f"Server error, retrying in {wait_time:.2f} seconds...")
+                await asyncio.sleep(wait_time)
+                continue
+            elif response.status_code >= 400:
+                raise ModelRequestError(model_name, response.status_code, response.text)
+            else:
+                response.raise_for_status()
+                result = response.json()
+                _record_usage(model_name, reserved_tokens, result)
+                return result
+                
+        except httpx.HTTPError as e:
+            if request_start is not None:
+                _observe_response(model_name, "error", request_start, attempt, max_retries)
+            if attempt == max_retries - 1:
+                raise e
+            wait_time = _retry_wait_time(attempt)
+            print(f"Request failed, retrying in {wait_time:.2f} seconds...")
+            await asyncio.sleep(wait_time)
+    
+    raise Exception(f"Failed after {max_retries} attempts")
+
+def _build_request_data(model_name: str, prompt: str, max_tokens: int = None, json_mode: bool = False) -> dict:
+    data = {
+        "model": model_name,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.7,
+        "max_tokens": max_tokens or DEFAULT_MAX_TOKENS
+    }
+    if json_mode:
+        # Provider-side JSON mode: the completion is guaranteed to be a JSON object
+        data["response_format"] = {"type": "json_object"}
+    return data
+
+def _cache_key(prompt: str, max_tokens: int = None, json_mode: bool = False) -> str:
+    params = _build_request_data("", prompt, max_tokens, json_mode)
+    params["model"] = GROQ_MODELS
+    return make_cache_key(params)
+
+def _record_model_failure(model_name: str, error: Exception, latency: float):
+    """
+    Log a failed model call and feed it to the model's circuit breaker.
+    """
+    print(f"❌ Model {model_name} failed: {str(error)[:50]}...")
+    LLM_FALLBACKS.inc(model=model_name, reason=type(error).__name__)
+    if isinstance(error, RateLimitExceeded):
+        # Our own budget is exhausted; the model itself is healthy
+        print(f"Rate limit budget exhausted for {model_name}, trying next model...")
+        return
+    fatal = isinstance(error, ModelRequestError) and error.fatal
+    breakers.get(model_name).record_failure(latency, error=str(error)[:200], fatal=fatal)
+    if "429" in str(error):
+        print(f"Rate limit hit for {model_name}, trying next model...")
+    elif "500" in str(error):
+        print(f"Server error for {model_name}, trying next model...")
+
+def generate_content(prompt: str, cache: bool = False, max_tokens: int = None, json_mode: bool = False,
+                     priority: str = STANDARD) -> str:
     """
     Generate content using Groq API with rate limiting, retry logic, and model fallback.
+    Pass cache=True to serve identical requests from the response cache,
+    max_tokens to cap the response length for the call site, and the
+    scheduler priority class (INTERACTIVE, STANDARD or BATCH).
+    Concurrent identical requests are coalesced into a single call.
     """
-    # Try different models if one fails
+    request_key = _cache_key(prompt, max_tokens, json_mode)
+    if cache:
+        cached = llm_cache.get(request_key)
+        if cached is not None:
+            return cached
+    
+    return llm_flight.do(request_key, _generate_uncached, prompt, max_tokens, json_mode, request_key if cache else None, priority)
+
+def _generate_uncached(prompt: str, max_tokens: int = None, json_mode: bool = False, cache_key: str = None,
+                       priority: str = STANDARD) -> str:
+    # Try different models if one fails, skipping models whose circuit is open
     for model_name in GROQ_MODELS:
-        data = {
-            "model": model_name,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.7,
-            "max_tokens": 4000
-        }
+        if not breakers.get(model_name).allow_request():
+            print(f"Skipping model {model_name}: circuit open")
+            LLM_FALLBACKS.inc(model=model_name, reason="circuit_open")
+            continue
+        data = _build_request_data(model_name, prompt, max_tokens, json_mode)
+        start_time = time.monotonic()
         
         try:
             print(f"Trying model: {model_name}")
-            result = make_groq_request(data)
+            result = make_groq_request(data, priority=priority)
+            breakers.get(model_name).record_success(time.monotonic() - start_time)
             print(f"✅ Success with model: {model_name}")
-            return result["choices"][0]["message"]["content"].strip()
+            text = result["choices"][0]["message"]["content"].strip()
+            if cache_key:
+                llm_cache.set(cache_key, text)
+            return text
         except Exception as e:
-            print(f"❌ Model {model_name} failed: {str(e)[:50]}...")
-            if "429" in str(e):
-                print(f"Rate limit hit for {model_name}, trying next model...")
-                continue
-            elif "500" in str(e):
-                print(f"Server error for {model_name}, trying next model...")
-                continue
+            # Try next model
+            _record_model_failure(model_name, e, time.monotonic() - start_time)
+            continue
+    
+    raise AllModelsFailed()
+
+async def generate_content_async(prompt: str, cache: bool = False, max_tokens: int = None, json_mode: bool = False,
+                                 hedge: bool = False, priority: str = STANDARD) -> str:
+    """
+    Async version of generate_content for use inside FastAPI handlers.
+    Pass hedge=True on latency-sensitive paths to race a slow model against
+    the next one in the fallback chain.
+    """
+    request_key = _cache_key(prompt, max_tokens, json_mode)
+    if cache:
+        cached = await llm_cache.get_async(request_key)
+        if cached is not None:
+            return cached
+    
+    return await llm_flight.do_async(request_key, _generate_uncached_async, prompt, max_tokens, json_mode,
+                                     request_key if cache else None, hedge, priority)
+
+def hedge_delay(model_name: str) -> float:
+    """
+    How long to wait for a model before hedging: its recent latency
+    percentile (LLM_HEDGE_PERCENTILE), clamped to the configured bounds.
+    """
+    delay = breakers.get(model_name).latency_percentile(LLM_HEDGE_PERCENTILE)
+    if delay is None:
+        delay = LLM_HEDGE_DEFAULT_DELAY
+    return min(LLM_HEDGE_MAX_DELAY, max(LLM_HEDGE_MIN_DELAY, delay))
+
+async def _call_model_async(model_name: str, prompt: str, max_tokens: int = None, json_mode: bool = False,
+                            priority: str = STANDARD) -> str:
+    data = _build_request_data(model_name, prompt, max_tokens, json_mode)
+    start_time = time.monotonic()
+    try:
+        print(f"Trying model: {model_name}")
+        result = await make_groq_request_async(data, priority=priority)
+    except ExecutorSaturated:
+        raise  # Local overload, not a model failure
+    except Exception as e:
+        _record_model_failure(model_name, e, time.monotonic() - start_time)
+        raise
+    breakers.get(model_name).record_success(time.monotonic() - start_time)
+    print(f"✅ Success with model: {model_name}")
+    return result["choices"][0]["message"]["content"].strip()
+
+async def _hedged_call_async(model_name: str, backups: list, tried: set, prompt: str,
+                             max_tokens: int = None, json_mode: bool = False, priority: str = STANDARD) -> str:
+    """
+    Call model_name; if it has not answered after hedge_delay(), also call the
+    first available backup and return whichever succeeds first. The slower
+    request is cancelled.
+    """
+    primary = asyncio.create_task(_call_model_async(model_name, prompt, max_tokens, json_mode, priority))
+    delay = hedge_delay(model_name)
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done:
+        return primary.result()
+
+    backup_name = next((m for m in backups if m not in tried and breakers.get(m).allow_request()), None)
+    if backup_name is None:
+        return await primary
+    tried.add(backup_name)
+    print(f"Hedging: {model_name} slower than {delay:.2f}s, also trying {backup_name}")
+    pending = {primary, asyncio.create_task(_call_model_async(backup_name, prompt, max_tokens, json_mode, priority))}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Cancel the loser (or both, if the caller itself was cancelled) and let
+        # it unwind, so its scheduler slot and rate limit reservation are back
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+async def _generate_uncached_async(prompt: str, max_tokens: int = None, json_mode: bool = False, cache_key: str = None,
+                                   hedge: bool = False, priority: str = STANDARD) -> str:
+    tried = set()
+    for index, model_name in enumerate(GROQ_MODELS):
+        if model_name in tried:
+            continue
+        if not breakers.get(model_name).allow_request():
+            print(f"Skipping model {model_name}: circuit open")
+            LLM_FALLBACKS.inc(model=model_name, reason="circuit_open")
+            continue
+        tried.add(model_name)
+        
+        try:
+            # Without httpx the calls run on executor threads, where a cancelled
+            # loser keeps running and spends its tokens anyway; don't hedge
+            if hedge and LLM_HEDGING and httpx is not None:
+                text = await _hedged_call_async(model_name, GROQ_MODELS[index + 1:], tried, prompt, max_tokens, json_mode,
+                                                priority)
             else:
-                # For other errors, try next model
-                continue
+                text = await _call_model_async(model_name, prompt, max_tokens, json_mode, priority)
+        except ExecutorSaturated:
+            raise  # Every other model would be rejected too; shed the request
+        except Exception:
+            continue
+        if cache_key:
+            await llm_cache.set_async(cache_key, text)
+        return text
     
-    # If all models fail, return error
-    return f"Error: All Groq models failed. Please try again later."
+    raise AllModelsFailed()
 
-def generate_json_content(prompt: str) -> dict:
+def _parse_stream_line(line: str):
     """
-    Generate content and parse as JSON using Groq.
+    Parse one SSE line from a streamed completion. Returns (done, chunk) where
+    chunk is the decoded JSON event or None.
     """
+    if not line.startswith("data:"):
+        return False, None
+    payload = line[len("data:"):].strip()
+    if payload == "[DONE]":
+        return True, None
+    return False, json.loads(payload)
+
+async def stream_content_async(prompt: str, max_tokens: int = None, priority: str = INTERACTIVE):
+    """
+    Stream completion text chunks as Groq produces them (`stream: true`).
+    Model fallback only applies until the first chunk has been yielded.
+    Without httpx the full completion is yielded as a single chunk.
+    """
+    client = get_async_http_client()
+    if client is None:
+        yield await generate_content_async(prompt, max_tokens=max_tokens, priority=priority)
+        return
+    
+    for model_name in GROQ_MODELS:
+        if not breakers.get(model_name).allow_request():
+            print(f"Skipping model {model_name}: circuit open")
+            LLM_FALLBACKS.inc(model=model_name, reason="circuit_open")
+            continue
+        data = _build_request_data(model_name, prompt, max_tokens)
+        data["stream"] = True
+        reserved_tokens = _estimate_request_tokens(data)
+        start_time = time.monotonic()
+        started = False
+        
+        try:
+            print(f"Streaming from model: {model_name}")
+            async with scheduler.slot_async(priority):
+                await limiter.acquire_async(model_name, reserved_tokens)
+                request_start = time.monotonic()
+                LLM_QUEUE_SECONDS.observe(request_start - start_time, model=model_name)
+                async with client.stream("POST", GROQ_BASE_URL, json=data) as response:
+                    await limiter.observe_headers_async(model_name, response.headers, response.status_code)
+                    if response.status_code >= 400:
+                        _observe_response(model_name, response.status_code, request_start, 0, 1)
+                        body = (await response.aread()).decode("utf-8", errors="replace")
+                        if response.status_code < 500 and response.status_code != 429:
+                            raise ModelRequestError(model_name, response.status_code, body)
+                        raise Exception(f"{response.status_code} error from {model_name}: {body[:200]}")
+
+                    async for line in response.aiter_lines():
+                        done, chunk = _parse_stream_line(line)
+                        if done:
+                            break
+                        if chunk is None:
+                            continue
+                        # Groq reports usage on the final chunk under x_groq
+                        usage = (chunk.get("x_groq") or {}).get("usage") or chunk.get("usage")
+                        if usage:
+                            _record_usage(model_name, reserved_tokens, {"usage": usage})
+                        choices = chunk.get("choices") or []
+                        text = choices[0].get("delta", {}).get("content") if choices else None
+                        if text:
+                            started = True
+                            yield text
+                    _observe_response(model_name, response.status_code, request_start, 0, 1)
+            
+            breakers.get(model_name).record_success(time.monotonic() - start_time)
+            print(f"✅ Streamed with model: {model_name}")
+            return
+        except Exception as e:
+            _record_model_failure(model_name, e, time.monotonic() - start_time)
+            if started:
+                # Part of the answer was already sent; can't switch models mid-stream
+                raise
+            continue
+    
+    raise AllModelsFailed()
+
+def extract_json(text: str):
+    """
+    Parse a JSON object from a model response. Tries a direct parse first
+    (the normal case in JSON mode) and only then strips code fences and
+    surrounding prose.
+    """
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(clean_llm_json(text))
+
+def _parse_json_response(text: str, schema=None) -> dict:
+    result = extract_json(text)
+    if not isinstance(result, dict):
+        raise ValueError("Expected a JSON object")
+    if schema is not None:
+        # by_alias keeps the keys the prompt asked for (e.g. "Work Experience")
+        result = schema.model_validate(result).model_dump(by_alias=True)
+    return result
+
+def _json_repair_prompt(response_text: str, error: Exception, schema=None) -> str:
+    schema_hint = ""
+    if schema is not None:
+        schema_hint = f"\nIt must match this JSON schema:\n{json.dumps(schema.model_json_schema())}\n"
+    return f"""The following response was supposed to be a single JSON object but it is invalid.
+Error: {str(error)[:300]}
+{schema_hint}
+Return ONLY the corrected JSON object, with no explanations or code fences.
+
+Response to fix:
+{response_text}"""
+
+def generate_json_content(prompt: str, schema=None, cache: bool = False, max_tokens: int = None,
+                          priority: str = STANDARD) -> dict:
+    """
+    Generate content in provider JSON mode and parse it, validating against a
+    pydantic schema when given. An invalid response gets one targeted repair
+    request; only validated results are cached.
+    """
+    cache_key = make_cache_key({
+        "request": _cache_key(prompt, max_tokens, json_mode=True),
+        "schema": schema.__name__ if schema is not None else None
+    })
+    if cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+    
     try:
-        response_text = generate_content(prompt)
-        cleaned = clean_llm_json(response_text)
-        return json.loads(cleaned)
-    except json.JSONDecodeError as e:
-        print(f"JSON decode error: {e}")
-        return {
-            "error": "Invalid JSON from Groq",
-            "raw_output": response_text if 'response_text' in locals() else "No response"
-        }
+        response_text = generate_content(prompt, max_tokens=max_tokens, json_mode=True, priority=priority)
+    except AllModelsFailed as e:
+        return {"error": f"Generation failed: {e}"}
+    
+    try:
+        result = _parse_json_response(response_text, schema)
     except Exception as e:
-        print(f"Error generating JSON content: {e}")
-        return {
-            "error": f"Generation failed: {str(e)}"
-        }
+        print(f"Invalid JSON from Groq ({e}), requesting one repair...")
+        try:
+            repaired_text = generate_content(_json_repair_prompt(response_text, e, schema), max_tokens=max_tokens,
+                                             json_mode=True, priority=priority)
+            result = _parse_json_response(repaired_text, schema)
+        except Exception as repair_error:
+            print(f"JSON repair failed: {repair_error}")
+            return {
+                "error": "Invalid JSON from Groq",
+                "raw_output": response_text
+            }
+    
+    if cache:
+        llm_cache.set(cache_key, json.dumps(result))
+    return result
+
+class Response:
+    def __init__(self, text):
+        self.text = text
 
 # Create a model object for compatibility with existing code
 class GroqModel:
-    def generate_content(self, prompt: str):
-        class Response:
-            def __init__(self, text):
-                self.text = text
-        
-        result = generate_content(prompt)
+    def generate_content(self, prompt: str, cache: bool = False, max_tokens: int = None, priority: str = STANDARD):
+        result = generate_content(prompt, cache=cache, max_tokens=max_tokens, priority=priority)
+        return Response(result)
+
+    async def generate_content_async(self, prompt: str, cache: bool = False, max_tokens: int = None, hedge: bool = False,
+                                     priority: str = STANDARD):
+        result = await generate_content_async(prompt, cache=cache, max_tokens=max_tokens, hedge=hedge, priority=priority)
         return Response(result)
 
 model = GroqModel()  
@@ -0,0 +1,148 @@
+"""
+Priority-aware scheduling of outgoing LLM requests.
+
+Every Groq request runs inside a scheduler slot. Slots are limited overall
+(LLM_MAX_CONCURRENCY) and per priority class, and waiting requests are
+served highest priority first (FIFO within a class). Live interview calls
+therefore jump ahead of batch work such as summary scoring and evaluations,
+and batch work can never hold more than its own share of connections or
+in-flight rate budget.
+
+Sync callers (threads) and async callers (event loop) share one queue.
+"""
+import os
+import heapq
+import asyncio
+import itertools
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import Future
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"  # Live interview: questions, greeting
+STANDARD = "standard"        # User is waiting, but not mid-interview: upload parsing
+BATCH = "batch"              # Summary scoring, evaluations, regeneration
+
+PRIORITIES = (INTERACTIVE, STANDARD, BATCH)
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", os.getenv("GROQ_POOL_SIZE", "10")))
+
+
+def load_class_limits() -> dict:
+    return {
+        INTERACTIVE: int(os.getenv("LLM_CONCURRENCY_INTERACTIVE", str(LLM_MAX_CONCURRENCY))),
+        STANDARD: int(os.getenv("LLM_CONCURRENCY_STANDARD", "6")),
+        BATCH: int(os.getenv("LLM_CONCURRENCY_BATCH", "4")),
+    }
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, class_limits: dict = None):
+        self.max_concurrency = max_concurrency
+        self.class_limits = class_limits or load_class_limits()
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._total = 0
+        self._waiting = []  # heap of (rank, seq, priority, future)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = {priority: {"started": 0, "queued": 0} for priority in PRIORITIES}
+
+    def _rank(self, priority: str) -> int:
+        if priority not in self._running:
+            raise ValueError(f"Unknown LLM priority: {priority}")
+        return PRIORITIES.index(priority)
+
+    def _dispatch(self):
+        # Start waiters in priority order while there is room; waiters whose
+        # class is at its limit stay queued without blocking lower classes
+        blocked = []
+        while self._waiting and self._total < self.max_concurrency:
+            item = heapq.heappop(self._waiting)
+            priority, future = item[2], item[3]
+            if self._running[priority] >= self.class_limits[priority]:
+                blocked.append(item)
+                continue
+            if not future.set_running_or_notify_cancel():
+                continue  # Caller gave up while queued
+            self._running[priority] += 1
+            self._total += 1
+            self.stats[priority]["started"] += 1
+            future.set_result(None)
+        for item in blocked:
+            heapq.heappush(self._waiting, item)
+
+    def _enqueue(self, priority: str) -> Future:
+        future = Future()
+        with self._lock:
+            heapq.heappush(self._waiting, (self._rank(priority), next(self._seq), priority, future))
+            self._dispatch()
+            if not future.done():
+                self.stats[priority]["queued"] += 1
+        return future
+
+    def _release(self, priority: str):
+        with self._lock:
+            self._running[priority] -= 1
+            self._total -= 1
+            self._dispatch()
+
+    def _abandon(self, future: Future, priority: str):
+        # The waiter was interrupted: drop it from the queue, or give back the
+        # slot if it had already been granted
+        if not future.cancel():
+            self._release(priority)
+
+    @contextmanager
+    def slot(self, priority: str = STANDARD):
+        """
+        Block the calling thread until a slot for this priority is free.
+        """
+        future = self._enqueue(priority)
+        try:
+            future.result()
+        except BaseException:
+            self._abandon(future, priority)
+            raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    @asynccontextmanager
+    async def slot_async(self, priority: str = STANDARD):
+        """
+        Async variant of slot(); waits without blocking the event loop.
+        """
+        future = self._enqueue(priority)
+        try:
+            await asyncio.wrap_future(future)
+        except BaseException:
+            self._abandon(future, priority)
+            raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waiting = {priority: 0 for priority in PRIORITIES}
+            for _, _, priority, future in self._waiting:
+                if not future.cancelled():
+                    waiting[priority] += 1
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": self._total,
+                "classes": {
+                    priority: {
+                        "limit": self.class_limits[priority],
+                        "running": self._running[priority],
+                        "waiting": waiting[priority],
+                        **self.stats[priority],
+                    }
+                    for priority in PRIORITIES
+                },
+            }
+
+
+scheduler = LLMScheduler()
@@ -0,0 +1,120 @@
+"""
+Pydantic schemas for structured (JSON) LLM responses, one per call site.
+
+generate_json_content validates responses against these models; a response
+that fails validation gets a single targeted repair attempt.
+"""
+from typing import Annotated, Any, Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Rubric score on the 0-5 scale; integers stay integers
+RubricScore = Annotated[Union[int, float], Field(ge=0, le=5)]
+
+
+def _as_list(value):
+    # A missing section becomes [], a single entry a one-item list
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class ResumeParse(BaseModel):
+    # Keys are the field names the parsing prompt asks for. Name and Skills
+    # must be present so a wrong-shaped or truncated parse gets repaired;
+    # the entries inside each section are left to the model
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    name: Optional[str] = Field(alias="Name")
+    email: Optional[str] = Field(None, alias="Email")
+    phone: Optional[Union[str, int]] = Field(None, alias="Phone")
+    skills: Union[List[Any], Dict[str, Any]] = Field(alias="Skills")
+    work_experience: List[Any] = Field(default_factory=list, alias="Work Experience")
+    projects: List[Any] = Field(default_factory=list, alias="Projects")
+    education: List[Any] = Field(default_factory=list, alias="Education")
+    certifications: List[Any] = Field(default_factory=list, alias="Certifications")
+    awards: List[Any] = Field(default_factory=list, alias="Awards")
+    patents: List[Any] = Field(default_factory=list, alias="Patents")
+    hobbies: List[Any] = Field(default_factory=list, alias="Hobbies")
+
+    @field_validator("work_experience", "projects", "education", "certifications", "awards", "patents", "hobbies",
+                     mode="before")
+    @classmethod
+    def sections_as_lists(cls, value):
+        return _as_list(value)
+
+
+class JDParse(BaseModel):
+    # Keys are the field names the JD parsing prompt asks for
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    role_title: Optional[str] = Field(alias="Role Title")
+    required_skills: List[Any] = Field(alias="Required Skills")
+    preferred_skills: List[Any] = Field(default_factory=list, alias="Preferred Skills")
+    responsibilities: List[Any] = Field(default_factory=list, alias="Responsibilities")
+    tools_and_platforms: List[Any] = Field(default_factory=list, alias="Tools and Platforms")
+    domain: Optional[str] = Field(None, alias="Domain")
+    required_education: Optional[Union[str, List[Any]]] = Field(None, alias="Required Education")
+
+    @field_validator("required_skills", "preferred_skills", "responsibilities", "tools_and_platforms", mode="before")
+    @classmethod
+    def sections_as_lists(cls, value):
+        return _as_list(value)
+
+
+class SkillsComparison(BaseModel):
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
+    summary: str = "Skills analysis completed."
+
+    @field_validator("matched_skills", "missing_skills", mode="before")
+    @classmethod
+    def clean_skills(cls, value):
+        if not isinstance(value, list):
+            return []
+        # Filter out empty strings and normalize skills
+        return [str(skill).strip() for skill in value if skill and str(skill).strip()]
+
+
+class AnswerScore(BaseModel):
+    clarity: RubricScore
+    relevance: RubricScore
+    technical_depth: RubricScore
+    confidence: RubricScore
+    comment: str = "No comment available"
+
+
+class AnswerAssessment(AnswerScore):
+    # Rubric scores plus coaching feedback from a single call
+    feedback: str = Field(min_length=1)
+
+
+class QuestionConsistency(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    overall_consistency_score: float
+    question_ratings: List[Any] = []
+    consistency_issues: List[Any] = []
+    recommendations: List[Any] = []
+
+
+class HallucinationCheck(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    hallucination_score: float
+    detected_issues: List[Any] = []
+    confidence: Optional[float] = None
+    recommendations: List[Any] = []
+
+
+class FeedbackQuality(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    overall_quality_score: float
+    feedback_ratings: List[Any] = []
+    quality_issues: List[Any] = []
+    improvement_suggestions: List[Any] = []
+
+
+class ToneAnalysis(BaseModel):
+    tone: str
+    suggestion: str
@@ -1,25 +1,41 @@
 from fastapi import FastAPI, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from uuid import uuid4
 from statistics import mean
-from datetime import datetime
+from datetime import datetime, timedelta
 from passlib.hash import bcrypt
-from backend.scoring_engine import score_candidate_answer
-from backend.feedback_generator import generate_feedback
+from backend.scoring_engine import score_candidate_answer, score_and_feedback
+from backend.answer_scoring import AnswerScorer
 from backend.interview_evaluator import evaluator
 from fastapi import UploadFile, File
-from backend.profile_comparator import compare_resume_to_jd
-from backend.question_generator import generate_dynamic_question
+from backend.profile_comparator import compare_resume_to_jd, SKILLS_COMPARISON_PROMPT
+from backend.prompt_registry import prompt_registry
+from backend.llm_scheduler import INTERACTIVE, BATCH
+from backend.question_generator import generate_dynamic_question_async, stream_dynamic_question_async
+from backend.question_stream import question_events
+from backend.question_pregeneration import QuestionPregenerator
+from backend.upload_analysis import UploadAnalyzer
+from backend.skills_comparison import SkillsComparer
+from backend.session_retention import prune_user_sessions, sweep_old_sessions, SESSION_RETENTION_PER_USER
 from backend.gemini_resume_parser import parse_resume_with_gemini
 from backend.jd_analyzer import analyze_job_description
-from backend.mongo import sessions, users, parsed_resumes, parsed_jds
+from backend.mongo import sessions, users, parsed_resumes, parsed_jds, skill_comparisons, ensure_indexes
+from pymongo.errors import DuplicateKeyError
+from backend.single_flight import SingleFlight
+from backend.session_store import session_store, SessionConflict
+from backend.executors import ExecutorSaturated, llm_executor, pdf_executor, mongo_executor
+from backend.pdf_extractor import extract_pdf_text, pdf_text_cache, PDF_MAX_BYTES, PDF_TEXT_CACHE_TTL
+from backend.metrics import registry, HTTP_REQUEST_SECONDS, PDF_EXTRACT_SECONDS, PDF_PAGES
 
-import fitz  # PyMuPDF
 import os
+import json
 from dotenv import load_dotenv
 import hashlib
+import time
+import asyncio
 
 load_dotenv()
 
@@ -34,77 +50,155 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-SESSION = {}
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (e.g. /interview/summary/{session_id}) to keep cardinality bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start_time, method=request.method,
+                                     route=getattr(route, "path", "unmatched"), status=status)
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated(request: Request, exc: ExecutorSaturated):
+    # Shed load quickly instead of queueing behind slow blocking calls
+    return JSONResponse(status_code=503, content={"error": str(exc)},
+                        headers={"Retry-After": exc.retry_after_header})
+
+# In-flight resume/JD parses keyed by file hash
+parse_flight = SingleFlight()
+
+# How often a background sweep enforces SESSION_RETENTION_PER_USER (seconds, 0 = off)
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "0"))
+# Pre-summary session documents of interviews that are never finished expire after this long
+PRE_SUMMARY_SESSION_TTL = int(os.getenv("PRE_SUMMARY_SESSION_TTL", str(7 * 24 * 3600)))
+
+@app.on_event("startup")
+def create_indexes():
+    try:
+        ensure_indexes()
+    except Exception as e:
+        # The API still works without indexes, just slower
+        print(f"WARNING: failed to ensure Mongo indexes: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    from backend.llm_client import close_http_clients
+    from backend import executors
+    await close_http_clients()
+    executors.shutdown(wait=False)
 
 def generate_file_hash(content: bytes) -> str:
     """Generate a hash for file content to identify duplicates."""
     return hashlib.md5(content).hexdigest()
 
-def get_or_parse_resume(resume_content: bytes, resume_raw: str):
+async def extract_upload_text(content: bytes, file_hash: str, document: str) -> str:
+    """Text of an uploaded PDF, from the cache or extracted in the pdf process pool."""
+    text = pdf_text_cache.get(file_hash)
+    if text is not None:
+        print(f"Using cached {document} text for hash: {file_hash}")
+        return text
+    with PDF_EXTRACT_SECONDS.time(document=document):
+        text, page_count, pages_read = await pdf_executor.run(extract_pdf_text, content)
+    PDF_PAGES.observe(page_count, document=document)
+    if pages_read < page_count:
+        print(f"[UPLOAD] Extracted {pages_read} of {page_count} {document} pages (text budget reached)")
+    pdf_text_cache.set(file_hash, text, PDF_TEXT_CACHE_TTL)
+    return text
+
+def get_or_parse_resume(file_hash: str, resume_raw: str):
     """Get parsed resume from DB or parse and save it."""
-    file_hash = generate_file_hash(resume_content)
-    
     # Check if already parsed
-    existing = parsed_resumes.find_one({"file_hash": file_hash})
+    existing = parsed_resumes.find_one({"file_hash": file_hash}, {"parsed_data": 1})
     if existing:
         print(f"Using cached resume data for hash: {file_hash}")
         return existing["parsed_data"]
     
+    # Concurrent uploads of the same file share one parse
+    return parse_flight.do(("resume", file_hash), _parse_and_save_resume, file_hash, resume_raw)
+
+def _parse_and_save_resume(file_hash: str, resume_raw: str):
+    # Another request may have finished parsing while we waited
+    existing = parsed_resumes.find_one({"file_hash": file_hash}, {"parsed_data": 1})
+    if existing:
+        return existing["parsed_data"]
+    
     # Parse and save
     print(f"Parsing new resume, hash: {file_hash}")
     parsed_data = parse_resume_with_gemini(resume_raw)
-    
-    # Save to database
-    parsed_resumes.insert_one({
-        "file_hash": file_hash,
-        "parsed_data": parsed_data,
-        "created_at": datetime.utcnow()
-    })
+    if "error" in parsed_data:
+        return parsed_data  # Not cached, so the next upload of this file parses it again
+
+    # Save to database; another worker may have saved the same file first
+    try:
+        parsed_resumes.insert_one({
+            "file_hash": file_hash,
+            "parsed_data": parsed_data,
+            "created_at": datetime.utcnow()
+        })
+    except DuplicateKeyError:
+        pass
     
     return parsed_data
 
-def get_or_parse_jd(jd_content: bytes, jd_raw: str):
+def get_or_parse_jd(file_hash: str, jd_raw: str):
     """Get parsed JD from DB or parse and save it."""
-    file_hash = generate_file_hash(jd_content)
-    
     # Check if already parsed
-    existing = parsed_jds.find_one({"file_hash": file_hash})
+    existing = parsed_jds.find_one({"file_hash": file_hash}, {"parsed_data": 1})
     if existing:
         print(f"Using cached JD data for hash: {file_hash}")
         return existing["parsed_data"]
     
+    # Concurrent uploads of the same file share one parse
+    return parse_flight.do(("jd", file_hash), _parse_and_save_jd, file_hash, jd_raw)
+
+def _parse_and_save_jd(file_hash: str, jd_raw: str):
+    # Another request may have finished parsing while we waited
+    existing = parsed_jds.find_one({"file_hash": file_hash}, {"parsed_data": 1})
+    if existing:
+        return existing["parsed_data"]
+    
     # Parse and save
     print(f"Parsing new JD, hash: {file_hash}")
     parsed_data = analyze_job_description(jd_raw)
-    
-    # Save to database
-    parsed_jds.insert_one({
-        "file_hash": file_hash,
-        "parsed_data": parsed_data,
-        "created_at": datetime.utcnow()
-    })
+    if "error" in parsed_data:
+        return parsed_data  # Not cached, so the next upload of this file parses it again
+
+    # Save to database; another worker may have saved the same file first
+    try:
+        parsed_jds.insert_one({
+            "file_hash": file_hash,
+            "parsed_data": parsed_data,
+            "created_at": datetime.utcnow()
+        })
+    except DuplicateKeyError:
+        pass
     
     return parsed_data
 
-def generate_interview_greeting(resume_text: str, jd_text: str) -> str:
+# Resume vs JD skills comparison, cached per resume, JD and prompt version
+skills_comparer = SkillsComparer(skill_comparisons, parse_flight, compare_resume_to_jd,
+                                 lambda: prompt_registry.version(SKILLS_COMPARISON_PROMPT))
+
+# Parsing and skills comparison for /upload/resume-jd
+upload_analyzer = UploadAnalyzer(llm_executor, get_or_parse_resume, get_or_parse_jd, skills_comparer.get)
+
+DEFAULT_GREETING = "Welcome to your interview! We'll be asking you 4 questions covering different aspects of your experience and skills. Let's begin!"
+
+async def generate_interview_greeting(resume_text: str, jd_text: str, priority: str = INTERACTIVE) -> str:
     """
     Generate a personalized greeting with company and job role information.
     """
     try:
-        # Create a hash for the resume + JD combination
-        combined_text = resume_text[:500] + jd_text[:500]
-        greeting_hash = hashlib.md5(combined_text.encode()).hexdigest()
-        
-        # Check if greeting already exists in session cache
-        if hasattr(generate_interview_greeting, 'greeting_cache'):
-            if greeting_hash in generate_interview_greeting.greeting_cache:
-                print(f"Using cached greeting for hash: {greeting_hash}")
-                return generate_interview_greeting.greeting_cache[greeting_hash]
-        else:
-            generate_interview_greeting.greeting_cache = {}
-        
         from backend.llm_client import model
+        from backend.token_budget import budget_for, truncate_words
         
+        budget = budget_for("greeting")
         prompt = f"""You are an AI assistant that generates interview greetings. Generate ONLY the greeting text, no explanations or labels.
 
 Create a brief, welcoming interview introduction (2-3 sentences) that includes:
@@ -113,12 +207,14 @@ Create a brief, welcoming interview introduction (2-3 sentences) that includes:
 3. The job role/position
 4. Brief explanation of the interview format (4 questions, different types)
 
-Resume: {resume_text[:500]}...
-Job Description: {jd_text[:500]}...
+Resume: {truncate_words(resume_text, budget["resume"])}
+Job Description: {truncate_words(jd_text, budget["jd"])}
 
 Output ONLY the greeting text. Do not include any labels, explanations, or formatting."""
 
-        response = model.generate_content(prompt)
+        # Same resume + JD combination reuses the cached greeting
+        response = await model.generate_content_async(prompt, cache=True, max_tokens=budget["max_tokens"],
+                                                hedge=priority == INTERACTIVE, priority=priority)
         greeting = response.text.strip()
         
         # Clean up the response to remove any prompt artifacts
@@ -131,15 +227,28 @@ Output ONLY the greeting text. Do not include any labels, explanations, or forma
                     break
         
         if not greeting or len(greeting) < 20:
-            greeting = "Welcome to your interview! We'll be asking you 4 questions covering different aspects of your experience and skills. Let's begin!"
-        
-        # Cache the greeting
-        generate_interview_greeting.greeting_cache[greeting_hash] = greeting
+            greeting = DEFAULT_GREETING
         
         return greeting
     except Exception as e:
         print(f"Greeting generation error: {e}")
-        return "Welcome to your interview! We'll be asking you 4 questions covering different aspects of your experience and skills. Let's begin!"
+        return DEFAULT_GREETING
+
+async def _generate_pregenerated(kind: str, resume_text: str, jd_text: str, priority: str):
+    if kind == "greeting":
+        text = await generate_interview_greeting(resume_text, jd_text, priority=priority)
+        return None if text == DEFAULT_GREETING else text
+    text = await generate_dynamic_question_async(resume_text, jd_text, [], kind, priority=priority)
+    return text or None
+
+async def _save_pregenerated(session_id: str, kind: str, text: str):
+    def store(session):
+        session.setdefault("pregenerated", {})[kind] = text
+
+    await mongo_executor.run(session_store.update, session_id, store)
+
+# The greeting and answer-independent questions are generated as soon as a session is created
+question_pregenerator = QuestionPregenerator(_generate_pregenerated, _save_pregenerated)
 
 class AnswerRequest(BaseModel):
     answer: str
@@ -165,15 +274,18 @@ class SecurityMetricsRequest(BaseModel):
 
 @app.post("/auth/signup")
 def signup(user: UserCreate):
-    if users.find_one({"email": user.email}):
+    if users.find_one({"email": user.email}, {"_id": 1}):
         return {"error": "User already exists"}
     hashed_pw = bcrypt.hash(user.password)
-    users.insert_one({"email": user.email, "password": hashed_pw})
+    try:
+        users.insert_one({"email": user.email, "password": hashed_pw})
+    except DuplicateKeyError:  # Concurrent signup with the same email
+        return {"error": "User already exists"}
     return {"message": "Signup successful"}
 
 @app.post("/auth/login")
 def login(user: UserLogin):
-    existing = users.find_one({"email": user.email})
+    existing = users.find_one({"email": user.email}, {"password": 1})
     if not existing:
         return {"error": "User not found"}
     if not bcrypt.verify(user.password, existing["password"]):
@@ -183,18 +295,20 @@ def login(user: UserLogin):
 @app.post("/upload/resume-jd")
 async def upload_files(resume: UploadFile = File(...), jd: UploadFile = File(...), user_email: str = ""):
     try:
-        import time
-        def extract_text(file: UploadFile):
-            file.file.seek(0)
-            content = file.file.read()
-            doc = fitz.open("pdf", content)
-            return "\n".join(page.get_text() for page in doc)  # type: ignore
+        # Read each upload once (one byte past the cap is enough to reject it);
+        # the same bytes are hashed and extracted
+        resume_content = await resume.read(PDF_MAX_BYTES + 1)
+        jd_content = await jd.read(PDF_MAX_BYTES + 1)
+        if len(resume_content) > PDF_MAX_BYTES or len(jd_content) > PDF_MAX_BYTES:
+            return {"error": f"Uploaded files must be at most {PDF_MAX_BYTES // (1024 * 1024)} MB."}
+        resume_hash = generate_file_hash(resume_content)
+        jd_hash = generate_file_hash(jd_content)
 
         # Extract text from uploaded files
-        resume.file.seek(0)
-        resume_raw = extract_text(resume)
-        jd.file.seek(0)
-        jd_raw = extract_text(jd)
+        resume_raw, jd_raw = await asyncio.gather(
+            extract_upload_text(resume_content, resume_hash, "resume"),
+            extract_upload_text(jd_content, jd_hash, "jd")
+        )
 
         # Log extracted text lengths for debugging
         print(f"[UPLOAD] Extracted resume text length: {len(resume_raw)}")
@@ -206,24 +320,12 @@ async def upload_files(resume: UploadFile = File(...), jd: UploadFile = File(...
         if not jd_raw or not jd_raw.strip():
             return {"error": "Job description text could not be extracted from the uploaded file. Please check your file and try again."}
 
-        # Reset file pointers for hashing
-        resume.file.seek(0)
-        resume_content = resume.file.read()
-        jd.file.seek(0)
-        jd_content = jd.file.read()
-
-        # Use cached parsing or parse and cache
-        parsed_resume = get_or_parse_resume(resume_content, resume_raw)
-        time.sleep(0.3)  # 300ms delay
-        parsed_jd = get_or_parse_jd(jd_content, jd_raw)
-        time.sleep(0.3)  # 300ms delay
-
-        # Compare resume to JD (skills analysis)
-        result = compare_resume_to_jd(resume_raw, jd_raw)
+        # Resume parsing, JD parsing and the skills comparison run concurrently
+        parsed_resume, parsed_jd, result = await upload_analyzer.analyze(resume_hash, resume_raw, jd_hash, jd_raw)
 
         # Create new session
         new_session_id = str(uuid4())
-        SESSION[new_session_id] = {
+        session_data = {
             "index": 0,
             "answers": [],
             "scores": [],
@@ -244,6 +346,8 @@ async def upload_files(resume: UploadFile = File(...), jd: UploadFile = File(...
             "parsed_jd": parsed_jd,
             "user_email": user_email  # Store user email in session
         }
+        await mongo_executor.run(session_store.create, new_session_id, session_data)
+        question_pregenerator.start(new_session_id, resume_raw, jd_raw, session_data["question_types"])
 
         return {
             "session_id": new_session_id,
@@ -253,6 +357,8 @@ async def upload_files(resume: UploadFile = File(...), jd: UploadFile = File(...
             "parsed_resume": parsed_resume,
             "parsed_jd": parsed_jd
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         print(f"[UPLOAD] Exception: {e}")
         return {"error": f"Failed to process files: {str(e)}"}
@@ -265,23 +371,24 @@ async def start_interview(request: Request):
 
         print(f"Interview start called for session: {session_id}")
 
-        if not session_id or session_id not in SESSION:
+        data = await mongo_executor.run(session_store.get, session_id)
+        if data is None:
             return {"error": "Invalid session_id"}
 
         # Check if interview has already started
-        if SESSION[session_id].get("interview_started", False):
+        if data.get("interview_started", False):
             print(f"Interview already started for session: {session_id}")
             # Return the existing first question
-            if SESSION[session_id]["transcript"]:
+            if data["transcript"]:
                 return {
                     "session_id": session_id,
-                    "question": SESSION[session_id]["transcript"][0]["question"],
-                    "greeting": SESSION[session_id].get("greeting", "Welcome to your interview!")
+                    "question": data["transcript"][0]["question"],
+                    "greeting": data.get("greeting", "Welcome to your interview!")
                 }
 
         # Validate that we have resume and JD text to prevent hallucination
-        resume_text = SESSION[session_id].get("resume_text", "")
-        jd_text = SESSION[session_id].get("jd_text", "")
+        resume_text = data.get("resume_text", "")
+        jd_text = data.get("jd_text", "")
         
         if not resume_text or not resume_text.strip():
             print(f"WARNING: Session {session_id} has no resume text - this may cause hallucination")
@@ -291,22 +398,13 @@ async def start_interview(request: Request):
             print(f"WARNING: Session {session_id} has no job description text - this may cause hallucination")
             return {"error": "Cannot start interview: Job description information is missing. Please upload a job description first."}
 
-        # Initialize session for interview
-        SESSION[session_id]["index"] = 0
-        SESSION[session_id]["transcript"] = []
-        SESSION[session_id]["interview_started"] = True
-
-        # Generate personalized greeting
-        greeting = generate_interview_greeting(resume_text, jd_text)
-        SESSION[session_id]["greeting"] = greeting
-
-        # Add delay between API calls to prevent rate limiting
-        import time
-        time.sleep(0.5)  # 500ms delay
+        # Personalized greeting, pre-generated at upload when possible
+        greeting = await question_pregenerator.get(session_id, data, "greeting") or \
+            await generate_interview_greeting(resume_text, jd_text)
 
         # Generate first question
-        question_type = SESSION[session_id]["question_types"][0]
-        first_q = generate_dynamic_question(
+        question_type = data["question_types"][0]
+        first_q = await question_pregenerator.get(session_id, data, question_type) or await generate_dynamic_question_async(
             resume_text,
             jd_text,
             [],
@@ -315,26 +413,65 @@ async def start_interview(request: Request):
 
         print(f"Generated first question for session {session_id}: {first_q[:50]}...")
 
-        # Save first question in transcript
-        SESSION[session_id]["transcript"].append({"question": first_q})
+        # Initialize session for interview with the first question in the transcript
+        def begin_interview(session):
+            if session.get("interview_started") and session["transcript"]:
+                return  # A concurrent start won the race; keep its question
+            session["index"] = 0
+            session["transcript"] = [{"question": first_q}]
+            session["interview_started"] = True
+            session["greeting"] = greeting
+
+        data = await mongo_executor.run(session_store.update, session_id, begin_interview)
 
         return {
             "session_id": session_id,
-            "question": first_q,
-            "greeting": greeting
+            "question": data["transcript"][0]["question"],
+            "greeting": data["greeting"]
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         print(f"Error generating greeting: {e}")
         return "Welcome to your interview! We'll be asking you 4 questions covering different aspects of your experience and skills. Let's begin!"
 
+def _save_answer(answer: str):
+    """Session update recording the answer to the current question."""
+    def apply(session):
+        idx = session["index"]
+        if idx >= len(session["question_types"]):
+            raise SessionConflict("Interview already completed")
+        # A retried submission replaces the answer instead of recording it twice
+        del session["answers"][idx:]
+        session["answers"].append(answer)
+        item = session["transcript"][idx]
+        item["answer"] = answer
+        # Drop any assessment of a previously submitted answer
+        item.pop("score", None)
+        item.pop("feedback", None)
+    return apply
+
+def _advance_interview(idx: int, next_q: str = None):
+    """Session update moving past question idx, appending the next question if any."""
+    def apply(session):
+        if session["index"] != idx:
+            raise SessionConflict("This answer was already processed by another request")
+        if next_q is not None:
+            session["transcript"].append({"question": next_q})
+        session["index"] = idx + 1
+    return apply
+
+# Answers are scored in the background as they are submitted
+answer_scorer = AnswerScorer(session_store, llm_executor, score_and_feedback)
+
 @app.post("/interview/next")
 async def next_question(payload: AnswerRequest):
     try:
         sid = payload.session_id
-        if sid not in SESSION:
+        data = await mongo_executor.run(session_store.get, sid)
+        if data is None:
             return {"error": "Invalid session_id"}
 
-        data = SESSION[sid]
         idx = data["index"]
         
         print(f"Processing answer for session {sid}, current index: {idx}, total questions: {len(data['question_types'])}")
@@ -347,10 +484,10 @@ async def next_question(payload: AnswerRequest):
         qtype = data["question_types"][idx]
         print(f"Current question type: {qtype}")
 
-        # Save the answer (no scoring here - will be done at summary)
-        last_q = data["transcript"][idx]["question"]
-        data["answers"].append(payload.answer)
-        data["transcript"][idx]["answer"] = payload.answer
+        # Save the answer and score it in the background
+        data = await mongo_executor.run(session_store.update, sid, _save_answer(payload.answer))
+        idx = data["index"]
+        answer_scorer.start(sid, idx, data["transcript"][idx])
 
         # Generate next question if there are more questions
         if idx + 1 < len(data["question_types"]):
@@ -358,18 +495,18 @@ async def next_question(payload: AnswerRequest):
             import time
             start_time = time.time()
             
-            next_q = generate_dynamic_question(
-                resume_text=data["resume_text"],
-                jd_text=data["jd_text"],
-                transcript=data["transcript"],
-                question_type=data["question_types"][idx + 1]
-            )
+            next_q = await question_pregenerator.get(sid, data, data["question_types"][idx + 1]) or \
+                await generate_dynamic_question_async(
+                    resume_text=data["resume_text"],
+                    jd_text=data["jd_text"],
+                    transcript=data["transcript"],
+                    question_type=data["question_types"][idx + 1]
+                )
             
             generation_time = time.time() - start_time
             print(f"Question generation took {generation_time:.2f} seconds for session {sid}")
             
-            data["transcript"].append({"question": next_q})
-            data["index"] += 1
+            data = await mongo_executor.run(session_store.update, sid, _advance_interview(idx, next_q))
             print(f"Generated next question for session {sid}, new index: {data['index']}")
             return {
                 "question": next_q
@@ -379,26 +516,86 @@ async def next_question(payload: AnswerRequest):
         if len(data["answers"]) < 4:
             print(f"Warning: Interview completing with only {len(data['answers'])} answers for session {sid}")
         
-        data["index"] += 1
+        await mongo_executor.run(session_store.update, sid, _advance_interview(idx))
         print(f"Interview completed for session {sid} - no more questions")
         return {
             "question": "",
             "message": "Interview completed"
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         print(f"Error in next_question: {e}")
         return {"error": f"Failed to process answer: {str(e)}"}
 
+@app.post("/interview/next/stream")
+async def next_question_stream(payload: AnswerRequest):
+    """
+    Same as /interview/next, but streams the next question as server-sent
+    events: `data: {"token": ...}` per chunk, then `event: done` with the full
+    question once it has been saved to the transcript.
+    """
+    try:
+        sid = payload.session_id
+        data = await mongo_executor.run(session_store.get, sid)
+        if data is None:
+            return {"error": "Invalid session_id"}
+
+        if data["index"] >= len(data["question_types"]):
+            return {"question": "", "message": "Interview completed"}
+
+        # Save the answer and score it in the background
+        data = await mongo_executor.run(session_store.update, sid, _save_answer(payload.answer))
+        idx = data["index"]
+        answer_scorer.start(sid, idx, data["transcript"][idx])
+
+        if idx + 1 >= len(data["question_types"]):
+            await mongo_executor.run(session_store.update, sid, _advance_interview(idx))
+            print(f"Interview completed for session {sid} - no more questions")
+            return {"question": "", "message": "Interview completed"}
+
+        question_type = data["question_types"][idx + 1]
+        print(f"Streaming next question for session {sid}, type: {question_type}")
+
+        pregenerated_q = await question_pregenerator.get(sid, data, question_type)
+
+        async def question_chunks():
+            if pregenerated_q:
+                yield pregenerated_q
+                return
+            async for chunk in stream_dynamic_question_async(
+                resume_text=data["resume_text"],
+                jd_text=data["jd_text"],
+                transcript=data["transcript"],
+                question_type=question_type
+            ):
+                yield chunk
+
+        async def save_question(next_q):
+            await mongo_executor.run(session_store.update, sid, _advance_interview(idx, next_q))
+
+        return StreamingResponse(
+            question_events(question_chunks(), save_question, label=f" for session {sid}"),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    except ExecutorSaturated:
+        raise
+    except Exception as e:
+        print(f"Error in next_question_stream: {e}")
+        return {"error": f"Failed to process answer: {str(e)}"}
+
 @app.post("/interview/tab-switch")
 async def track_tab_switch(payload: TabSwitchRequest):
     try:
         sid = payload.session_id
-        if sid not in SESSION:
+        if not await mongo_executor.run(session_store.exists, sid):
             return {"error": "Invalid session_id"}
 
-        data = SESSION[sid]
-        data["tab_switch_count"] = payload.tab_switch_count
+        await mongo_executor.run(session_store.set_fields, sid, tab_switch_count=payload.tab_switch_count)
         return {"message": "Tab switch count updated"}
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Failed to update tab switch count: {str(e)}"}
 
@@ -406,13 +603,16 @@ async def track_tab_switch(payload: TabSwitchRequest):
 async def store_security_metrics(payload: SecurityMetricsRequest):
     try:
         sid = payload.session_id
-        if sid not in SESSION:
+        if not await mongo_executor.run(session_store.exists, sid):
             return {"error": "Invalid session_id"}
 
-        data = SESSION[sid]
-        data["tab_switch_count"] = payload.tab_switch_count
-        data["fullscreen_used"] = payload.fullscreen_used
-        data["interview_duration_minutes"] = payload.interview_duration_minutes
+        await mongo_executor.run(
+            session_store.set_fields,
+            sid,
+            tab_switch_count=payload.tab_switch_count,
+            fullscreen_used=payload.fullscreen_used,
+            interview_duration_minutes=payload.interview_duration_minutes
+        )
         
         print(f"Security metrics stored for session {sid}:")
         print(f"  - Tab switches: {payload.tab_switch_count}")
@@ -420,22 +620,25 @@ async def store_security_metrics(payload: SecurityMetricsRequest):
         print(f"  - Duration: {payload.interview_duration_minutes} minutes")
         
         return {"message": "Security metrics stored successfully"}
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Failed to store security metrics: {str(e)}"}
 
 @app.get("/interview/summary/{session_id}")
-def interview_summary(session_id: str, user_email: Optional[str] = Query(None)):
+async def interview_summary(session_id: str, user_email: Optional[str] = Query(None)):
     try:
-        data = SESSION.get(session_id, {})
+        # Let background scoring of the last answers finish first
+        await answer_scorer.wait(session_id)
+        data = await mongo_executor.run(session_store.get, session_id) or {}
         if not data:
             # Try to find session in database if not in memory
             from bson import ObjectId
-            session_data = None
             try:
-                object_id = ObjectId(session_id)
-                session_data = sessions.find_one({"_id": object_id})
+                query = {"_id": ObjectId(session_id)}
             except Exception:
-                session_data = sessions.find_one({"session_id": session_id})
+                query = {"session_id": session_id}
+            session_data = await mongo_executor.run(sessions.find_one, query)
             
             if session_data:
                 data = session_data
@@ -443,8 +646,9 @@ def interview_summary(session_id: str, user_email: Optional[str] = Query(None)):
             else:
                 return {"error": "Session not found in memory or database"}
 
-        # Check if summary already exists in database
-        existing_summary = sessions.find_one({"session_id": session_id})
+        # Check if summary already exists in database (pre-summary documents carry expires_at)
+        existing_summary = await mongo_executor.run(
+            sessions.find_one, {"session_id": session_id, "expires_at": {"$exists": False}})
         if existing_summary:
             print(f"Summary already exists for session {session_id}, returning existing summary")
             existing_summary["_id"] = str(existing_summary["_id"])
@@ -467,43 +671,15 @@ def interview_summary(session_id: str, user_email: Optional[str] = Query(None)):
             jd_text = data.get("jd_text", "")
             if resume_text and jd_text:
                 print(f"Regenerating skills analysis for session {session_id}")
-                skills_result = compare_resume_to_jd(resume_text, jd_text)
+                skills_result = await llm_executor.run(skills_comparer.get, resume_text, jd_text, priority=BATCH)
                 matched_skills = skills_result.get("matched_skills", [])
                 missing_skills = skills_result.get("missing_skills", [])
                 resume_jd_summary = skills_result.get("summary", "")
                 print(f"Regenerated skills: {len(matched_skills)} matched, {len(missing_skills)} missing")
 
-        # Calculate all scoring, tone analysis, and feedback at once
-        scores = []
-        enhanced_transcript = []
-        
-        for i, item in enumerate(transcript):
-            enhanced_item = item.copy()
-            if "answer" in item:  # Only process completed Q&A pairs
-                try:
-                    # Score the answer
-                    score = score_candidate_answer(item["question"], item["answer"])
-                    scores.append(score)
-                    
-                    # Generate feedback
-                    feedback = generate_feedback(item["question"], item["answer"])
-                    enhanced_item["feedback"] = feedback
-                    
-                    # Note: Tone analysis removed as it's not being used
-                    
-                except Exception as e:
-                    print(f"Failed to process Q&A {i}: {e}")
-                    # Use default scores and feedback
-                    default_score = {
-                        "clarity": 3,
-                        "relevance": 3,
-                        "technical_depth": 3,
-                        "confidence": 3,
-                        "comment": "Processing failed - using default values"
-                    }
-                    scores.append(default_score)
-                    enhanced_item["feedback"] = "Feedback generation failed."
-            enhanced_transcript.append(enhanced_item)
+        # Answers are normally scored by now; any that aren't (background scoring
+        # failed or timed out) are scored concurrently here, keeping transcript order
+        enhanced_transcript, scores = await answer_scorer.assess_transcript(transcript)
 
         # Calculate average scores
         if scores:
@@ -558,21 +734,33 @@ def interview_summary(session_id: str, user_email: Optional[str] = Query(None)):
 
         # Save to database
         print(f"Saving new summary for session {session_id} with {len(matched_skills)} matched skills")
-        result = sessions.insert_one(summary)
+        result = await mongo_executor.run(sessions.insert_one, summary)
+        # The summary supersedes the session's pre-summary document, if any
+        await mongo_executor.run(sessions.delete_many, {"session_id": session_id, "expires_at": {"$exists": True}})
         summary["_id"] = str(result.inserted_id)  # 🛠️ convert ObjectId to string
         return summary
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Failed to generate summary: {str(e)}"}
 
+# Only the fields /user/data returns; skips the resume/JD text and transcript
+USER_DATA_PROJECTION = {
+    "matched_skills": 1, "missing_skills": 1, "resume_jd_summary": 1,
+    "parsed_resume": 1, "parsed_jd": 1, "created_at": 1
+}
+
 @app.get("/user/data/{user_email}")
-def get_user_data(user_email: str):
+async def get_user_data(user_email: str):
     """
     Get the most recent parsed resume and JD data for a user.
     """
     try:
         # Get the most recent session for this user (always use latest)
-        latest_session = sessions.find_one(
+        latest_session = await mongo_executor.run(
+            sessions.find_one,
             {"user_email": user_email},
+            USER_DATA_PROJECTION,
             sort=[("created_at", -1)]  # Most recent first
         )
         
@@ -591,6 +779,8 @@ def get_user_data(user_email: str):
             "parsed_jd": latest_session.get("parsed_jd", {}),
             "updated_at": latest_session.get("created_at", datetime.utcnow())
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Failed to fetch user data: {str(e)}"}
 
@@ -609,13 +799,12 @@ async def create_session_from_existing(request: Request):
         
         # Try to find existing session by ObjectId first, then by session_id
         from bson import ObjectId
-        existing_session = None
         try:
-            object_id = ObjectId(existing_data_id)
-            existing_session = sessions.find_one({"_id": object_id})
+            query = {"_id": ObjectId(existing_data_id)}
         except Exception:
             # If not ObjectId, try as UUID string
-            existing_session = sessions.find_one({"session_id": existing_data_id})
+            query = {"session_id": existing_data_id}
+        existing_session = await mongo_executor.run(sessions.find_one, query)
         
         if not existing_session:
             return {"error": "Existing session not found"}
@@ -634,7 +823,7 @@ async def create_session_from_existing(request: Request):
         
         if not matched_skills and not missing_skills and resume_text and jd_text:
             print(f"Regenerating skills analysis for new session from existing data")
-            skills_result = compare_resume_to_jd(resume_text, jd_text)
+            skills_result = await llm_executor.run(skills_comparer.get, resume_text, jd_text)
             matched_skills = skills_result.get("matched_skills", [])
             missing_skills = skills_result.get("missing_skills", [])
             resume_jd_summary = skills_result.get("summary", "")
@@ -664,11 +853,14 @@ async def create_session_from_existing(request: Request):
             "created_at": datetime.utcnow()
         }
         
-        # Store in MongoDB
-        result = sessions.insert_one(session_data)
+        # Store in MongoDB; expires unless the interview is finished and summarized
+        pre_summary = {**session_data, "expires_at": datetime.utcnow() + timedelta(seconds=PRE_SUMMARY_SESSION_TTL)}
+        result = await mongo_executor.run(sessions.insert_one, pre_summary)
         
-        # Also store in in-memory session for active interview
-        SESSION[new_session_id] = session_data
+        # Also store in the live session store for the active interview
+        await mongo_executor.run(session_store.create, new_session_id, session_data)
+        if resume_text and jd_text:
+            question_pregenerator.start(new_session_id, resume_text, jd_text, session_data["question_types"])
         
         print(f"Created new session {new_session_id} from existing data with {len(matched_skills)} matched skills")
         
@@ -678,6 +870,8 @@ async def create_session_from_existing(request: Request):
             "matched_skills_count": len(matched_skills),
             "missing_skills_count": len(missing_skills)
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Failed to create session: {str(e)}"}
 
@@ -685,7 +879,8 @@ async def create_session_from_existing(request: Request):
 def get_user_sessions(user_email: str):
     try:
         # Get sessions sorted by creation date (newest first) to match cleanup logic
-        results = list(sessions.find({"user_email": user_email}).sort("created_at", -1))
+        # The session list doesn't show the resume/JD text; don't load it
+        results = list(sessions.find({"user_email": user_email}, {"resume_text": 0, "jd_text": 0}).sort("created_at", -1))
         for r in results:
             r["_id"] = str(r["_id"])
         return results
@@ -693,7 +888,7 @@ def get_user_sessions(user_email: str):
         return {"error": f"Failed to fetch sessions: {str(e)}"}
 
 @app.post("/evaluate/interview/{session_id}")
-def evaluate_interview_quality(session_id: str):
+async def evaluate_interview_quality(session_id: str):
     """
     Evaluate the quality, consistency, and reliability of an interview session.
     """
@@ -701,13 +896,12 @@ def evaluate_interview_quality(session_id: str):
         from bson import ObjectId
         
         # Try to find session by ObjectId first, then by session_id
-        session_data = None
         try:
-            object_id = ObjectId(session_id)
-            session_data = sessions.find_one({"_id": object_id})
+            query = {"_id": ObjectId(session_id)}
         except Exception:
             # If not ObjectId, try as UUID string
-            session_data = sessions.find_one({"session_id": session_id})
+            query = {"session_id": session_id}
+        session_data = await mongo_executor.run(sessions.find_one, query)
         
         if not session_data:
             return {"error": "Session not found"}
@@ -716,7 +910,7 @@ def evaluate_interview_quality(session_id: str):
         session_data["_id"] = str(session_data["_id"])
         
         # Run comprehensive evaluation
-        evaluation_result = evaluator.run_comprehensive_evaluation(session_data)
+        evaluation_result = await llm_executor.run(evaluator.run_comprehensive_evaluation, session_data)
         
         # Save evaluation to database
         evaluation_result["session_id"] = session_data.get("session_id", session_id)
@@ -725,13 +919,15 @@ def evaluate_interview_quality(session_id: str):
         # Store in a separate collection for evaluations
         from backend.mongo import db
         evaluations = db["interview_evaluations"]
-        result = evaluations.insert_one(evaluation_result)
+        result = await mongo_executor.run(evaluations.insert_one, evaluation_result)
         evaluation_result["_id"] = str(result.inserted_id)
         
         return {
             "message": "Evaluation completed successfully",
             "evaluation": evaluation_result
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Evaluation failed: {str(e)}"}
 
@@ -763,21 +959,21 @@ def get_interview_evaluation(session_id: str):
         return {"error": f"Failed to fetch evaluation: {str(e)}"}
 
 @app.post("/regenerate-skills/{session_id}")
-def regenerate_skills_analysis(session_id: str):
+async def regenerate_skills_analysis(session_id: str, force: bool = Query(False)):
     """
-    Regenerate skills analysis for an existing session.
+    Regenerate skills analysis for an existing session. Uses the cached
+    comparison for this resume/JD pair unless force=true.
     """
     try:
         from bson import ObjectId
         
         # Try to find session by ObjectId first, then by session_id
-        session_data = None
         try:
-            object_id = ObjectId(session_id)
-            session_data = sessions.find_one({"_id": object_id})
+            query = {"_id": ObjectId(session_id)}
         except Exception:
             # If not ObjectId, try as UUID string
-            session_data = sessions.find_one({"session_id": session_id})
+            query = {"session_id": session_id}
+        session_data = await mongo_executor.run(sessions.find_one, query)
         
         if not session_data:
             return {"error": "Session not found"}
@@ -790,12 +986,14 @@ def regenerate_skills_analysis(session_id: str):
             return {"error": "Resume or JD text not found in session"}
         
         # Regenerate skills analysis
-        print(f"Regenerating skills analysis for session {session_id}")
-        skills_result = compare_resume_to_jd(resume_text, jd_text)
+        print(f"Regenerating skills analysis for session {session_id} (force={force})")
+        skills_result = await llm_executor.run(
+            skills_comparer.get, resume_text, jd_text, priority=BATCH, force_refresh=force)
         
         # Update the session with new skills data
         update_query = {"_id": session_data["_id"]} if "_id" in session_data else {"session_id": session_id}
-        sessions.update_one(
+        await mongo_executor.run(
+            sessions.update_one,
             update_query,
             {
                 "$set": {
@@ -814,6 +1012,8 @@ def regenerate_skills_analysis(session_id: str):
             "summary": skills_result.get("summary", "")
         }
         
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Failed to regenerate skills analysis: {str(e)}"}
 
@@ -826,38 +1026,51 @@ def debug_session_data(session_id: str):
         from bson import ObjectId
         
         # Try to find session by ObjectId first, then by session_id
-        session_data = None
         try:
-            object_id = ObjectId(session_id)
-            session_data = sessions.find_one({"_id": object_id})
+            query = {"_id": ObjectId(session_id)}
         except Exception:
             # If not ObjectId, try as UUID string
-            session_data = sessions.find_one({"session_id": session_id})
+            query = {"session_id": session_id}
+
+        # Compute text lengths and list sizes in Mongo instead of loading the documents
+        session_data = next(sessions.aggregate([
+            {"$match": query},
+            {"$limit": 1},
+            {"$project": {
+                "resume_text_length": {"$strLenCP": {"$ifNull": ["$resume_text", ""]}},
+                "jd_text_length": {"$strLenCP": {"$ifNull": ["$jd_text", ""]}},
+                "transcript_length": {"$size": {"$ifNull": ["$transcript", []]}},
+                "scores_count": {"$size": {"$ifNull": ["$scores", []]}},
+                "matched_skills": 1,
+                "missing_skills": 1,
+                "overall_score": 1,
+                "average_score": 1,
+                "created_at": 1,
+                "user_email": 1
+            }}
+        ]), None)
         
         if not session_data:
             return {"error": "Session not found"}
         
-        # Convert ObjectId to string for JSON serialization
-        session_data["_id"] = str(session_data["_id"])
-        
         # Check if datetime objects need conversion
         if "created_at" in session_data:
             session_data["created_at"] = session_data["created_at"].isoformat()
         
         return {
             "session_id": session_id,
-            "has_resume_text": bool(session_data.get("resume_text")),
-            "has_jd_text": bool(session_data.get("jd_text")),
-            "resume_text_length": len(session_data.get("resume_text", "")),
-            "jd_text_length": len(session_data.get("jd_text", "")),
+            "has_resume_text": session_data["resume_text_length"] > 0,
+            "has_jd_text": session_data["jd_text_length"] > 0,
+            "resume_text_length": session_data["resume_text_length"],
+            "jd_text_length": session_data["jd_text_length"],
             "matched_skills": session_data.get("matched_skills", []),
             "missing_skills": session_data.get("missing_skills", []),
             "matched_skills_count": len(session_data.get("matched_skills", [])),
             "missing_skills_count": len(session_data.get("missing_skills", [])),
-            "has_transcript": bool(session_data.get("transcript")),
-            "transcript_length": len(session_data.get("transcript", [])),
-            "has_scores": bool(session_data.get("scores")),
-            "scores_count": len(session_data.get("scores", [])),
+            "has_transcript": session_data["transcript_length"] > 0,
+            "transcript_length": session_data["transcript_length"],
+            "has_scores": session_data["scores_count"] > 0,
+            "scores_count": session_data["scores_count"],
             "overall_score": session_data.get("overall_score", "Not calculated"),
             "average_score": session_data.get("average_score", "Not calculated"),
             "created_at": session_data.get("created_at"),
@@ -880,7 +1093,7 @@ async def test_skills_matching(request: Request):
             return {"error": "Both resume_text and jd_text are required"}
         
         # Test skills matching
-        skills_result = compare_resume_to_jd(resume_text, jd_text)
+        skills_result = await llm_executor.run(compare_resume_to_jd, resume_text, jd_text)
         
         return {
             "matched_skills": skills_result.get("matched_skills", []),
@@ -890,6 +1103,8 @@ async def test_skills_matching(request: Request):
             "matched_count": len(skills_result.get("matched_skills", [])),
             "missing_count": len(skills_result.get("missing_skills", []))
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Test failed: {str(e)}"}
 
@@ -907,7 +1122,7 @@ async def test_scoring(request: Request):
             return {"error": "Both question and answer are required"}
         
         # Test scoring
-        score_result = score_candidate_answer(question, answer)
+        score_result = await llm_executor.run(score_candidate_answer, question, answer)
         
         return {
             "clarity": score_result.get("clarity", 0),
@@ -918,44 +1133,96 @@ async def test_scoring(request: Request):
             "average_score": (score_result.get("clarity", 0) + score_result.get("relevance", 0) + 
                             score_result.get("technical_depth", 0) + score_result.get("confidence", 0)) / 4
         }
+    except ExecutorSaturated:
+        raise
     except Exception as e:
         return {"error": f"Test failed: {str(e)}"}
 
+@app.get("/llm/health")
+def llm_health():
+    """
+    Circuit breaker state, error rate and latency for each Groq model, plus
+    scheduler slots in use and queued per priority class, executor queue
+    depths, and the version hash of each prompt template.
+    """
+    from backend.llm_client import GROQ_MODELS
+    from backend.circuit_breaker import breakers
+    from backend.llm_scheduler import scheduler
+    from backend.prompt_registry import prompt_registry
+    from backend import executors
+    return {
+        "models": {name: breakers.get(name).snapshot() for name in GROQ_MODELS},
+        "scheduler": scheduler.snapshot(),
+        "executors": executors.snapshot(),
+        "prompt_versions": prompt_registry.versions()
+    }
+
+@app.get("/metrics")
+def metrics():
+    """
+    Prometheus text exposition of LLM, PDF, Mongo and endpoint metrics.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/debug/index-usage")
+def debug_index_usage():
+    """
+    Debug endpoint reporting operations per Mongo index and which index
+    (or collection scan) serves each hot query.
+    """
+    try:
+        from backend.mongo import index_usage, explain_hot_queries
+        return {"indexes": index_usage(), "queries": explain_hot_queries()}
+    except Exception as e:
+        return {"error": f"Failed to read index usage: {str(e)}"}
+
+@app.get("/debug/llm-cache")
+def llm_cache_stats():
+    """
+    Debug endpoint exposing LLM response cache hit/miss/eviction counters.
+    """
+    from backend.llm_cache import llm_cache
+    return llm_cache.get_stats()
+
+async def _session_sweeper():
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        try:
+            deleted = await mongo_executor.run(sweep_old_sessions, sessions)
+            if deleted:
+                print(f"Session sweeper deleted {deleted} old sessions")
+        except Exception as e:
+            print(f"Session sweep failed: {e}")
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    if SESSION_SWEEP_INTERVAL > 0:
+        # Keep a reference so the task isn't garbage collected
+        app.state.session_sweeper = asyncio.create_task(_session_sweeper())
+
 @app.post("/cleanup-sessions/{user_email}")
 def cleanup_old_sessions(user_email: str):
     """
-    Clean up old sessions and keep only the 6 most recent ones for a user.
+    Clean up old sessions and keep only the most recent ones for a user
+    (SESSION_RETENTION_PER_USER, 6 by default).
     """
     try:
-        # Get all sessions for this user, sorted by creation date (newest first)
-        all_sessions = list(sessions.find(
-            {"user_email": user_email}
-        ).sort("created_at", -1))
+        keep = SESSION_RETENTION_PER_USER
+        total, deleted_count = prune_user_sessions(sessions, user_email, keep)
         
-        if len(all_sessions) <= 6:
+        if deleted_count == 0 and total <= keep:
             return {
-                "message": f"No cleanup needed. User has {len(all_sessions)} sessions (≤ 6 limit)",
-                "sessions_kept": len(all_sessions),
+                "message": f"No cleanup needed. User has {total} sessions (≤ {keep} limit)",
+                "sessions_kept": total,
                 "sessions_deleted": 0
             }
         
-        # Keep the 6 most recent sessions
-        sessions_to_keep = all_sessions[:6]
-        sessions_to_delete = all_sessions[6:]
-        
-        # Delete old sessions
-        deleted_count = 0
-        for session in sessions_to_delete:
-            result = sessions.delete_one({"_id": session["_id"]})
-            if result.deleted_count > 0:
-                deleted_count += 1
-        
         return {
             "message": f"Cleanup completed successfully",
-            "sessions_kept": len(sessions_to_keep),
+            "sessions_kept": total - deleted_count,
             "sessions_deleted": deleted_count,
-            "total_before": len(all_sessions),
-            "total_after": len(sessions_to_keep)
+            "total_before": total,
+            "total_after": total - deleted_count
         }
         
     except Exception as e:
@@ -0,0 +1,186 @@
+"""
+In-process counters and histograms exposed in the Prometheus text format
+at GET /metrics.
+
+Covers the hot paths: LLM requests per model (latency, retries, 429s,
+fallbacks, token usage, queueing), PDF extraction, Mongo commands per
+collection, executor queueing and HTTP endpoint latency. Values are per
+process; with several uvicorn workers each worker is scraped separately.
+"""
+import time
+import threading
+from contextlib import contextmanager
+
+# Seconds; spans fast Mongo lookups up to slow LLM calls near the timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: dict = None) -> str:
+    pairs = list(zip(labelnames, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}" for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of the with-block, also when it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state["count"] if state else 0
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((key, dict(state, counts=list(state["counts"]))) for key, state in self._values.items())
+        lines = self._header()
+        for key, state in items:
+            for bound, count in zip(self.buckets, state["counts"]):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, {'le': _format_number(bound)})} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, {'le': '+Inf'})} {state['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(state['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# LLM
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_duration_seconds", "Groq HTTP request latency per attempt", ("model", "status"))
+LLM_QUEUE_SECONDS = registry.histogram(
+    "llm_queue_wait_seconds", "Time waiting for a scheduler slot and rate limit budget before a request", ("model",))
+LLM_RETRIES = registry.counter(
+    "llm_retries_total", "Groq request retries on the same model", ("model", "reason"))
+LLM_RATE_LIMITED = registry.counter(
+    "llm_rate_limited_total", "429 responses from Groq", ("model",))
+LLM_FALLBACKS = registry.counter(
+    "llm_fallbacks_total", "Times a model was skipped or failed and the next model was tried", ("model", "reason"))
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens reported in Groq usage", ("model", "type"))
+
+# PDF extraction
+PDF_EXTRACT_SECONDS = registry.histogram(
+    "pdf_extraction_duration_seconds", "Text extraction time per uploaded PDF", ("document",))
+PDF_PAGES = registry.histogram(
+    "pdf_pages", "Page count per uploaded PDF", ("document",), buckets=(1, 2, 3, 5, 10, 20, 50, 100))
+
+# Mongo
+MONGO_COMMAND_SECONDS = registry.histogram(
+    "mongo_command_duration_seconds", "Mongo command latency", ("collection", "command"))
+MONGO_COMMAND_ERRORS = registry.counter(
+    "mongo_command_errors_total", "Failed Mongo commands", ("collection", "command"))
+
+# HTTP
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "API request latency per endpoint", ("method", "route", "status"))
+
+# Executors
+EXECUTOR_QUEUE_SECONDS = registry.histogram(
+    "executor_queue_wait_seconds", "Time a blocking task waited for a worker", ("executor",))
+EXECUTOR_REJECTED = registry.counter(
+    "executor_rejected_total", "Tasks rejected because the executor queue was full", ("executor",))
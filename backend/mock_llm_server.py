@@ -0,0 +1,420 @@
+"""
+Local stand-in for Groq's OpenAI-compatible chat completions API.
+
+Returns schema-valid canned responses for every prompt the backend sends,
+with configurable latency, 429/500 injection, a per-model requests-per-minute
+limit (with Groq-style x-ratelimit headers) and streaming support. Used for
+offline testing, load tests and capacity planning without burning quota.
+
+Run it next to the backend:
+
+    uvicorn backend.mock_llm_server:app --port 8001
+
+and point the client at it:
+
+    GROQ_BASE_URL=http://localhost:8001/openai/v1/chat/completions
+
+Settings (environment variables, also adjustable at runtime via POST /mock/config):
+    MOCK_LLM_LATENCY_MS      mean time to first byte (default 300)
+    MOCK_LLM_LATENCY_DIST    fixed | uniform | exponential | lognormal (default lognormal)
+    MOCK_LLM_STREAM_CHUNK_MS delay between streamed chunks (default 20)
+    MOCK_LLM_429_RATE        fraction of requests answered with 429 (default 0)
+    MOCK_LLM_500_RATE        fraction of requests answered with 500 (default 0)
+    MOCK_LLM_RPM             per-model requests per minute, 0 = unlimited (default 0)
+    MOCK_LLM_FAILING_MODELS  comma-separated models answered as decommissioned
+    MOCK_LLM_SEED            random seed for reproducible runs
+"""
+import os
+import re
+import json
+import time
+import uuid
+import math
+import random
+import asyncio
+import threading
+from collections import defaultdict, deque
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI(title="Mock Groq API")
+
+CONFIG = {
+    "latency_ms": float(os.getenv("MOCK_LLM_LATENCY_MS", "300")),
+    "latency_dist": os.getenv("MOCK_LLM_LATENCY_DIST", "lognormal"),
+    "stream_chunk_ms": float(os.getenv("MOCK_LLM_STREAM_CHUNK_MS", "20")),
+    "rate_429": float(os.getenv("MOCK_LLM_429_RATE", "0")),
+    "rate_500": float(os.getenv("MOCK_LLM_500_RATE", "0")),
+    "rpm": int(os.getenv("MOCK_LLM_RPM", "0")),
+    "failing_models": [m.strip() for m in os.getenv("MOCK_LLM_FAILING_MODELS", "").split(",") if m.strip()],
+}
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+_random = random.Random(os.getenv("MOCK_LLM_SEED"))
+_request_times = defaultdict(deque)
+_lock = threading.Lock()
+STATS = defaultdict(int)
+
+
+def sample_latency() -> float:
+    """Latency in seconds drawn from the configured distribution."""
+    mean = CONFIG["latency_ms"] / 1000.0
+    if mean <= 0:
+        return 0.0
+    dist = CONFIG["latency_dist"]
+    if dist == "fixed":
+        return mean
+    if dist == "uniform":
+        return _random.uniform(0, 2 * mean)
+    if dist == "exponential":
+        return _random.expovariate(1 / mean)
+    # Lognormal with a long tail (sigma 0.6), scaled so the mean matches
+    sigma = 0.6
+    return _random.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+
+
+# ---------------------------------------------------------------------------
+# Canned responses per call site
+# ---------------------------------------------------------------------------
+
+def _resume_response(prompt: str) -> dict:
+    return {
+        "Name": "Alex Candidate",
+        "Email": "alex.candidate@example.com",
+        "Phone": "+1 555 0100",
+        "Skills": ["Python", "SQL", "FastAPI", "MongoDB", "React", "AWS"],
+        "Work Experience": [{
+            "title": "Software Engineer",
+            "company": "Example Corp",
+            "duration": "2021 - Present",
+            "responsibilities": ["Built REST APIs with FastAPI", "Maintained MongoDB data pipelines"]
+        }],
+        "Projects": [{
+            "title": "Interview Assistant",
+            "tools": ["Python", "React"],
+            "description": "AI-driven mock interview platform"
+        }],
+        "Education": [{"degree": "B.S. Computer Science", "university": "State University", "year": "2021"}],
+        "Certifications": ["AWS Certified Developer"],
+        "Awards": [],
+        "Patents": [],
+        "Hobbies": ["Chess"]
+    }
+
+
+def _jd_response(prompt: str) -> dict:
+    return {
+        "Role Title": "Backend Engineer",
+        "Required Skills": ["Python", "SQL", "REST APIs", "Docker"],
+        "Preferred Skills": ["Kubernetes", "AWS"],
+        "Responsibilities": ["Design and build backend services", "Own data models and APIs"],
+        "Tools and Platforms": ["FastAPI", "PostgreSQL", "GitHub Actions"],
+        "Domain": "Software",
+        "Required Education": "Bachelor's in Computer Science or related field"
+    }
+
+
+def _skills_response(prompt: str) -> dict:
+    return {
+        "matched_skills": ["Python", "SQL", "REST APIs", "AWS"],
+        "missing_skills": ["Docker", "Kubernetes"],
+        "summary": "The candidate matches the core backend requirements but lacks containerization experience."
+    }
+
+
+def _score_response(prompt: str) -> dict:
+    return {
+        "clarity": _random.randint(2, 5),
+        "relevance": _random.randint(2, 5),
+        "technical_depth": _random.randint(2, 5),
+        "confidence": _random.randint(2, 5),
+        "comment": "Clear answer with a concrete example; could go deeper on trade-offs."
+    }
+
+
+def _assessment_response(prompt: str) -> dict:
+    return dict(_score_response(prompt), feedback=_feedback_response(prompt))
+
+
+def _feedback_response(prompt: str) -> str:
+    return ("The answer addressed the question directly and used a concrete project as evidence. "
+            "Structure it as situation, action and result, and quantify the impact to make it stronger.")
+
+
+def _question_response(prompt: str) -> str:
+    match = re.search(r"generating an? ([\w-]+) question", prompt)
+    question_type = match.group(1) if match else "general"
+    questions = {
+        "resume-based": "In your Interview Assistant project, how did you design the API between the React frontend and the FastAPI backend?",
+        "job-description-based": "This role requires building REST APIs with Python. How would you design an endpoint that must stay fast under heavy load?",
+        "follow-up": "You mentioned caching earlier. How did you decide what to cache and how did you handle invalidation?",
+        "behavioral": "Tell me about a time you disagreed with a teammate on a technical decision. How did you resolve it?"
+    }
+    return questions.get(question_type, "Can you walk me through a recent project you are proud of?")
+
+
+def _greeting_response(prompt: str) -> str:
+    return ("Welcome to your interview for the Backend Engineer position at Example Corp! "
+            "We'll go through 4 questions covering your resume, the role's requirements, a follow-up and a behavioral question.")
+
+
+def _consistency_response(prompt: str) -> dict:
+    return {
+        "overall_consistency_score": 4.2,
+        "question_ratings": [
+            {"question": "Q1", "relevance": 4, "alignment": 5, "appropriateness": 4, "comments": "Well targeted"}
+        ],
+        "consistency_issues": [],
+        "recommendations": ["Reference more job description requirements"]
+    }
+
+
+def _hallucination_response(prompt: str) -> dict:
+    return {
+        "hallucination_score": 0.1,
+        "detected_issues": [],
+        "confidence": 0.85,
+        "recommendations": ["Keep questions anchored to the resume"]
+    }
+
+
+def _feedback_quality_response(prompt: str) -> dict:
+    return {
+        "overall_quality_score": 4.0,
+        "feedback_ratings": [
+            {"feedback": "F1", "specificity": 4, "constructiveness": 4, "relevance": 4, "clarity": 5}
+        ],
+        "quality_issues": [],
+        "improvement_suggestions": ["Suggest concrete next steps"]
+    }
+
+
+def _tone_response(prompt: str) -> dict:
+    return {"tone": "confident", "suggestion": "challenging"}
+
+
+def _json_repair_response(prompt: str) -> str:
+    # Echo back the JSON object embedded in the response that needs fixing
+    broken = prompt.split("Response to fix:", 1)[-1]
+    start, end = broken.find("{"), broken.rfind("}")
+    return broken[start:end + 1] if start != -1 and end > start else "{}"
+
+
+# (marker found in the prompt, response builder); first match wins
+CALL_SITES = [
+    ("Response to fix:", _json_repair_response),
+    ("expert resume parser", _resume_response),
+    ("expert job description parser", _jd_response),
+    ("Compare the following resume and job description", _skills_response),
+    ("and give coaching feedback", _assessment_response),
+    ("Rate this interview answer", _score_response),
+    ("experienced interview coach", _feedback_response),
+    ("AI interviewer conducting", _question_response),
+    ("generates interview greetings", _greeting_response),
+    ("consistency of these interview questions", _consistency_response),
+    ("potential hallucinations", _hallucination_response),
+    ("quality of these AI-generated feedback", _feedback_quality_response),
+    ("Analyze tone", _tone_response),
+]
+
+
+def build_completion_text(prompt: str) -> tuple:
+    """Return (call site name, response text) for a prompt."""
+    for marker, builder in CALL_SITES:
+        if marker in prompt:
+            result = builder(prompt)
+            text = result if isinstance(result, str) else json.dumps(result, indent=2)
+            return builder.__name__.strip("_").replace("_response", ""), text
+    return "unknown", "This is a mock response."
+
+
+# ---------------------------------------------------------------------------
+# Error injection and rate limit emulation
+# ---------------------------------------------------------------------------
+
+def _error(status: int, message: str, code: str, headers: dict = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={"error": {"message": message, "type": "invalid_request_error", "code": code}},
+        headers=headers
+    )
+
+
+def _check_rate_limit(model_name: str):
+    """
+    Sliding one-minute window per model. Returns (allowed, headers).
+    """
+    rpm = CONFIG["rpm"]
+    if rpm <= 0:
+        return True, {}
+    now = time.time()
+    with _lock:
+        window = _request_times[model_name]
+        while window and now - window[0] > 60:
+            window.popleft()
+        reset = 60 - (now - window[0]) if window else 0.0
+        if len(window) >= rpm:
+            return False, {
+                "retry-after": str(max(1, math.ceil(reset))),
+                "x-ratelimit-limit-requests": str(rpm),
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": f"{reset:.2f}s"
+            }
+        window.append(now)
+        return True, {
+            "x-ratelimit-limit-requests": str(rpm),
+            "x-ratelimit-remaining-requests": str(rpm - len(window)),
+            "x-ratelimit-reset-requests": f"{60 - (now - window[0]):.2f}s"
+        }
+
+
+def _usage(prompt: str, text: str) -> dict:
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, len(text) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model_name = body.get("model", "mock-model")
+    prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+    STATS["requests"] += 1
+
+    if model_name in CONFIG["failing_models"]:
+        STATS["decommissioned"] += 1
+        return _error(400, f"The model `{model_name}` has been decommissioned.", "model_decommissioned")
+
+    allowed, limit_headers = _check_rate_limit(model_name)
+    if not allowed:
+        STATS["rate_limited"] += 1
+        return _error(429, f"Rate limit reached for model `{model_name}`.", "rate_limit_exceeded", limit_headers)
+
+    roll = _random.random()
+    if roll < CONFIG["rate_429"]:
+        STATS["injected_429"] += 1
+        return _error(429, "Injected rate limit error.", "rate_limit_exceeded", {"retry-after": "1"})
+    if roll < CONFIG["rate_429"] + CONFIG["rate_500"]:
+        STATS["injected_500"] += 1
+        return _error(500, "Injected server error.", "internal_server_error")
+
+    call_site, text = build_completion_text(prompt)
+    STATS[f"call_site:{call_site}"] += 1
+    await asyncio.sleep(sample_latency())
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    usage = _usage(prompt, text)
+
+    if body.get("stream"):
+        async def event_stream():
+            pieces = re.findall(r"\S+\s*", text) or [text]
+            for piece in pieces:
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model_name,
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(CONFIG["stream_chunk_ms"] / 1000.0)
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model_name,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "x_groq": {"id": completion_id, "usage": usage}
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream", headers=limit_headers)
+
+    return JSONResponse(
+        content={
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model_name,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop"
+            }],
+            "usage": usage
+        },
+        headers=limit_headers
+    )
+
+
+@app.get("/mock/config")
+def get_config():
+    return CONFIG
+
+
+def _config_value(key: str, value):
+    """
+    Cast a /mock/config value to the type of its setting, or raise ValueError.
+    """
+    if key == "failing_models":
+        if isinstance(value, str):
+            value = value.split(",")
+        if not isinstance(value, list):
+            raise ValueError("expected a list or a comma-separated string of model names")
+        return [str(m).strip() for m in value if str(m).strip()]
+    if key == "latency_dist":
+        if value not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+        return value
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    try:
+        number = type(CONFIG[key])(value)
+    except (TypeError, ValueError):
+        raise ValueError("expected a number")
+    if not math.isfinite(number) or number < 0:
+        raise ValueError("expected a non-negative number")
+    if key in ("rate_429", "rate_500") and number > 1:
+        raise ValueError("expected a fraction between 0 and 1")
+    return number
+
+
+@app.post("/mock/config")
+async def update_config(request: Request):
+    """Change latency or error injection settings without restarting."""
+    updates = await request.json()
+    values = {}
+    for key, value in updates.items():
+        if key not in CONFIG:
+            continue
+        try:
+            values[key] = _config_value(key, value)
+        except ValueError as e:
+            return _error(400, f"Invalid value for {key}: {e}", "invalid_config")
+    CONFIG.update(values)
+    return CONFIG
+
+
+@app.get("/mock/stats")
+def get_stats():
+    return dict(STATS)
+
+
+@app.post("/mock/reset")
+def reset_stats():
+    STATS.clear()
+    with _lock:
+        _request_times.clear()
+    return {"message": "Mock stats reset"}
@@ -1,12 +1,139 @@
 import os
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
 from dotenv import load_dotenv
+from backend.metrics import MONGO_COMMAND_SECONDS, MONGO_COMMAND_ERRORS
 
 load_dotenv()
 
-client = MongoClient(os.getenv("MONGO_URI"))
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Record the latency of every Mongo command per collection.
+    """
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        # The collection name is the value of the command's first key, e.g. {"find": "sessions", ...}
+        collection = event.command.get(event.command_name)
+        self._pending[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else "-"
+
+    def succeeded(self, event):
+        collection = self._pending.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, collection=collection, command=event.command_name)
+
+    def failed(self, event):
+        collection = self._pending.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, collection=collection, command=event.command_name)
+        MONGO_COMMAND_ERRORS.inc(collection=collection, command=event.command_name)
+
+
+client = MongoClient(os.getenv("MONGO_URI"), event_listeners=[CommandMetricsListener()])
 db = client["interview_agent"]
 sessions = db["sessions"]
 users = db["users"]
 parsed_resumes = db["parsed_resumes"]
-parsed_jds = db["parsed_jds"]
\ No newline at end of file
+parsed_jds = db["parsed_jds"]
+skill_comparisons = db["skill_comparisons"]
+interview_evaluations = db["interview_evaluations"]
+
+# (collection, keys, options) for every index the API's queries rely on.
+# live_sessions, llm_cache and rate_limits create their own TTL indexes.
+INDEXES = [
+    (parsed_resumes, [("file_hash", ASCENDING)], {"unique": True}),
+    (parsed_jds, [("file_hash", ASCENDING)], {"unique": True}),
+    (skill_comparisons, [("resume_hash", ASCENDING), ("jd_hash", ASCENDING), ("prompt_version", ASCENDING)],
+     {"unique": True}),
+    # Not unique: a session's pre-summary and summary documents share the session_id
+    (sessions, [("session_id", ASCENDING)], {}),
+    # Serves the per-user history sort and retention cutoff (_id breaks created_at ties)
+    (sessions, [("user_email", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+    # Pre-summary documents of interviews that were never finished expire on their own
+    (sessions, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    (users, [("email", ASCENDING)], {"unique": True}),
+    (interview_evaluations, [("session_id", ASCENDING)], {}),
+]
+
+
+def ensure_indexes(indexes: list = INDEXES):
+    """
+    Create the given (collection, keys, options) indexes, INDEXES by default.
+    Idempotent; safe to run on every start. A unique index that can't be
+    built because of existing duplicates is created as a non-unique index
+    instead, with a warning.
+    """
+    for collection, keys, options in indexes:
+        try:
+            collection.create_index(keys, **options)
+        except OperationFailure as e:
+            if not options.get("unique"):
+                raise
+            print(f"WARNING: could not create unique index {keys} on {collection.name} ({e}); "
+                  f"creating it as non-unique. Remove the duplicates and restart to enforce uniqueness.")
+            collection.create_index(keys)
+
+
+def index_usage() -> dict:
+    """
+    Per-index operation counts since the server started ($indexStats).
+    """
+    usage = {}
+    for collection in dict.fromkeys(collection for collection, _, _ in INDEXES):
+        usage[collection.name] = [
+            {
+                "name": stat["name"],
+                "key": stat["key"],
+                "ops": stat["accesses"]["ops"],
+                "since": stat["accesses"]["since"].isoformat()
+            }
+            for stat in collection.aggregate([{"$indexStats": {}}])
+        ]
+    return usage
+
+
+def _plan_stages(plan: dict) -> list:
+    # IXSCAN/COLLSCAN stages anywhere in an explain plan tree
+    stages = []
+    if plan.get("stage") == "IXSCAN":
+        stages.append(f"IXSCAN {plan.get('indexName')}")
+    elif plan.get("stage") == "COLLSCAN":
+        stages.append("COLLSCAN")
+    for value in plan.values():
+        children = value if isinstance(value, list) else [value]
+        for child in children:
+            if isinstance(child, dict):
+                stages.extend(_plan_stages(child))
+    return stages
+
+
+# The API's hot queries, with placeholder values, for explain()
+HOT_QUERIES = {
+    "parsed_resume_by_hash": (parsed_resumes, {"file_hash": ""}, None),
+    "parsed_jd_by_hash": (parsed_jds, {"file_hash": ""}, None),
+    "skill_comparison_by_pair": (skill_comparisons, {"resume_hash": "", "jd_hash": "", "prompt_version": ""}, None),
+    "session_by_id": (sessions, {"session_id": ""}, None),
+    "sessions_by_user": (sessions, {"user_email": ""}, [("created_at", DESCENDING)]),
+    "user_by_email": (users, {"email": ""}, None),
+    "evaluation_by_session": (interview_evaluations, {"session_id": ""}, None),
+}
+
+
+def explain_hot_queries() -> dict:
+    """
+    The winning plan's scan stages for each hot query, e.g. "IXSCAN file_hash_1"
+    or "COLLSCAN" for a query that no index serves.
+    """
+    plans = {}
+    for name, (collection, query, sort) in HOT_QUERIES.items():
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        plans[name] = _plan_stages(cursor.explain().get("queryPlanner", {}).get("winningPlan", {}))
+    return plans
+
+
+if __name__ == "__main__":
+    # Run as a migration: python -m backend.mongo
+    ensure_indexes()
+    print("Indexes ensured")
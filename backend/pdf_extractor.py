@@ -0,0 +1,44 @@
+"""
+Text extraction for uploaded resume and job description PDFs.
+
+extract_pdf_text runs in the pdf executor's worker processes, so a huge or
+malformed PDF can't stall the API process. Work per file is capped:
+uploads above PDF_MAX_BYTES are rejected before extraction, at most
+PDF_MAX_PAGES pages are read, and reading stops once PDF_MAX_TEXT_CHARS
+characters have been collected (more than any prompt budget uses).
+
+Extracted text is cached in-process by content hash, so re-uploading the
+same file skips extraction entirely.
+"""
+import os
+
+from backend.lru import MemoryLRU
+
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+PDF_MAX_TEXT_CHARS = int(os.getenv("PDF_MAX_TEXT_CHARS", "100000"))
+PDF_TEXT_CACHE_SIZE = int(os.getenv("PDF_TEXT_CACHE_SIZE", "256"))
+PDF_TEXT_CACHE_TTL = int(os.getenv("PDF_TEXT_CACHE_TTL", str(24 * 3600)))
+
+
+def extract_pdf_text(content: bytes, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_TEXT_CHARS) -> tuple:
+    """
+    Extract the text of a PDF. Returns (text, page_count, pages_read).
+    """
+    import fitz  # PyMuPDF; imported here so worker processes load it on first use
+
+    parts = []
+    total_chars = 0
+    with fitz.open(stream=content, filetype="pdf") as doc:
+        page_count = doc.page_count
+        for page_number in range(min(page_count, max_pages)):
+            text = doc.load_page(page_number).get_text()
+            parts.append(text)
+            total_chars += len(text) + 1
+            if total_chars >= max_chars:
+                break  # Enough text; skip the remaining pages
+    return "\n".join(parts)[:max_chars], page_count, len(parts)
+
+
+# Extracted text keyed by file hash
+pdf_text_cache = MemoryLRU(PDF_TEXT_CACHE_SIZE)
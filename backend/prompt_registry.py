@@ -0,0 +1,122 @@
+"""
+Shared registry of the prompt templates in prompts/.
+
+Templates are read and pre-parsed once, rendered in a single pass (each
+value is copied once, however large), and reloaded when their file's mtime
+changes so prompt edits take effect without a restart. Each template has a
+short content hash (`version`) that changes whenever its text does.
+"""
+import os
+import re
+import time
+import hashlib
+import threading
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPTS_DIR = os.getenv("PROMPTS_DIR", os.path.join(PROJECT_ROOT, "prompts"))
+# How often (seconds) a template's mtime is checked for hot reload; 0 = every render
+PROMPT_RELOAD_INTERVAL = float(os.getenv("PROMPT_RELOAD_INTERVAL", "2"))
+
+_PLACEHOLDER_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+
+
+class PromptTemplate:
+    def __init__(self, name: str, text: str, path: str = None, mtime: float = None):
+        self.name = name
+        self.text = text
+        self.path = path
+        self.mtime = mtime
+        self.version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        # Alternating literal text and placeholder names: even indexes are literals
+        self._parts = _PLACEHOLDER_RE.split(text)
+        self.placeholders = frozenset(self._parts[1::2])
+
+    def render(self, **values) -> str:
+        """
+        Substitute {{NAME}} placeholders with values[NAME] in one pass.
+        """
+        missing = self.placeholders - values.keys()
+        if missing:
+            raise KeyError(f"Prompt {self.name} is missing values for: {', '.join(sorted(missing))}")
+        return "".join(part if i % 2 == 0 else str(values[part]) for i, part in enumerate(self._parts))
+
+
+class PromptRegistry:
+    def __init__(self, directory: str = PROMPTS_DIR, reload_interval: float = PROMPT_RELOAD_INTERVAL,
+                 clock=time.monotonic):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.clock = clock
+        self._templates = {}   # path -> PromptTemplate
+        self._checked_at = {}  # path -> last mtime check
+        self._lock = threading.Lock()
+        self.load_all()
+
+    def load_all(self):
+        """
+        Load every .txt template in the prompts directory.
+        """
+        if not os.path.isdir(self.directory):
+            print(f"Prompt directory not found: {self.directory}")
+            return
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(".txt"):
+                self.get(filename)
+
+    def _resolve(self, name: str) -> str:
+        # Accepts "resume_parsing_prompt", "resume_parsing_prompt.txt" or a path such as
+        # "prompts/resume_parsing_prompt.txt" (relative to the working directory or the prompts dir)
+        if not name.endswith(".txt"):
+            name += ".txt"
+        if os.path.dirname(name):
+            if os.path.exists(name):
+                return os.path.abspath(name)
+            name = os.path.basename(name)
+        return os.path.join(self.directory, name)
+
+    def _load(self, path: str) -> PromptTemplate:
+        mtime = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        return PromptTemplate(name, text, path=path, mtime=mtime)
+
+    def get(self, name: str) -> PromptTemplate:
+        """
+        Return the compiled template, reloading it if the file changed.
+        """
+        path = self._resolve(name)
+        now = self.clock()
+        template = self._templates.get(path)
+        if template is not None and now - self._checked_at.get(path, 0.0) < self.reload_interval:
+            return template
+
+        with self._lock:
+            template = self._templates.get(path)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                if template is not None:
+                    return template  # File briefly missing (e.g. mid-save): keep serving the last version
+                raise
+            if template is None or mtime != template.mtime:
+                template = self._load(path)
+                if path in self._templates:
+                    print(f"Reloaded prompt {template.name} (version {template.version})")
+                self._templates[path] = template
+            self._checked_at[path] = now
+            return template
+
+    def render(self, name: str, **values) -> str:
+        return self.get(name).render(**values)
+
+    def version(self, name: str) -> str:
+        return self.get(name).version
+
+    def versions(self) -> dict:
+        with self._lock:
+            templates = list(self._templates.values())
+        return {template.name: template.version for template in templates}
+
+
+prompt_registry = PromptRegistry()
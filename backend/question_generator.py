@@ -1,11 +1,8 @@
-def load_prompt_template(path: str) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
-
-def generate_dynamic_question(resume_text, jd_text, transcript, question_type, prompt_path="prompts/question_generation_prompt.txt"):
-    from backend.llm_client import model
-    import json
+from backend.llm_scheduler import INTERACTIVE
+from backend.prompt_registry import prompt_registry
+from backend.token_budget import budget_for, max_tokens_for, trim_to_budget, trim_transcript
 
+def build_question_prompt(resume_text, jd_text, transcript, question_type, prompt_path="prompts/question_generation_prompt.txt"):
     # Validate inputs to prevent hallucination
     if not resume_text or not resume_text.strip():
         print("WARNING: Empty or missing resume text - this may cause hallucination")
@@ -22,18 +19,43 @@ DO NOT fabricate, invent, or assume any projects, experiences, or details that a
 If insufficient information is provided, ask general questions about the candidate's background rather than specific projects.
 """
 
-    template = load_prompt_template(prompt_path)
-    formatted_transcript = "\n".join([
-        f"Q: {t['question']}\nA: {t.get('answer', '')}" for t in transcript
-    ])
-
-    prompt = template.replace("{{RESUME_TEXT}}", resume_text)\
-                     .replace("{{JD_TEXT}}", jd_text)\
-                     .replace("{{INTERVIEW_TRANSCRIPT}}", formatted_transcript)\
-                     .replace("{{QUESTION_TYPE}}", question_type)
+    budget = budget_for("question_generation")
+    prompt = prompt_registry.render(
+        prompt_path,
+        RESUME_TEXT=trim_to_budget(resume_text, budget["resume"]),
+        JD_TEXT=trim_to_budget(jd_text, budget["jd"]),
+        INTERVIEW_TRANSCRIPT=trim_transcript(transcript, budget["transcript"]),
+        QUESTION_TYPE=question_type
+    )
     
     # Add anti-hallucination instruction
     prompt += "\n\n" + anti_hallucination_instruction
+    return prompt
+
+def generate_dynamic_question(resume_text, jd_text, transcript, question_type, prompt_path="prompts/question_generation_prompt.txt"):
+    from backend.llm_client import model
 
-    response = model.generate_content(prompt)
+    prompt = build_question_prompt(resume_text, jd_text, transcript, question_type, prompt_path)
+    response = model.generate_content(prompt, max_tokens=max_tokens_for("question_generation"), priority=INTERACTIVE)
     return response.text.strip()
+
+async def generate_dynamic_question_async(resume_text, jd_text, transcript, question_type, prompt_path="prompts/question_generation_prompt.txt",
+                                         priority=INTERACTIVE):
+    from backend.llm_client import model
+
+    prompt = build_question_prompt(resume_text, jd_text, transcript, question_type, prompt_path)
+    # Only a candidate waiting on the answer is worth hedging for
+    response = await model.generate_content_async(prompt, max_tokens=max_tokens_for("question_generation"),
+                                                hedge=priority == INTERACTIVE, priority=priority)
+    return response.text.strip()
+
+
+async def stream_dynamic_question_async(resume_text, jd_text, transcript, question_type, prompt_path="prompts/question_generation_prompt.txt"):
+    """
+    Yield the question text in chunks as the model generates it.
+    """
+    from backend.llm_client import stream_content_async
+
+    prompt = build_question_prompt(resume_text, jd_text, transcript, question_type, prompt_path)
+    async for chunk in stream_content_async(prompt, max_tokens=max_tokens_for("question_generation"), priority=INTERACTIVE):
+        yield chunk
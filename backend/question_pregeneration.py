@@ -0,0 +1,82 @@
+"""
+Background pre-generation of the greeting and answer-independent questions.
+
+Question types that only depend on the resume and JD are generated as soon
+as a session is created, so /interview/start and /interview/next can return
+them right away. A question that is missing or failed to generate is
+generated live by the caller instead.
+
+/interview/start waits for the greeting and the first question, so those
+are generated at INTERACTIVE priority; the rest at STANDARD.
+"""
+import os
+import asyncio
+
+from backend.llm_scheduler import INTERACTIVE, STANDARD
+
+PREGENERATED_QUESTION_TYPES = ("resume-based", "job-description-based", "behavioral")
+# Generate the behavioral question live with the transcript so far (avoids
+# repeating topics) instead of using the pre-generated one
+REGENERATE_BEHAVIORAL_QUESTION = os.getenv("REGENERATE_BEHAVIORAL_QUESTION", "false").lower() in ("1", "true", "yes")
+
+
+class QuestionPregenerator:
+    """
+    generate(kind, resume_text, jd_text, priority) returns the greeting
+    ("greeting") or question text, or None if it is unusable; save(session_id, kind, text)
+    stores it under session["pregenerated"]. Both are coroutine functions.
+    """
+
+    def __init__(self, generate, save, regenerate_behavioral: bool = REGENERATE_BEHAVIORAL_QUESTION):
+        self.generate = generate
+        self.save = save
+        self.regenerate_behavioral = regenerate_behavioral
+        # In-flight pre-generation tasks keyed by (session_id, kind)
+        self._tasks = {}
+
+    def uses_pregenerated(self, kind: str) -> bool:
+        if kind == "behavioral" and self.regenerate_behavioral:
+            return False
+        return kind == "greeting" or kind in PREGENERATED_QUESTION_TYPES
+
+    async def _pregenerate(self, session_id: str, kind: str, resume_text: str, jd_text: str, priority: str):
+        try:
+            text = await self.generate(kind, resume_text, jd_text, priority)
+            if text is None:
+                return None
+            await self.save(session_id, kind, text)
+            return text
+        except Exception as e:
+            print(f"Pre-generation of {kind} failed for session {session_id}: {e}")
+            return None
+
+    def start(self, session_id: str, resume_text: str, jd_text: str, question_types: list):
+        """
+        Generate the greeting and every answer-independent question in the
+        background. Must be called from the event loop.
+        """
+        needed_at_start = {"greeting"} | set(question_types[:1])
+        for kind in dict.fromkeys(["greeting"] + list(question_types)):
+            if not self.uses_pregenerated(kind):
+                continue
+            key = (session_id, kind)
+            priority = INTERACTIVE if kind in needed_at_start else STANDARD
+            task = asyncio.create_task(self._pregenerate(session_id, kind, resume_text, jd_text, priority))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _, key=key: self._tasks.pop(key, None))
+
+    async def get(self, session_id: str, data: dict, kind: str):
+        """
+        The pre-generated greeting or question for this session, waiting for it
+        if it is still being generated in this process. None if unavailable.
+        """
+        if not self.uses_pregenerated(kind):
+            return None
+        text = (data.get("pregenerated") or {}).get(kind)
+        if text:
+            return text
+        task = self._tasks.get((session_id, kind))
+        if task is None:
+            return None
+        # Shield so a client disconnect doesn't cancel the shared background task
+        return await asyncio.shield(task)
@@ -0,0 +1,47 @@
+"""
+Server-sent events for /interview/next/stream.
+
+Each generated chunk is sent as `data: {"token": ...}`. Once the stream has
+finished, the complete question is saved, and only then is
+`event: done` sent with the full question. If generation or saving fails,
+`event: error` is sent instead and the stream ends.
+"""
+import json
+import time
+
+
+def sse_event(data: dict, event: str = None) -> str:
+    """Format one server-sent event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def question_events(chunks, save, label: str = ""):
+    """
+    Yield SSE frames for an async iterator of question chunks. save is an
+    async callable receiving the complete, stripped question.
+    """
+    start_time = time.time()
+    first_token_time = None
+    parts = []
+    try:
+        async for chunk in chunks:
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+            parts.append(chunk)
+            yield sse_event({"token": chunk})
+    except Exception as e:
+        print(f"Error streaming question{label}: {e}")
+        yield sse_event({"error": f"Failed to generate question: {str(e)}"}, event="error")
+        return
+
+    # Persist the complete question only once the stream has finished
+    question = "".join(parts).strip()
+    try:
+        await save(question)
+    except Exception as e:
+        yield sse_event({"error": f"Failed to save question: {str(e)}"}, event="error")
+        return
+    if first_token_time is not None:
+        print(f"Question streaming{label}: first token {first_token_time:.2f}s, total {time.time() - start_time:.2f}s")
+    yield sse_event({"question": question}, event="done")
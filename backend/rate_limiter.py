@@ -0,0 +1,462 @@
+"""
+Token-bucket rate limiting for LLM calls.
+
+Every model gets a requests-per-minute and a tokens-per-minute bucket. The
+bucket state lives in a pluggable store so that several uvicorn workers can
+share one budget:
+
+- "memory": in-process only (default)
+- "file":   a JSON state file guarded by an OS file lock (workers on one host)
+- "mongo":  the `rate_limits` collection with versioned compare-and-set updates
+
+The buckets are also fed with the quota Groq reports in its response headers
+(`Retry-After`, `x-ratelimit-remaining-*`, `x-ratelimit-reset-*`), so calls
+wait until the server-side quota resets, or fall back to another model,
+instead of spending a round-trip on a 429.
+"""
+import os
+import re
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from email.utils import parsedate_to_datetime
+
+from backend.executors import ExecutorSaturated, llm_executor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import tiktoken  # Optional: exact counts for OpenAI-style BPE vocabularies
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+DEFAULT_RPM = int(os.getenv("GROQ_RPM_LIMIT", "30"))
+DEFAULT_TPM = int(os.getenv("GROQ_TPM_LIMIT", "6000"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_STATE_FILE = os.getenv(
+    "RATE_LIMIT_STATE_FILE",
+    os.path.join(tempfile.gettempdir(), "interview_assistant_rate_limits.json")
+)
+# Longest we are willing to wait for one model's budget before giving up on it
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "20"))
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a model's budget would not free up within the allowed wait."""
+
+    def __init__(self, model_name: str, wait_time: float):
+        super().__init__(f"Rate limit budget exhausted for {model_name} (would wait {wait_time:.1f}s)")
+        self.model_name = model_name
+        self.wait_time = wait_time
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count of text: exact with tiktoken when installed, otherwise about
+    4 characters per token. Also used for prompt budgets (token_budget).
+    """
+    if _encoding is not None:
+        return max(1, len(_encoding.encode(text or "")))
+    return max(1, len(text or "") // 4)
+
+
+def load_model_limits() -> dict:
+    """
+    Per-model overrides from GROQ_RATE_LIMITS, e.g.
+    {"llama3-70b-8192": {"rpm": 30, "tpm": 6000}}
+    """
+    raw = os.getenv("GROQ_RATE_LIMITS")
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        print(f"Ignoring invalid GROQ_RATE_LIMITS: {e}")
+        return {}
+
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value):
+    """
+    Seconds from a rate limit header value: plain seconds ("12", "0.5"),
+    Groq-style durations ("2m59.56s", "7.66s", "120ms") or an HTTP date.
+    Returns None if the value can't be parsed.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value.replace(" ", ""):
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_headers(headers) -> dict:
+    """
+    Extract the quota fields Groq (and OpenAI-compatible servers) send.
+    Missing or malformed headers come back as None.
+    """
+    headers = {str(k).lower(): v for k, v in dict(headers or {}).items()}
+
+    def _int(name):
+        try:
+            return int(float(headers[name]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    return {
+        "retry_after": parse_duration(headers.get("retry-after")),
+        "remaining_requests": _int("x-ratelimit-remaining-requests"),
+        "remaining_tokens": _int("x-ratelimit-remaining-tokens"),
+        "reset_requests": parse_duration(headers.get("x-ratelimit-reset-requests")),
+        "reset_tokens": parse_duration(headers.get("x-ratelimit-reset-tokens")),
+    }
+
+
+def _server_wait(state: dict, tokens: int, now: float) -> float:
+    """
+    Seconds until the server-side quota allows this call (0 if it does now).
+    Reported quotas are forgotten once their reset time has passed.
+    """
+    waits = [state.get("blocked_until", 0.0) - now]
+    for kind, needed in (("requests", 1), ("tokens", tokens)):
+        remaining = state.get(f"server_{kind}")
+        if remaining is None:
+            continue
+        reset_at = state.get(f"server_{kind}_reset_at", 0.0)
+        if now >= reset_at:
+            state[f"server_{kind}"] = None
+        elif remaining < needed:
+            waits.append(reset_at - now)
+    return max(0.0, max(waits))
+
+
+def _apply_server_quota(state: dict, quota: dict, now: float, status_code: int, default_wait: float) -> float:
+    """
+    Store the quota reported by the server. For a 429, block the model until
+    the reported reset and return the wait.
+    """
+    for kind in ("requests", "tokens"):
+        remaining = quota[f"remaining_{kind}"]
+        if remaining is not None:
+            state[f"server_{kind}"] = remaining
+            reset = quota[f"reset_{kind}"]
+            # "0s" means the window resets now; only a missing reset falls back to a minute
+            state[f"server_{kind}_reset_at"] = now + (60.0 if reset is None else reset)
+    if status_code != 429:
+        return 0.0
+
+    wait_time = quota["retry_after"]
+    if wait_time is None:
+        exhausted = [quota[f"reset_{kind}"] for kind in ("requests", "tokens")
+                     if quota[f"remaining_{kind}"] == 0 and quota[f"reset_{kind}"] is not None]
+        wait_time = max(exhausted) if exhausted else default_wait
+    state["blocked_until"] = max(state.get("blocked_until", 0.0), now + wait_time)
+    return wait_time
+
+
+def _refill(state: dict, limits: dict, now: float):
+    elapsed = max(0.0, now - state["updated"])
+    state["requests"] = min(limits["rpm"], state["requests"] + elapsed * limits["rpm"] / 60.0)
+    state["tokens"] = min(limits["tpm"], state["tokens"] + elapsed * limits["tpm"] / 60.0)
+    state["updated"] = now
+
+
+def _take(state: dict, limits: dict, tokens: int, now: float) -> float:
+    """
+    Take one request and `tokens` tokens from the buckets. Returns 0 on success,
+    otherwise the number of seconds until enough budget will be available.
+    """
+    _refill(state, limits, now)
+    server_wait = _server_wait(state, tokens, now)
+    if server_wait > 0:
+        return server_wait
+    # A single request larger than the whole bucket must still be able to run
+    tokens = min(tokens, limits["tpm"])
+
+    if state["requests"] >= 1 and state["tokens"] >= tokens:
+        state["requests"] -= 1
+        state["tokens"] -= tokens
+        # Keep the reported quota current until the next response updates it
+        if state.get("server_requests") is not None:
+            state["server_requests"] -= 1
+        if state.get("server_tokens") is not None:
+            state["server_tokens"] -= tokens
+        return 0.0
+
+    wait_requests = max(0.0, 1 - state["requests"]) * 60.0 / limits["rpm"]
+    wait_tokens = max(0.0, tokens - state["tokens"]) * 60.0 / limits["tpm"]
+    return max(wait_requests, wait_tokens)
+
+
+def _adjust_tokens(state: dict, limits: dict, delta: int, now: float):
+    _refill(state, limits, now)
+    state["tokens"] = min(limits["tpm"], state["tokens"] - delta)
+
+
+def _give_back(state: dict, limits: dict, tokens: int, now: float):
+    """
+    Undo a _take() whose call was never completed.
+    """
+    _refill(state, limits, now)
+    tokens = min(tokens, limits["tpm"])
+    state["requests"] = min(limits["rpm"], state["requests"] + 1)
+    state["tokens"] = min(limits["tpm"], state["tokens"] + tokens)
+    if state.get("server_requests") is not None:
+        state["server_requests"] += 1
+    if state.get("server_tokens") is not None:
+        state["server_tokens"] += tokens
+
+
+class MemoryBucketStore:
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def update(self, key: str, initial: dict, fn):
+        with self._lock:
+            state = self._states.setdefault(key, dict(initial))
+            return fn(state)
+
+
+class FileBucketStore:
+    """
+    Bucket state shared between processes on one host through a JSON file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def update(self, key: str, initial: dict, fn):
+        with self._lock, open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    states = json.loads(raw) if raw.strip() else {}
+                except json.JSONDecodeError:
+                    states = {}
+                state = states.setdefault(key, dict(initial))
+                result = fn(state)
+                f.seek(0)
+                f.truncate()
+                json.dump(states, f)
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class MongoBucketStore:
+    """
+    Bucket state shared between processes and hosts via Mongo. Each update is
+    an optimistic compare-and-set on a version field.
+    """
+
+    def __init__(self, collection, max_attempts: int = 10):
+        self.collection = collection
+        self.max_attempts = max_attempts
+
+    def update(self, key: str, initial: dict, fn):
+        from pymongo.errors import DuplicateKeyError
+
+        for _ in range(self.max_attempts):
+            doc = self.collection.find_one({"_id": key})
+            state = dict(doc["state"]) if doc else dict(initial)
+            result = fn(state)
+
+            if doc is None:
+                try:
+                    self.collection.insert_one({"_id": key, "state": state, "version": 1})
+                    return result
+                except DuplicateKeyError:
+                    continue
+
+            updated = self.collection.update_one(
+                {"_id": key, "version": doc["version"]},
+                {"$set": {"state": state}, "$inc": {"version": 1}}
+            )
+            if updated.modified_count:
+                return result
+
+        # Heavy contention: ask the caller to retry shortly
+        return 0.05
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter keyed by model name.
+    """
+
+    def __init__(self, store=None, model_limits: dict = None, clock=time.time):
+        self.store = store or MemoryBucketStore()
+        self.model_limits = model_limits if model_limits is not None else load_model_limits()
+        self.clock = clock
+
+    def limits_for(self, model_name: str) -> dict:
+        limits = self.model_limits.get(model_name, {})
+        return {
+            "rpm": float(limits.get("rpm", DEFAULT_RPM)),
+            "tpm": float(limits.get("tpm", DEFAULT_TPM))
+        }
+
+    def _initial_state(self, limits: dict) -> dict:
+        return {"requests": limits["rpm"], "tokens": limits["tpm"], "updated": self.clock()}
+
+    def try_acquire(self, model_name: str, tokens: int = 0) -> float:
+        """
+        Reserve budget for one call. Returns 0 if reserved, otherwise the time
+        to wait before trying again.
+        """
+        limits = self.limits_for(model_name)
+        now = self.clock()
+        return self.store.update(
+            model_name,
+            self._initial_state(limits),
+            lambda state: _take(state, limits, tokens, now)
+        )
+
+    def consume(self, model_name: str, tokens: int):
+        """
+        Adjust the token bucket once the real usage is known. Negative values
+        refund an over-estimate.
+        """
+        if not tokens:
+            return
+        limits = self.limits_for(model_name)
+        now = self.clock()
+        self.store.update(
+            model_name,
+            self._initial_state(limits),
+            lambda state: _adjust_tokens(state, limits, tokens, now)
+        )
+
+    def release(self, model_name: str, tokens: int = 0):
+        """
+        Give back a reservation from try_acquire() for a call that got no
+        response (cancelled or failed in transit). The next response's headers
+        correct the server-side quota if Groq counted it after all.
+        """
+        limits = self.limits_for(model_name)
+        now = self.clock()
+        self.store.update(
+            model_name,
+            self._initial_state(limits),
+            lambda state: _give_back(state, limits, tokens, now)
+        )
+
+    def release_nowait(self, model_name: str, tokens: int = 0):
+        """
+        release() without awaiting, so it can run while a task is being
+        cancelled. Shared stores are updated on the LLM executor.
+        """
+        if isinstance(self.store, MemoryBucketStore):
+            self.release(model_name, tokens)
+            return
+        try:
+            llm_executor.submit(self.release, model_name, tokens)
+        except ExecutorSaturated:
+            print(f"LLM executor busy, could not give back the {model_name} reservation")
+
+    def observe_headers(self, model_name: str, headers, status_code: int = 200, default_wait: float = 1.0) -> float:
+        """
+        Update the model's live quota from a response's rate limit headers.
+        For a 429 the model is blocked until the reported reset (Retry-After,
+        else the exhausted x-ratelimit-reset-*, else default_wait) and that
+        wait is returned; the next acquire() sleeps exactly that long, or
+        raises RateLimitExceeded if it is longer than the caller will wait.
+        """
+        quota = parse_rate_limit_headers(headers)
+        if status_code != 429 and all(value is None for value in quota.values()):
+            return 0.0
+        limits = self.limits_for(model_name)
+        now = self.clock()
+        return self.store.update(
+            model_name,
+            self._initial_state(limits),
+            lambda state: _apply_server_quota(state, quota, now, status_code, default_wait)
+        )
+
+    async def observe_headers_async(self, model_name: str, headers, status_code: int = 200,
+                                    default_wait: float = 1.0) -> float:
+        if isinstance(self.store, MemoryBucketStore):
+            return self.observe_headers(model_name, headers, status_code, default_wait)
+        return await llm_executor.run(self.observe_headers, model_name, headers, status_code, default_wait)
+
+    def acquire(self, model_name: str, tokens: int = 0, max_wait: float = RATE_LIMIT_MAX_WAIT) -> float:
+        """
+        Block until budget is available. Returns the total time waited.
+        """
+        waited = 0.0
+        while True:
+            wait_time = self.try_acquire(model_name, tokens)
+            if wait_time <= 0:
+                return waited
+            if waited + wait_time > max_wait:
+                raise RateLimitExceeded(model_name, wait_time)
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def _release_if_taken(self, future, model_name: str, tokens: int):
+        if not future.cancelled() and future.exception() is None and future.result() <= 0:
+            self.release(model_name, tokens)
+
+    async def acquire_async(self, model_name: str, tokens: int = 0, max_wait: float = RATE_LIMIT_MAX_WAIT) -> float:
+        """
+        Await until budget is available without blocking the event loop.
+        """
+        waited = 0.0
+        while True:
+            if isinstance(self.store, MemoryBucketStore):
+                wait_time = self.try_acquire(model_name, tokens)
+            else:
+                future = llm_executor.submit(self.try_acquire, model_name, tokens)
+                try:
+                    wait_time = await asyncio.wrap_future(future)
+                except asyncio.CancelledError:
+                    # The worker may still make the reservation; give it back once it has
+                    future.add_done_callback(lambda done: self._release_if_taken(done, model_name, tokens))
+                    raise
+            if wait_time <= 0:
+                return waited
+            if waited + wait_time > max_wait:
+                raise RateLimitExceeded(model_name, wait_time)
+            await asyncio.sleep(wait_time)
+            waited += wait_time
+
+
+def create_bucket_store(backend: str = RATE_LIMIT_BACKEND):
+    if backend == "file":
+        if fcntl is None:
+            print("File-based rate limit state needs fcntl, using in-memory limiter")
+            return MemoryBucketStore()
+        return FileBucketStore(RATE_LIMIT_STATE_FILE)
+    if backend == "mongo":
+        from backend.mongo import db
+        return MongoBucketStore(db["rate_limits"])
+    return MemoryBucketStore()
+
+
+# Global limiter instance
+limiter = RateLimiter(create_bucket_store())
@@ -1,11 +1,27 @@
-import json
-from backend.llm_client import model, clean_llm_json
+from backend.llm_client import generate_json_content
+from backend.llm_scheduler import BATCH
+from backend.llm_schemas import AnswerAssessment
+from backend.token_budget import budget_for, truncate_words
 
 def score_candidate_answer(question: str, answer: str) -> dict:
     """
-    Score the candidate's answer based on interview rubrics.
+    Score the candidate's answer based on interview rubrics (without feedback).
+    Shares the prompt and response cache with score_and_feedback.
     """
-    prompt = f"""Rate this interview answer (0-5 each): clarity, relevance, technical_depth, confidence.
+    assessment = score_and_feedback(question, answer)
+    assessment.pop("feedback", None)
+    return assessment
+
+
+def score_and_feedback(question: str, answer: str) -> dict:
+    """
+    Score the candidate's answer and write coaching feedback in one call.
+    Returns the rubric scores, a short comment and a "feedback" field.
+    """
+    budget = budget_for("score_and_feedback")
+    question = truncate_words(question, budget["question"])
+    answer = truncate_words(answer, budget["answer"])
+    prompt = f"""You are an experienced interview coach. Rate this interview answer (0-5 each): clarity, relevance, technical_depth, confidence, and give coaching feedback.
 
 SCORING GUIDELINES:
 - Clarity (0-5): How well the answer is communicated and structured
@@ -17,37 +33,37 @@ ONLY assign 0 scores if the answer is completely irrelevant, contains only fille
 
 For any reasonable attempt to answer, start with at least 1-2 points and adjust based on quality.
 
+FEEDBACK GUIDELINES (2-3 sentences):
+- Cover clarity and structure, whether it directly addressed the question, use of examples or evidence, and depth of explanation
+- Be specific. Avoid vague compliments like "good attempt" or "great answer."
+- If the answer is strong, say what made it strong. If it needs improvement, say exactly what and how.
+
 Return JSON only:
 {{
     "clarity": 4,
     "relevance": 3,
     "technical_depth": 4,
     "confidence": 3,
-    "comment": "Brief comment"
+    "comment": "Brief comment",
+    "feedback": "Coaching feedback text"
 }}
 
 Q: {question}
 A: {answer}"""
 
     try:
-        response = model.generate_content(prompt)
-        cleaned_response = clean_llm_json(response.text)
-        result = json.loads(cleaned_response)
-        # Ensure all required fields are present with default values
-        return {
-            "clarity": result.get("clarity", 2),  # Default to 2 for reasonable baseline
-            "relevance": result.get("relevance", 2),  # Default to 2 for reasonable baseline
-            "technical_depth": result.get("technical_depth", 2),  # Default to 2 for reasonable baseline
-            "confidence": result.get("confidence", 2),  # Default to 2 for reasonable baseline
-            "comment": result.get("comment", "No comment available")
-        }
+        result = generate_json_content(prompt, schema=AnswerAssessment, cache=True, max_tokens=budget["max_tokens"],
+                                       priority=BATCH)
+        if "error" in result:
+            raise ValueError(result["error"])
+        return result
     except Exception as e:
-        print(f"Scoring error: {e}")
-        # Return reasonable default scores if parsing fails
+        print(f"Score and feedback error: {e}")
         return {
             "clarity": 2,
             "relevance": 2,
             "technical_depth": 2,
             "confidence": 2,
-            "comment": "Scoring failed - using default values"
+            "comment": "Scoring failed - using default values",
+            "feedback": "Feedback generation failed."
         }
@@ -0,0 +1,58 @@
+"""
+Per-user session history retention.
+
+A user keeps their SESSION_RETENTION_PER_USER most recent sessions. Pruning
+costs a count, one indexed lookup of the oldest session to keep and a single
+server-side delete_many, served by the (user_email, created_at desc, _id desc)
+index; documents are never loaded or deleted one at a time.
+"""
+import os
+
+# Session history kept per user
+SESSION_RETENTION_PER_USER = int(os.getenv("SESSION_RETENTION_PER_USER", "6"))
+
+
+def prune_user_sessions(sessions, user_email: str, keep: int = SESSION_RETENTION_PER_USER) -> tuple:
+    """
+    Delete all but the `keep` most recent sessions of a user with one
+    server-side delete_many. Returns (sessions_before, sessions_deleted).
+    """
+    total = sessions.count_documents({"user_email": user_email})
+    if total <= keep:
+        return total, 0
+
+    # The oldest session to keep; everything older in (created_at, _id) order goes
+    oldest_kept = next(
+        sessions.find({"user_email": user_email}, {"created_at": 1})
+        .sort([("created_at", -1), ("_id", -1)])
+        .skip(max(keep - 1, 0))
+        .limit(1),
+        None
+    )
+    if oldest_kept is None:
+        return total, 0
+    if keep == 0:
+        query = {"user_email": user_email}
+    elif oldest_kept.get("created_at") is None:
+        # Sessions without created_at sort last
+        query = {"user_email": user_email, "created_at": None, "_id": {"$lt": oldest_kept["_id"]}}
+    else:
+        cutoff = oldest_kept["created_at"]
+        query = {"user_email": user_email, "$or": [
+            {"created_at": {"$lt": cutoff}},
+            {"created_at": cutoff, "_id": {"$lt": oldest_kept["_id"]}},
+            {"created_at": None}
+        ]}
+    return total, sessions.delete_many(query).deleted_count
+
+
+def sweep_old_sessions(sessions, keep: int = SESSION_RETENTION_PER_USER) -> int:
+    """
+    Apply the per-user retention cap to every user over it. Returns the number
+    of sessions deleted.
+    """
+    over_cap = sessions.aggregate([
+        {"$group": {"_id": "$user_email", "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": keep}}}
+    ])
+    return sum(prune_user_sessions(sessions, row["_id"], keep)[1] for row in over_cap if row["_id"])
@@ -0,0 +1,205 @@
+"""
+Live interview session state, shared between uvicorn workers.
+
+Backends (SESSION_BACKEND):
+- "memory": bounded in-process LRU with TTL (single worker, the default)
+- "mongo":  the `live_sessions` collection (TTL index on `expires_at`). Every
+            read goes to Mongo: any worker may have written the session last,
+            so a per-process copy could be stale
+
+Every session carries a version number. Writes go through
+SessionStore.update(session_id, fn): fn mutates a fresh copy of the session
+and the write only succeeds if nobody else wrote in between
+(compare-and-set). On a conflict the session is re-read and fn re-applied,
+so concurrent requests never overwrite each other's `index` or `transcript`
+changes. fn raises SessionConflict to abort when the re-read state no longer
+allows the change (e.g. another request already advanced the interview).
+"""
+import os
+import copy
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory").lower()
+# Idle sessions expire after this long (sliding, renewed on every write)
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "86400"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+SESSION_CAS_ATTEMPTS = int(os.getenv("SESSION_CAS_ATTEMPTS", "10"))
+
+
+class SessionConflict(Exception):
+    """Raised when a session update can't be applied to the current state."""
+
+
+class _LRU:
+    """
+    Thread-safe LRU of (value, stored_at) with a maximum age.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.clock() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[0] if entry else None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class MemorySessionBackend:
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, ttl: float = SESSION_TTL_SECONDS, clock=time.monotonic):
+        self._sessions = _LRU(max_entries, ttl, clock)
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str):
+        """Return (data, version) or None."""
+        return self._sessions.get(session_id)
+
+    def insert(self, session_id: str, data: dict):
+        self._sessions.set(session_id, (data, 1))
+
+    def compare_and_set(self, session_id: str, version: int, data: dict) -> bool:
+        with self._lock:
+            current = self._sessions.get(session_id)
+            if current is None or current[1] != version:
+                return False
+            self._sessions.set(session_id, (data, version + 1))
+            return True
+
+    def delete(self, session_id: str):
+        self._sessions.pop(session_id)
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+
+class MongoSessionBackend:
+    """
+    Sessions as {_id: session_id, data, version, expires_at} documents.
+    Mongo's TTL monitor removes documents once `expires_at` has passed.
+    """
+
+    def __init__(self, collection, ttl: float = SESSION_TTL_SECONDS):
+        self.collection = collection
+        self.ttl = ttl
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.ttl)
+
+    def load(self, session_id: str):
+        doc = self.collection.find_one({"_id": session_id, "expires_at": {"$gt": datetime.utcnow()}})
+        if doc is None:
+            return None
+        return doc["data"], doc["version"]
+
+    def insert(self, session_id: str, data: dict):
+        self.collection.replace_one(
+            {"_id": session_id},
+            {"data": data, "version": 1, "expires_at": self._expires_at()},
+            upsert=True
+        )
+
+    def compare_and_set(self, session_id: str, version: int, data: dict) -> bool:
+        result = self.collection.update_one(
+            {"_id": session_id, "version": version},
+            {"$set": {"data": data, "expires_at": self._expires_at()}, "$inc": {"version": 1}}
+        )
+        return result.modified_count == 1
+
+    def delete(self, session_id: str):
+        self.collection.delete_one({"_id": session_id})
+
+    def count(self) -> int:
+        return self.collection.estimated_document_count()
+
+
+class SessionStore:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, session_id: str):
+        """
+        Return a copy of the session data, or None if it doesn't exist or expired.
+        """
+        if not session_id:
+            return None
+        entry = self.backend.load(session_id)
+        return copy.deepcopy(entry[0]) if entry else None
+
+    def exists(self, session_id: str) -> bool:
+        return bool(session_id) and self.backend.load(session_id) is not None
+
+    def create(self, session_id: str, data: dict):
+        data = copy.deepcopy(data)
+        data.pop("_id", None)
+        self.backend.insert(session_id, data)
+
+    def update(self, session_id: str, fn) -> dict:
+        """
+        Apply fn(data) to the current session and write it with
+        compare-and-set, retrying on concurrent writes. Returns a copy of the
+        updated data. Raises KeyError if the session doesn't exist and
+        SessionConflict if fn rejects the current state or contention persists.
+        """
+        for _ in range(SESSION_CAS_ATTEMPTS):
+            entry = self.backend.load(session_id)
+            if entry is None:
+                raise KeyError(session_id)
+            data, version = entry
+            data = copy.deepcopy(data)
+            fn(data)
+            if self.backend.compare_and_set(session_id, version, data):
+                return copy.deepcopy(data)
+            # Someone else wrote first: re-read and retry
+        raise SessionConflict(f"Session {session_id} is being updated concurrently, please retry")
+
+    def set_fields(self, session_id: str, **fields) -> dict:
+        return self.update(session_id, lambda data: data.update(fields))
+
+    def delete(self, session_id: str):
+        self.backend.delete(session_id)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "sessions": self.backend.count()
+        }
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    if backend == "mongo":
+        from backend.mongo import db
+        return SessionStore(MongoSessionBackend(db["live_sessions"]))
+    return SessionStore(MemorySessionBackend())
+
+
+session_store = create_session_store()
@@ -0,0 +1,95 @@
+"""
+Single-flight coalescing of identical in-flight work.
+
+The first caller for a key runs the work; concurrent callers with the same
+key wait for that result instead of starting a duplicate call. Sync callers
+(threads) and async callers (event loop) share the same in-flight table.
+
+Errors raised by the work are shared with the waiters. If the first caller
+is cancelled instead (a hedge loser, a client disconnect, shutdown), the
+waiters are not cancelled with it: one of them runs the work again.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class _LeaderAborted(Exception):
+    """The running call was cancelled or interrupted before it finished."""
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _claim(self, key):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _release(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def in_flight(self, key) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def _finish(self, key, future, result=None, error: BaseException = None):
+        self._release(key)
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            # Cancellation belongs to the leader only; let a waiter take over
+            future.set_exception(_LeaderAborted())
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is already in
+        flight, in which case block until it finishes and share its result.
+        """
+        while True:
+            future, leader = self._claim(key)
+            if leader:
+                break
+            try:
+                return future.result()
+            except _LeaderAborted:
+                continue  # Retry, possibly as the new leader
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key, coro_fn, *args, **kwargs):
+        """
+        Async variant of do(); coro_fn is awaited by the first caller only.
+        """
+        while True:
+            future, leader = self._claim(key)
+            if leader:
+                break
+            try:
+                # Shielded: a waiter being cancelled must not cancel the shared future
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderAborted:
+                continue  # Retry, possibly as the new leader
+
+        try:
+            result = await coro_fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
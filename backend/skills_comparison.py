@@ -0,0 +1,67 @@
+"""
+Cached resume vs job description skills comparison.
+
+Results are stored per (resume hash, JD hash, prompt version), so an edit
+to the comparison prompt starts a fresh cache instead of serving results
+produced by the old prompt. Failed comparisons are not stored.
+"""
+import hashlib
+from datetime import datetime
+
+from backend.llm_scheduler import STANDARD
+
+
+def text_hash(text: str) -> str:
+    # Same digest the uploads use for file hashes
+    return hashlib.md5((text or "").encode("utf-8")).hexdigest()
+
+
+class SkillsComparer:
+    """
+    compare(resume_text, jd_text, priority=..., cache=...) returns the
+    comparison, with an "error" key on failure; prompt_version() returns the
+    current version of its prompt. collection is the pymongo collection the
+    results are stored in; flight is a SingleFlight shared with other work.
+    """
+
+    def __init__(self, collection, flight, compare, prompt_version):
+        self.collection = collection
+        self.flight = flight
+        self.compare = compare
+        self.prompt_version = prompt_version
+
+    def get(self, resume_text: str, jd_text: str, priority: str = STANDARD, force_refresh: bool = False):
+        """
+        Get the comparison from the collection or run and store it;
+        force_refresh skips the stored result.
+        """
+        key = {
+            "resume_hash": text_hash(resume_text),
+            "jd_hash": text_hash(jd_text),
+            "prompt_version": self.prompt_version()
+        }
+        if not force_refresh:
+            existing = self.collection.find_one(key, {"result": 1})
+            if existing:
+                print(f"Using cached skills comparison for resume {key['resume_hash']} and JD {key['jd_hash']}")
+                return existing["result"]
+
+        # Concurrent requests for the same pair share one comparison
+        flight_key = ("skills", key["resume_hash"], key["jd_hash"], key["prompt_version"], force_refresh)
+        return self.flight.do(flight_key, self._compare_and_save, key, resume_text, jd_text, priority, force_refresh)
+
+    def _compare_and_save(self, key: dict, resume_text: str, jd_text: str, priority: str, force_refresh: bool):
+        if not force_refresh:
+            # Another request may have finished the comparison while we waited
+            existing = self.collection.find_one(key, {"result": 1})
+            if existing:
+                return existing["result"]
+
+        result = self.compare(resume_text, jd_text, priority=priority, cache=not force_refresh)
+        if "error" not in result:  # Failed comparisons are retried next time
+            self.collection.update_one(
+                key,
+                {"$set": {"result": result, "created_at": datetime.utcnow()}},
+                upsert=True
+            )
+        return result
@@ -0,0 +1,189 @@
+"""
+Token counting and budget-aware prompt trimming.
+
+Every LLM call site has a budget for each of its inputs and for the response
+(`max_tokens`). Inputs that exceed their budget are trimmed by section
+priority (skills and experience are kept before hobbies or boilerplate) and
+cut at sentence or word boundaries, never mid-word.
+"""
+import re
+
+from backend.rate_limiter import estimate_tokens
+
+DEFAULT_MAX_TOKENS = 4000
+
+# Input and output budgets (in tokens) per call site
+CALL_SITE_BUDGETS = {
+    # Parse outputs carry every job, project and requirement over into JSON; a
+    # cap below that gets finish_reason=length and cut-off JSON
+    "resume_parsing": {"resume": 3000, "max_tokens": 3000},
+    "jd_parsing": {"jd": 2000, "max_tokens": 1500},
+    "skills_comparison": {"resume": 1200, "jd": 1200, "max_tokens": 600},
+    "question_generation": {"resume": 1200, "jd": 1000, "transcript": 1200, "max_tokens": 200},
+    "greeting": {"resume": 150, "jd": 250, "max_tokens": 150},
+    "score_and_feedback": {"question": 300, "answer": 800, "max_tokens": 400},
+    "question_consistency": {"resume": 400, "jd": 400, "max_tokens": 1000},
+    "hallucination_check": {"output": 1500, "resume": 400, "jd": 400, "max_tokens": 700},
+    "feedback_quality": {"feedback": 1200, "max_tokens": 800},
+    "tone_analysis": {"answer": 800, "max_tokens": 100},
+}
+
+# Lower number = kept first when a document has to be trimmed
+SECTION_PRIORITIES = {
+    "skills": 0, "technical skills": 0, "experience": 0, "work experience": 0,
+    "professional experience": 0, "employment": 0, "requirements": 0,
+    "required skills": 0, "qualifications": 0, "responsibilities": 0,
+    "what you'll do": 0, "projects": 1, "summary": 1, "profile": 1,
+    "preferred": 1, "preferred qualifications": 1, "nice to have": 1,
+    "education": 2, "certifications": 2, "publications": 3, "awards": 3,
+    "patents": 3, "about us": 3, "about the company": 3, "volunteer": 4,
+    "hobbies": 4, "interests": 4, "benefits": 4, "perks": 4,
+    "references": 5, "equal opportunity": 5, "eeo": 5,
+}
+DEFAULT_SECTION_PRIORITY = 2
+MIN_PARTIAL_SECTION_TOKENS = 20
+
+_WORD_RE = re.compile(r"\S+\s*")
+_SENTENCE_END_RE = re.compile(r"[.!?;]\s*$|\n\s*$")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Tokens in text, counted the same way the rate limiter reserves them
+    (rate_limiter.estimate_tokens).
+    """
+    if not text:
+        return 0
+    return estimate_tokens(text)
+
+
+def budget_for(call_site: str) -> dict:
+    return CALL_SITE_BUDGETS.get(call_site, {})
+
+
+def max_tokens_for(call_site: str) -> int:
+    return budget_for(call_site).get("max_tokens", DEFAULT_MAX_TOKENS)
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return False
+    name = stripped.rstrip(":").strip().lower()
+    return name in SECTION_PRIORITIES or (stripped.isupper() and any(c.isalpha() for c in stripped)) or \
+        (stripped.endswith(":") and len(stripped.split()) <= 5)
+
+
+def split_sections(text: str) -> list:
+    """
+    Split a document into sections at heading lines (e.g. "SKILLS", "Experience:").
+    Falls back to paragraphs when no headings are found.
+    """
+    lines = text.splitlines(keepends=True)
+    sections = []
+    current = []
+    for line in lines:
+        if _is_heading(line) and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+
+    if len(sections) <= 1:
+        sections = [p for p in re.split(r"(?<=\n)\s*\n", text) if p.strip()]
+    return sections
+
+
+def section_priority(section: str, index: int = None) -> int:
+    heading = section.strip().split("\n", 1)[0].strip().rstrip(":").lower()
+    if heading in SECTION_PRIORITIES:
+        return SECTION_PRIORITIES[heading]
+    for name, priority in SECTION_PRIORITIES.items():
+        if heading.startswith(name):
+            return priority
+    if index == 0:
+        # Preamble before the first heading: name, contact details, role title
+        return 1
+    return DEFAULT_SECTION_PRIORITY
+
+
+def truncate_words(text: str, budget: int) -> str:
+    """
+    Keep the longest prefix of whole words within the budget, preferring to
+    stop at the end of a sentence or line.
+    """
+    if count_tokens(text) <= budget:
+        return text
+    words = _WORD_RE.findall(text)
+    # Longest prefix of whole words that fits (counts grow with the prefix)
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens("".join(words[:mid])) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    kept = words[:low]
+    last_sentence_end = max((i + 1 for i, word in enumerate(kept) if _SENTENCE_END_RE.search(word)), default=0)
+    # Drop a trailing half-sentence unless that would throw away most of the text
+    if last_sentence_end >= len(kept) * 0.6:
+        kept = kept[:last_sentence_end]
+    return "".join(kept).rstrip()
+
+
+def trim_to_budget(text: str, budget: int) -> str:
+    """
+    Fit a document into `budget` tokens. Whole sections are kept in priority
+    order, the next section is cut at a word boundary, and the original
+    section order is preserved.
+    """
+    if not text or budget is None or count_tokens(text) <= budget:
+        return text
+
+    sections = split_sections(text)
+    order = sorted(range(len(sections)), key=lambda i: (section_priority(sections[i], i), i))
+    kept = {}
+    remaining = budget
+    for i in order:
+        cost = count_tokens(sections[i])
+        if cost <= remaining:
+            kept[i] = sections[i]
+            remaining -= cost
+        elif remaining >= MIN_PARTIAL_SECTION_TOKENS:
+            kept[i] = truncate_words(sections[i], remaining)
+            remaining = 0
+    return "".join(kept[i] if kept[i].endswith("\n") else kept[i] + "\n" for i in sorted(kept)).strip()
+
+
+def trim_transcript(transcript: list, budget: int) -> str:
+    """
+    Format the interview transcript within the budget. The most recent Q&A
+    pairs are kept in full; older ones shrink to just the question (so topics
+    are still not repeated) and are dropped last.
+    """
+    pairs = [f"Q: {t['question']}\nA: {t.get('answer', '')}" for t in transcript]
+    if count_tokens("\n".join(pairs)) <= budget:
+        return "\n".join(pairs)
+
+    kept = []
+    remaining = budget
+    for item, pair in zip(reversed(transcript), reversed(pairs)):
+        cost = count_tokens(pair)
+        if cost <= remaining:
+            kept.append(pair)
+            remaining -= cost
+            continue
+        if not kept:
+            # Follow-up questions depend on the latest answer, so shorten it rather than drop it
+            question = f"Q: {item['question']}\nA: "
+            pair = question + truncate_words(item.get("answer", ""), max(0, remaining - count_tokens(question)))
+            kept.append(pair)
+            remaining -= count_tokens(pair)
+            continue
+        question_only = f"Q: {item['question']}"
+        cost = count_tokens(question_only)
+        if cost <= remaining:
+            kept.append(question_only)
+            remaining -= cost
+    return "\n".join(reversed(kept))
@@ -0,0 +1,33 @@
+"""
+Analysis of an uploaded resume and job description.
+
+Resume parsing, JD parsing and the skills comparison are independent, so
+they run concurrently on the LLM executor and the event loop stays free.
+Pacing is left to the rate limiter and scheduler.
+"""
+import asyncio
+
+
+class UploadAnalyzer:
+    """
+    parse_resume(file_hash, text), parse_jd(file_hash, text) and
+    compare_skills(resume_text, jd_text) are blocking calls run on executor
+    (a BoundedExecutor).
+    """
+
+    def __init__(self, executor, parse_resume, parse_jd, compare_skills):
+        self.executor = executor
+        self.parse_resume = parse_resume
+        self.parse_jd = parse_jd
+        self.compare_skills = compare_skills
+
+    async def analyze(self, resume_hash: str, resume_text: str, jd_hash: str, jd_text: str):
+        """
+        Returns (parsed_resume, parsed_jd, skills_comparison). Raises
+        ExecutorSaturated if the executor can't take all three calls.
+        """
+        return await asyncio.gather(
+            self.executor.run(self.parse_resume, resume_hash, resume_text),
+            self.executor.run(self.parse_jd, jd_hash, jd_text),
+            self.executor.run(self.compare_skills, resume_text, jd_text)
+        )
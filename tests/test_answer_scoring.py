@@ -0,0 +1,162 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.answer_scoring import AnswerScorer
+from backend.executors import BoundedExecutor, ExecutorSaturated
+from backend.session_store import SessionStore, MemorySessionBackend
+
+
+def assessment(answer, clarity=4):
+    return {"clarity": clarity, "relevance": 4, "technical_depth": 4, "confidence": 4,
+            "comment": f"scored {answer}", "feedback": f"feedback on {answer}"}
+
+
+def make_scorer(score, transcript):
+    store = SessionStore(MemorySessionBackend())
+    store.create("s1", {"index": 0, "transcript": transcript})
+    return AnswerScorer(store, BoundedExecutor("test", 4, 4), score), store
+
+
+def submit(store, idx, answer):
+    def apply(session):
+        item = session["transcript"][idx]
+        item["answer"] = answer
+        item.pop("score", None)
+        item.pop("feedback", None)
+    return store.update("s1", apply)["transcript"][idx]
+
+
+def test_background_result_is_stored_on_the_transcript_item():
+    scorer, store = make_scorer(lambda q, a: assessment(a), [{"question": "Q1"}])
+
+    scorer.start("s1", 0, submit(store, 0, "A1"))
+    asyncio.run(scorer.wait("s1", timeout=5))
+
+    item = store.get("s1")["transcript"][0]
+    assert item["feedback"] == "feedback on A1"
+    assert item["score"]["comment"] == "scored A1"
+    assert "feedback" not in item["score"]
+
+
+def test_result_for_a_resubmitted_answer_is_discarded():
+    first_started, release_first = threading.Event(), threading.Event()
+
+    def score(question, answer):
+        if answer == "old":
+            first_started.set()
+            release_first.wait(5)
+        return assessment(answer)
+
+    scorer, store = make_scorer(score, [{"question": "Q1"}])
+    scorer.start("s1", 0, submit(store, 0, "old"))
+    assert first_started.wait(5)
+
+    scorer.start("s1", 0, submit(store, 0, "new"))
+    asyncio.run(scorer.wait("s1", timeout=5))
+    release_first.set()
+    scorer.executor.shutdown(wait=True)
+
+    item = store.get("s1")["transcript"][0]
+    assert item["answer"] == "new"
+    assert item["feedback"] == "feedback on new"
+
+
+def test_summary_awaits_background_scoring_instead_of_rescoring():
+    calls = []
+    release = threading.Event()
+
+    def score(question, answer):
+        calls.append(answer)
+        release.wait(5)
+        return assessment(answer)
+
+    scorer, store = make_scorer(score, [{"question": "Q1"}])
+    scorer.start("s1", 0, submit(store, 0, "A1"))
+    threading.Timer(0.1, release.set).start()
+
+    asyncio.run(scorer.wait("s1", timeout=5))
+    transcript, scores = asyncio.run(scorer.assess_transcript(store.get("s1")["transcript"]))
+
+    assert calls == ["A1"]
+    assert transcript[0]["feedback"] == "feedback on A1"
+    expected = assessment("A1")
+    del expected["feedback"]
+    assert scores == [expected]
+
+
+def test_failed_background_scoring_is_left_to_the_summary():
+    results = iter([{**assessment("A1"), "comment": "Scoring failed - using default values"}, assessment("A1", 5)])
+    scorer, store = make_scorer(lambda q, a: next(results), [{"question": "Q1"}])
+
+    scorer.start("s1", 0, submit(store, 0, "A1"))
+    asyncio.run(scorer.wait("s1", timeout=5))
+    assert "score" not in store.get("s1")["transcript"][0]
+
+    _, scores = asyncio.run(scorer.assess_transcript(store.get("s1")["transcript"]))
+    assert scores[0]["clarity"] == 5
+
+
+def test_summary_scores_concurrently_and_keeps_transcript_order():
+    # Later answers finish first; all four must be in flight at once to pass the barrier
+    barrier = threading.Barrier(4, timeout=5)
+    delays = {"A1": 0.15, "A2": 0.1, "A3": 0.05, "A4": 0}
+
+    def score(question, answer):
+        barrier.wait()
+        threading.Event().wait(delays[answer])
+        return assessment(answer, clarity=int(answer[1]))
+
+    transcript = [{"question": f"Q{i}", "answer": f"A{i}"} for i in range(1, 5)] + [{"question": "Q5"}]
+    scorer, _ = make_scorer(score, transcript)
+    scorer.concurrency = 4
+
+    enhanced, scores = asyncio.run(scorer.assess_transcript(transcript))
+
+    assert [item["question"] for item in enhanced] == ["Q1", "Q2", "Q3", "Q4", "Q5"]
+    assert [item.get("feedback") for item in enhanced] == [
+        "feedback on A1", "feedback on A2", "feedback on A3", "feedback on A4", None]
+    assert [score["clarity"] for score in scores] == [1, 2, 3, 4]
+
+
+def test_summary_scoring_concurrency_is_bounded():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def score(question, answer):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        threading.Event().wait(0.05)
+        with lock:
+            running[0] -= 1
+        return assessment(answer)
+
+    transcript = [{"question": f"Q{i}", "answer": f"A{i}"} for i in range(6)]
+    scorer, _ = make_scorer(score, transcript)
+    scorer.concurrency = 2
+
+    _, scores = asyncio.run(scorer.assess_transcript(transcript))
+
+    assert len(scores) == 6
+    assert peak[0] == 2
+
+
+def test_summary_scoring_runs_on_the_bounded_executor():
+    release = threading.Event()
+
+    def score(question, answer):
+        release.wait(5)
+        return assessment(answer)
+
+    transcript = [{"question": f"Q{i}", "answer": f"A{i}"} for i in range(3)]
+    scorer, _ = make_scorer(score, transcript)
+    scorer.executor = BoundedExecutor("tiny", 1, 0)
+    scorer.concurrency = 3
+
+    # One worker, no queue: the second answer is shed instead of getting its own thread
+    with pytest.raises(ExecutorSaturated):
+        asyncio.run(scorer.assess_transcript(transcript))
+    release.set()
+    scorer.executor.shutdown(wait=True)
@@ -0,0 +1,47 @@
+from backend.circuit_breaker import (
+    CircuitBreaker, CLOSED, OPEN, HALF_OPEN,
+    CIRCUIT_MIN_CALLS, CIRCUIT_OPEN_SECONDS, CIRCUIT_SLOW_CALL_SECONDS
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_repeated_failures_and_recovers_through_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", clock=clock)
+    for _ in range(CIRCUIT_MIN_CALLS):
+        assert breaker.allow_request()
+        breaker.record_failure(1.0, error="500")
+
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock.now += CIRCUIT_OPEN_SECONDS + 1
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow_request()
+
+    breaker.record_success(0.5)
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("m", clock=FakeClock())
+    for _ in range(CIRCUIT_MIN_CALLS):
+        breaker.record_success(CIRCUIT_SLOW_CALL_SECONDS + 1)
+    assert breaker.state == OPEN
+
+
+def test_fatal_error_opens_immediately():
+    breaker = CircuitBreaker("m", clock=FakeClock())
+    breaker.record_failure(0.1, error="model_decommissioned", fatal=True)
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["last_error"] == "model_decommissioned"
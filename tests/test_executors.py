@@ -0,0 +1,72 @@
+import sys
+import asyncio
+import threading
+import subprocess
+
+import pytest
+
+from backend.executors import BoundedExecutor, ExecutorSaturated
+
+
+def test_rejects_when_workers_and_queue_are_full():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1, retry_after=2.5)
+    release = threading.Event()
+    try:
+        running = executor.submit(release.wait)
+        queued = executor.submit(lambda: "queued")
+        with pytest.raises(ExecutorSaturated) as excinfo:
+            executor.submit(lambda: "rejected")
+        assert excinfo.value.retry_after_header == "3"
+        assert executor.snapshot()["queued"] == 1
+
+        release.set()
+        assert queued.result(timeout=5) == "queued"
+        running.result(timeout=5)
+        # Capacity is given back once tasks finish
+        assert executor.submit(lambda: "ok").result(timeout=5) == "ok"
+        assert executor.snapshot()["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_run_keeps_event_loop_free():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return 42
+
+    async def main():
+        task = asyncio.ensure_future(executor.run(blocking))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        # The loop still runs other work while the blocking call is in progress
+        await asyncio.sleep(0)
+        assert not task.done()
+        release.set()
+        return await task
+
+    try:
+        assert asyncio.run(main()) == 42
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_process_executor_runs_picklable_tasks():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0, processes=True)
+    try:
+        assert executor.submit(pow, 2, 10).result(timeout=30) == 1024
+    finally:
+        executor.shutdown()
+
+
+def test_pdf_worker_imports_do_not_open_the_llm_cache():
+    # Spawned PDF workers import backend.pdf_extractor; that must not build the persistent LLM cache
+    code = "import sys, backend.pdf_extractor; print('backend.llm_cache' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=30)
+    assert result.stdout.strip() == "False", result.stderr
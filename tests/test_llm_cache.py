@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+from backend.llm_cache import LLMCache, SQLiteCacheStore, make_cache_key
+
+
+def test_cache_key_depends_on_all_parameters():
+    base = {"model": ["m"], "temperature": 0.7, "max_tokens": 100, "prompt": "hi"}
+    assert make_cache_key(base) == make_cache_key(dict(base))
+    assert make_cache_key(base) != make_cache_key({**base, "max_tokens": 200})
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = LLMCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_disk_tier_survives_new_process(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LLMCache(store=SQLiteCacheStore(path)).set("key", "value")
+
+    fresh = LLMCache(store=SQLiteCacheStore(path))
+    assert fresh.get("key") == "value"
+    assert fresh.get_stats()["disk_hits"] == 1
+    # Promoted into the memory tier
+    assert fresh.get("key") == "value"
+    assert fresh.get_stats()["memory_hits"] == 1
+
+
+class RecordingStore:
+    """Persistent store stand-in that records which thread touched it."""
+
+    def __init__(self):
+        self.values = {}
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.current_thread())
+        return self.values.get(key)
+
+    def set(self, key, value, ttl):
+        self.threads.append(threading.current_thread())
+        self.values[key] = value
+
+
+def test_async_access_keeps_persistent_store_off_the_event_loop():
+    store = RecordingStore()
+    store.values["key"] = "stored"
+    cache = LLMCache(store=store)
+
+    async def main():
+        loop_thread = threading.current_thread()
+        value = await cache.get_async("key")
+        await cache.set_async("other", "value")
+        return loop_thread, value, await cache.get_async("key")
+
+    loop_thread, value, again = asyncio.run(main())
+
+    assert value == again == "stored"
+    assert store.values["other"] == "value"
+    assert len(store.threads) == 2  # The second read is a memory hit
+    assert loop_thread not in store.threads
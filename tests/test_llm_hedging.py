@@ -0,0 +1,153 @@
+import os
+import asyncio
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from backend import llm_client
+from backend.llm_scheduler import LLMScheduler
+from backend.rate_limiter import RateLimiter, MemoryBucketStore
+
+
+class FakeBreaker:
+    def __init__(self, allow=True):
+        self.allow = allow
+
+    def allow_request(self):
+        return self.allow
+
+    def record_success(self, latency):
+        pass
+
+
+class FakeBreakers:
+    def __init__(self, closed=()):
+        self.closed = set(closed)
+
+    def get(self, model_name):
+        return FakeBreaker(model_name in self.closed)
+
+
+def stub_models(monkeypatch, behaviours, closed=("primary", "backup")):
+    """
+    behaviours maps model name -> (delay, result); an Exception result is raised.
+    Returns the started and cancelled model names.
+    """
+    started, cancelled = [], []
+
+    async def call_model(model_name, prompt, max_tokens=None, json_mode=False, priority=None):
+        started.append(model_name)
+        delay, result = behaviours[model_name]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(model_name)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(llm_client, "_call_model_async", call_model)
+    monkeypatch.setattr(llm_client, "hedge_delay", lambda model_name: 0.05)
+    monkeypatch.setattr(llm_client, "breakers", FakeBreakers(closed))
+    return started, cancelled
+
+
+def hedged(tried=None):
+    tried = {"primary"} if tried is None else tried
+    return asyncio.run(llm_client._hedged_call_async("primary", ["backup"], tried, "prompt"))
+
+
+def test_faster_backup_wins_and_primary_is_cancelled(monkeypatch):
+    started, cancelled = stub_models(monkeypatch, {"primary": (1, "slow"), "backup": (0.05, "fast")})
+
+    assert hedged() == "fast"
+    assert started == ["primary", "backup"]
+    assert cancelled == ["primary"]
+
+
+def test_primary_answering_after_hedge_cancels_the_backup(monkeypatch):
+    started, cancelled = stub_models(monkeypatch, {"primary": (0.1, "primary"), "backup": (1, "backup")})
+
+    assert hedged() == "primary"
+    assert started == ["primary", "backup"]
+    assert cancelled == ["backup"]
+
+
+def test_no_hedge_when_every_backup_circuit_is_open(monkeypatch):
+    started, cancelled = stub_models(monkeypatch, {"primary": (0.1, "primary"), "backup": (0, "backup")},
+                                     closed=("primary",))
+
+    assert hedged() == "primary"
+    assert started == ["primary"]
+    assert cancelled == []
+
+
+def test_primary_failing_after_hedge_falls_back_to_backup(monkeypatch):
+    started, cancelled = stub_models(monkeypatch, {"primary": (0.1, RuntimeError("500")), "backup": (0.2, "backup")})
+    tried = {"primary"}
+
+    assert hedged(tried) == "backup"
+    assert tried == {"primary", "backup"}
+    assert cancelled == []
+
+
+def test_both_failing_raises(monkeypatch):
+    stub_models(monkeypatch, {"primary": (0.1, RuntimeError("primary")), "backup": (0.1, RuntimeError("backup"))})
+
+    with pytest.raises(RuntimeError):
+        hedged()
+
+
+def test_hedging_is_skipped_without_httpx(monkeypatch):
+    started, _ = stub_models(monkeypatch, {"primary": (0.1, "primary"), "backup": (0, "backup")})
+    monkeypatch.setattr(llm_client, "httpx", None)
+    monkeypatch.setattr(llm_client, "LLM_HEDGING", True)
+    monkeypatch.setattr(llm_client, "GROQ_MODELS", ["primary", "backup"])
+
+    text = asyncio.run(llm_client._generate_uncached_async("prompt", hedge=True))
+
+    assert text == "primary"
+    assert started == ["primary"]
+
+
+def test_cancelled_hedge_returns_its_slot_and_reservation(monkeypatch):
+    pytest.importorskip("httpx")
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+
+        def __init__(self, model_name):
+            self.model_name = model_name
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"choices": [{"message": {"content": self.model_name}}]}
+
+    class FakeClient:
+        async def post(self, url, json):
+            await asyncio.sleep({"primary": 1, "backup": 0.05}[json["model"]])
+            return FakeResponse(json["model"])
+
+    scheduler = LLMScheduler(max_concurrency=2, class_limits={"interactive": 2, "standard": 2, "batch": 2})
+    limits = {"rpm": 10, "tpm": 100000}
+    limiter = RateLimiter(MemoryBucketStore(), model_limits={"primary": limits, "backup": limits})
+    monkeypatch.setattr(llm_client, "scheduler", scheduler)
+    monkeypatch.setattr(llm_client, "limiter", limiter)
+    monkeypatch.setattr(llm_client, "get_async_http_client", lambda: FakeClient())
+    monkeypatch.setattr(llm_client, "hedge_delay", lambda model_name: 0.05)
+    monkeypatch.setattr(llm_client, "breakers", FakeBreakers(("primary", "backup")))
+
+    assert hedged() == "backup"
+
+    assert scheduler.snapshot()["running"] == 0
+    requests_left = {model: limiter.store.update(model, {}, lambda state: state["requests"])
+                     for model in ("primary", "backup")}
+    assert requests_left["primary"] == 10  # The cancelled primary gave its reservation back
+    assert requests_left["backup"] < 10
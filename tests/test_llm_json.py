@@ -0,0 +1,88 @@
+import os
+import json
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+pytest.importorskip("pydantic")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from backend import llm_client
+from backend.llm_schemas import ToneAnalysis, ResumeParse, JDParse
+
+
+def stub_generate(monkeypatch, *responses):
+    """Serve the given responses in order; returns the prompts received."""
+    prompts = []
+    remaining = list(responses)
+
+    def generate_content(prompt, cache=False, max_tokens=None, json_mode=False, priority=None):
+        assert json_mode
+        prompts.append(prompt)
+        response = remaining.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(llm_client, "generate_content", generate_content)
+    return prompts
+
+
+def test_valid_response_needs_no_repair(monkeypatch):
+    prompts = stub_generate(monkeypatch, '{"tone": "calm", "suggestion": "keep going"}')
+
+    result = llm_client.generate_json_content("prompt", schema=ToneAnalysis)
+
+    assert result == {"tone": "calm", "suggestion": "keep going"}
+    assert prompts == ["prompt"]
+
+
+def test_schema_failure_gets_one_repair(monkeypatch):
+    prompts = stub_generate(monkeypatch, '{"tone": "calm"}', '{"tone": "calm", "suggestion": "slow down"}')
+
+    result = llm_client.generate_json_content("prompt", schema=ToneAnalysis)
+
+    assert result == {"tone": "calm", "suggestion": "slow down"}
+    assert len(prompts) == 2
+    # The repair request carries the invalid response and the expected schema
+    assert '{"tone": "calm"}' in prompts[1]
+    assert json.dumps(ToneAnalysis.model_json_schema()) in prompts[1]
+
+
+def test_failed_repair_falls_back_to_error(monkeypatch):
+    prompts = stub_generate(monkeypatch, '{"tone": "calm"}', "still not json")
+
+    result = llm_client.generate_json_content("prompt", schema=ToneAnalysis)
+
+    assert result == {"error": "Invalid JSON from Groq", "raw_output": '{"tone": "calm"}'}
+    assert len(prompts) == 2
+
+
+def test_generation_error_is_not_repaired(monkeypatch):
+    prompts = stub_generate(monkeypatch, llm_client.AllModelsFailed())
+
+    result = llm_client.generate_json_content("prompt", schema=ToneAnalysis)
+
+    assert result["error"].startswith("Generation failed")
+    assert len(prompts) == 1
+
+
+def test_wrong_shaped_resume_parse_is_repaired_and_keeps_prompt_keys(monkeypatch):
+    wrapped = '{"resume": {"Name": "Alex", "Skills": ["Python"]}}'
+    prompts = stub_generate(monkeypatch, wrapped, '{"Name": "Alex", "Skills": ["Python"], "Education": "B.S."}')
+
+    result = llm_client.generate_json_content("prompt", schema=ResumeParse)
+
+    assert len(prompts) == 2
+    assert result["Name"] == "Alex"
+    assert result["Education"] == ["B.S."]
+    assert result["Work Experience"] == []
+
+
+def test_jd_parse_requires_role_and_required_skills(monkeypatch):
+    stub_generate(monkeypatch, '{"Domain": "Software"}', '{"Domain": "Software"}')
+
+    result = llm_client.generate_json_content("prompt", schema=JDParse)
+
+    assert result["error"] == "Invalid JSON from Groq"
@@ -0,0 +1,57 @@
+import time
+import asyncio
+import threading
+
+from backend.llm_scheduler import LLMScheduler, INTERACTIVE, STANDARD, BATCH
+
+
+def _limits(interactive=4, standard=4, batch=4):
+    return {INTERACTIVE: interactive, STANDARD: standard, BATCH: batch}
+
+
+def test_interactive_waiters_jump_ahead_of_batch():
+    scheduler = LLMScheduler(max_concurrency=1, class_limits=_limits())
+    order = []
+    release = threading.Event()
+
+    def hold():
+        with scheduler.slot(BATCH):
+            release.wait()
+
+    def run(priority):
+        with scheduler.slot(priority):
+            order.append(priority)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.05)
+    waiters = [threading.Thread(target=run, args=(p,)) for p in (BATCH, BATCH, INTERACTIVE)]
+    for t in waiters:
+        t.start()
+        time.sleep(0.02)
+    release.set()
+    for t in [holder] + waiters:
+        t.join()
+
+    assert order == [INTERACTIVE, BATCH, BATCH]
+
+
+def test_class_limit_does_not_block_other_classes():
+    scheduler = LLMScheduler(max_concurrency=3, class_limits=_limits(batch=1))
+
+    async def main():
+        async with scheduler.slot_async(BATCH):
+            blocked = asyncio.create_task(scheduler.slot_async(BATCH).__aenter__())
+            await asyncio.sleep(0.02)
+            assert not blocked.done()
+            async with scheduler.slot_async(INTERACTIVE):
+                snapshot = scheduler.snapshot()
+                assert snapshot["classes"][BATCH]["waiting"] == 1
+                assert snapshot["running"] == 2
+            blocked.cancel()
+        await asyncio.sleep(0)
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(main())
+    assert snapshot["running"] == 0
+    assert snapshot["classes"][BATCH]["waiting"] == 0
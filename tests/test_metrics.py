@@ -0,0 +1,29 @@
+import pytest
+
+from backend.metrics import MetricsRegistry
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    registry = MetricsRegistry()
+    retries = registry.counter("llm_retries_total", "Retries", ("model", "reason"))
+    latency = registry.histogram("llm_request_duration_seconds", "Latency", ("model",), buckets=(0.1, 1.0))
+
+    retries.inc(model="llama3-8b-8192", reason="429")
+    retries.inc(model="llama3-8b-8192", reason="429")
+    latency.observe(0.05, model="llama3-8b-8192")
+    latency.observe(0.5, model="llama3-8b-8192")
+
+    text = registry.render()
+    assert "# TYPE llm_retries_total counter" in text
+    assert 'llm_retries_total{model="llama3-8b-8192",reason="429"} 2' in text
+    assert 'llm_request_duration_seconds_bucket{model="llama3-8b-8192",le="0.1"} 1' in text
+    assert 'llm_request_duration_seconds_bucket{model="llama3-8b-8192",le="1.0"} 2' in text
+    assert 'llm_request_duration_seconds_bucket{model="llama3-8b-8192",le="+Inf"} 2' in text
+    assert 'llm_request_duration_seconds_count{model="llama3-8b-8192"} 2' in text
+
+
+def test_labels_must_match_declaration():
+    registry = MetricsRegistry()
+    counter = registry.counter("pdf_total", "PDFs", ("document",))
+    with pytest.raises(ValueError):
+        counter.inc(collection="sessions")
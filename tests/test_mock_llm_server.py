@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+pytest.importorskip("pydantic")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from fastapi.testclient import TestClient
+
+from backend import llm_client, mock_llm_server
+from backend import (behavioral_adjuster, gemini_resume_parser, interview_evaluator, jd_analyzer,
+                     profile_comparator, scoring_engine)
+from backend.llm_schemas import (AnswerAssessment, FeedbackQuality, HallucinationCheck, JDParse,
+                                 QuestionConsistency, ResumeParse, SkillsComparison, ToneAnalysis)
+from backend.prompt_registry import prompt_registry
+
+RESUME = "Alex Candidate, software engineer. Python, FastAPI, MongoDB."
+JD = "Backend Engineer at Example Corp. Python, SQL, Docker."
+
+
+def test_every_registered_prompt_has_a_canned_response():
+    for name in prompt_registry.versions():
+        template = prompt_registry.get(name)
+        prompt = template.render(**{placeholder: "text" for placeholder in template.placeholders})
+        call_site, _ = mock_llm_server.build_completion_text(prompt)
+        assert call_site != "unknown", name
+
+
+def test_json_call_sites_get_schema_valid_responses(monkeypatch):
+    # Each call site's real prompt goes through the mock and the client's own schema validation
+    calls = []
+
+    def generate_json_content(prompt, schema=None, **kwargs):
+        call_site, text = mock_llm_server.build_completion_text(prompt)
+        calls.append((call_site, schema))
+        return llm_client._parse_json_response(text, schema)
+
+    for module in (behavioral_adjuster, gemini_resume_parser, interview_evaluator, jd_analyzer,
+                   profile_comparator, scoring_engine):
+        monkeypatch.setattr(module, "generate_json_content", generate_json_content)
+
+    evaluator = interview_evaluator.InterviewEvaluator()
+    results = [
+        gemini_resume_parser.parse_resume_with_gemini(RESUME),
+        jd_analyzer.analyze_job_description(JD),
+        profile_comparator.compare_resume_to_jd(RESUME, JD),
+        scoring_engine.score_and_feedback("Tell me about FastAPI.", "I built REST APIs with it."),
+        evaluator.evaluate_question_consistency(["Tell me about FastAPI."], RESUME, JD),
+        evaluator.detect_hallucinations("Tell me about FastAPI.", {"resume": RESUME, "jd": JD}),
+        evaluator.evaluate_feedback_quality(["Quantify the impact."]),
+        behavioral_adjuster.detect_tone_and_suggest_style("I am sure it scales."),
+    ]
+
+    assert calls == [
+        ("resume", ResumeParse), ("jd", JDParse), ("skills", SkillsComparison), ("assessment", AnswerAssessment),
+        ("consistency", QuestionConsistency), ("hallucination", HallucinationCheck),
+        ("feedback_quality", FeedbackQuality), ("tone", ToneAnalysis),
+    ]
+    for result in results:
+        assert "error" not in result
+    assert results[0]["Work Experience"][0]["company"] == "Example Corp"
+    assert results[3]["feedback"]
+
+
+def test_config_values_are_cast_or_rejected(monkeypatch):
+    monkeypatch.setattr(mock_llm_server, "CONFIG", dict(mock_llm_server.CONFIG))
+    client = TestClient(mock_llm_server.app)
+
+    response = client.post("/mock/config", json={"latency_ms": "0", "rpm": "5", "failing_models": "a, b"})
+    assert response.status_code == 200
+    assert mock_llm_server.CONFIG["latency_ms"] == 0.0
+    assert mock_llm_server.CONFIG["rpm"] == 5
+    assert mock_llm_server.CONFIG["failing_models"] == ["a", "b"]
+
+    for invalid in ({"latency_ms": "fast"}, {"rate_429": 2}, {"latency_dist": "gaussian"}, {"rpm": None}):
+        response = client.post("/mock/config", json={"rate_500": 0.5, **invalid})
+        assert response.status_code == 400, invalid
+        assert response.json()["error"]["code"] == "invalid_config"
+    # Rejected updates change nothing, and the mock keeps serving
+    assert mock_llm_server.CONFIG["rate_500"] == 0
+    assert mock_llm_server.sample_latency() == 0.0
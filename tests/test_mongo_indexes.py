@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("dotenv")
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+from backend import mongo
+
+
+class FakeCollection:
+    def __init__(self, name, duplicates=False):
+        self.name = name
+        self.duplicates = duplicates
+        self.created = []
+
+    def create_index(self, keys, **options):
+        if options.get("unique") and self.duplicates:
+            raise OperationFailure("E11000 duplicate key error")
+        self.created.append((keys, options))
+        return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+def test_creates_every_index_with_its_options():
+    sessions = FakeCollection("sessions")
+    users = FakeCollection("users")
+
+    mongo.ensure_indexes([
+        (sessions, [("user_email", ASCENDING), ("created_at", DESCENDING)], {}),
+        (sessions, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+        (users, [("email", ASCENDING)], {"unique": True}),
+    ])
+
+    assert sessions.created == [
+        ([("user_email", ASCENDING), ("created_at", DESCENDING)], {}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ]
+    assert users.created == [([("email", ASCENDING)], {"unique": True})]
+
+
+def test_unique_index_over_duplicates_falls_back_to_non_unique():
+    users = FakeCollection("users", duplicates=True)
+
+    mongo.ensure_indexes([(users, [("email", ASCENDING)], {"unique": True})])
+
+    assert users.created == [([("email", ASCENDING)], {})]
+
+
+def test_failure_of_a_non_unique_index_is_raised():
+    class Failing(FakeCollection):
+        def create_index(self, keys, **options):
+            raise OperationFailure("bad index")
+
+    with pytest.raises(OperationFailure):
+        mongo.ensure_indexes([(Failing("sessions"), [("session_id", ASCENDING)], {})])
+
+
+def test_default_indexes_cover_the_hot_queries():
+    indexed = {(collection.name, tuple(field for field, _ in keys)) for collection, keys, _ in mongo.INDEXES}
+
+    for collection, query, sort in mongo.HOT_QUERIES.values():
+        fields = tuple(query) + tuple(field for field, _ in sort or [])
+        assert any(name == collection.name and keys[:len(fields)] == fields for name, keys in indexed), fields
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from backend.prompt_registry import PromptRegistry, PROMPTS_DIR
+
+
+def test_render_matches_replace_chain_for_shipped_prompts():
+    registry = PromptRegistry(PROMPTS_DIR)
+    values = {"RESUME_TEXT": "resume {{JD_TEXT}}", "JD_TEXT": "jd", "INTERVIEW_TRANSCRIPT": "Q: a\nA: b",
+              "QUESTION_TYPE": "behavioral"}
+    template = registry.get("prompts/question_generation_prompt.txt")
+
+    expected = template.text
+    for name in ("JD_TEXT", "INTERVIEW_TRANSCRIPT", "QUESTION_TYPE", "RESUME_TEXT"):
+        expected = expected.replace("{{" + name + "}}", values[name])
+    assert template.render(**values) == expected
+    assert set(registry.versions()) >= {"question_generation_prompt", "resume_parsing_prompt", "jd_parsing_prompt",
+                                        "skills_comparison_prompt"}
+
+    with pytest.raises(KeyError):
+        template.render(RESUME_TEXT="only one")
+
+
+def test_hot_reload_changes_version(tmp_path):
+    prompt = tmp_path / "greeting.txt"
+    prompt.write_text("Hello {{NAME}}", encoding="utf-8")
+    registry = PromptRegistry(str(tmp_path), reload_interval=0)
+    version = registry.version("greeting")
+    assert registry.render("greeting", NAME="Ada") == "Hello Ada"
+
+    prompt.write_text("Hi {{NAME}}!", encoding="utf-8")
+    os.utime(prompt, (prompt.stat().st_atime, prompt.stat().st_mtime + 5))
+    assert registry.render("greeting", NAME="Ada") == "Hi Ada!"
+    assert registry.version("greeting") != version
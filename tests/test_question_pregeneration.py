@@ -0,0 +1,104 @@
+import asyncio
+
+from backend.llm_scheduler import INTERACTIVE, STANDARD
+from backend.question_pregeneration import QuestionPregenerator
+
+QUESTION_TYPES = ["resume-based", "job-description-based", "follow-up", "behavioral"]
+
+
+def make_pregenerator(generate, regenerate_behavioral=False):
+    saved = {}
+
+    async def save(session_id, kind, text):
+        saved[(session_id, kind)] = text
+
+    return QuestionPregenerator(generate, save, regenerate_behavioral), saved
+
+
+def test_pregenerates_answer_independent_questions_and_greeting():
+    generated = []
+
+    async def generate(kind, resume_text, jd_text, priority):
+        generated.append(kind)
+        return f"{kind} text"
+
+    async def main():
+        pregenerator.start("s1", "resume", "jd", QUESTION_TYPES)
+        return await pregenerator.get("s1", {}, "resume-based"), await pregenerator.get("s1", {}, "follow-up")
+
+    pregenerator, saved = make_pregenerator(generate)
+    question, follow_up = asyncio.run(main())
+
+    assert question == "resume-based text"
+    assert follow_up is None  # Depends on the previous answer
+    assert sorted(generated) == ["behavioral", "greeting", "job-description-based", "resume-based"]
+    assert saved[("s1", "behavioral")] == "behavioral text"
+
+
+def test_stored_question_is_used_without_waiting():
+    async def generate(kind, resume_text, jd_text, priority):
+        raise AssertionError("should not generate")
+
+    pregenerator, _ = make_pregenerator(generate)
+    data = {"pregenerated": {"behavioral": "stored"}}
+
+    assert asyncio.run(pregenerator.get("s1", data, "behavioral")) == "stored"
+
+
+def test_failed_pregeneration_falls_back_to_live_generation():
+    async def generate(kind, resume_text, jd_text, priority):
+        await asyncio.sleep(0.01)
+        if kind == "greeting":
+            return None  # Unusable result
+        raise RuntimeError("all models failed")
+
+    async def live():
+        return "live question"
+
+    async def main():
+        pregenerator.start("s1", "resume", "jd", QUESTION_TYPES)
+        greeting = await pregenerator.get("s1", {}, "greeting")
+        question = await pregenerator.get("s1", {}, "resume-based") or await live()
+        return greeting, question
+
+    pregenerator, saved = make_pregenerator(generate)
+    greeting, question = asyncio.run(main())
+
+    assert greeting is None
+    assert question == "live question"
+    assert saved == {}
+
+
+def test_behavioral_question_is_regenerated_live_when_configured():
+    async def generate(kind, resume_text, jd_text, priority):
+        return f"{kind} text"
+
+    async def main():
+        pregenerator.start("s1", "resume", "jd", QUESTION_TYPES)
+        data = {"pregenerated": {"behavioral": "stale"}}
+        return await pregenerator.get("s1", data, "behavioral")
+
+    pregenerator, saved = make_pregenerator(generate, regenerate_behavioral=True)
+
+    assert asyncio.run(main()) is None
+    assert ("s1", "behavioral") not in saved
+
+
+def test_greeting_and_first_question_are_generated_at_interactive_priority():
+    priorities = {}
+
+    async def generate(kind, resume_text, jd_text, priority):
+        priorities[kind] = priority
+        return f"{kind} text"
+
+    async def main():
+        pregenerator.start("s1", "resume", "jd", QUESTION_TYPES)
+        for kind in ("greeting", "resume-based", "job-description-based", "behavioral"):
+            await pregenerator.get("s1", {}, kind)
+
+    pregenerator, _ = make_pregenerator(generate)
+    asyncio.run(main())
+
+    # /interview/start waits on these two; the rest can wait behind live interview calls
+    assert priorities == {"greeting": INTERACTIVE, "resume-based": INTERACTIVE,
+                          "job-description-based": STANDARD, "behavioral": STANDARD}
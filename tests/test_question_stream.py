@@ -0,0 +1,98 @@
+import os
+import json
+import asyncio
+
+import pytest
+
+from backend.question_stream import sse_event, question_events
+
+
+async def _chunks(*parts, fail_after=None):
+    for i, part in enumerate(parts):
+        if fail_after is not None and i == fail_after:
+            raise RuntimeError("model went away")
+        yield part
+
+
+def _collect(chunks, save):
+    async def run():
+        return [frame async for frame in question_events(chunks, save)]
+    return asyncio.run(run())
+
+
+def _parse(frame):
+    assert frame.endswith("\n\n")
+    lines = frame.rstrip("\n").split("\n")
+    event = lines[0][len("event: "):] if lines[0].startswith("event: ") else None
+    return event, json.loads(lines[-1][len("data: "):])
+
+
+def test_sse_event_framing():
+    assert sse_event({"token": "Hi"}) == 'data: {"token": "Hi"}\n\n'
+    assert sse_event({"question": "Q?"}, event="done") == 'event: done\ndata: {"question": "Q?"}\n\n'
+
+
+def test_tokens_then_done_after_question_is_saved():
+    saved = []
+
+    async def save(question):
+        saved.append(question)
+
+    frames = _collect(_chunks("What is ", "your ", "stack? "), save)
+    events = [_parse(frame) for frame in frames]
+
+    assert events[:3] == [(None, {"token": "What is "}), (None, {"token": "your "}), (None, {"token": "stack? "})]
+    assert events[3] == ("done", {"question": "What is your stack?"})
+    assert saved == ["What is your stack?"]
+
+
+def test_generation_error_sends_error_event_and_saves_nothing():
+    saved = []
+
+    async def save(question):
+        saved.append(question)
+
+    events = [_parse(frame) for frame in _collect(_chunks("What ", "is", fail_after=1), save)]
+
+    assert events[0] == (None, {"token": "What "})
+    assert events[-1][0] == "error"
+    assert "model went away" in events[-1][1]["error"]
+    assert saved == []
+
+
+def test_save_failure_sends_error_instead_of_done():
+    async def save(question):
+        raise KeyError("session expired")
+
+    events = [_parse(frame) for frame in _collect(_chunks("Why?"), save)]
+
+    assert [event for event, _ in events] == [None, "error"]
+    assert events[-1][1]["error"].startswith("Failed to save question")
+
+
+def test_all_models_failing_sends_error_event_and_saves_nothing(monkeypatch):
+    pytest.importorskip("requests")
+    pytest.importorskip("dotenv")
+    os.environ.setdefault("GROQ_API_KEY", "test-key")
+    from backend import llm_client
+
+    class OpenBreaker:
+        def allow_request(self):
+            return False
+
+    class OpenBreakers:
+        def get(self, model_name):
+            return OpenBreaker()
+
+    monkeypatch.setattr(llm_client, "breakers", OpenBreakers())
+    saved = []
+
+    async def save(question):
+        saved.append(question)
+
+    events = [_parse(frame) for frame in _collect(llm_client.stream_content_async("prompt"), save)]
+
+    # No error text is streamed as if it were the question
+    assert [event for event, _ in events] == ["error"]
+    assert "All Groq models failed" in events[0][1]["error"]
+    assert saved == []
@@ -0,0 +1,112 @@
+import pytest
+
+from backend.rate_limiter import (RateLimiter, MemoryBucketStore, FileBucketStore, RateLimitExceeded, fcntl,
+                                  parse_duration)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_request_bucket_refills_over_time():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBucketStore(), {"m": {"rpm": 2, "tpm": 1000}}, clock=clock)
+
+    assert limiter.try_acquire("m", 10) == 0
+    assert limiter.try_acquire("m", 10) == 0
+    wait_time = limiter.try_acquire("m", 10)
+    assert wait_time == pytest.approx(30.0)
+
+    clock.now += 30
+    assert limiter.try_acquire("m", 10) == 0
+
+
+def test_token_bucket_limits_large_prompts_and_refunds_usage():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBucketStore(), {"m": {"rpm": 100, "tpm": 600}}, clock=clock)
+
+    assert limiter.try_acquire("m", 500) == 0
+    assert limiter.try_acquire("m", 500) > 0
+
+    # Real usage was lower than reserved
+    limiter.consume("m", -400)
+    assert limiter.try_acquire("m", 500) == 0
+
+
+def test_acquire_raises_when_wait_exceeds_limit():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBucketStore(), {"m": {"rpm": 1, "tpm": 1000}}, clock=clock)
+    limiter.acquire("m", 1)
+
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("m", 1, max_wait=5)
+
+
+def test_parse_duration_formats():
+    assert parse_duration("12") == 12.0
+    assert parse_duration("7.66s") == pytest.approx(7.66)
+    assert parse_duration("2m59.56s") == pytest.approx(179.56)
+    assert parse_duration("120ms") == pytest.approx(0.12)
+    assert parse_duration("1h2m") == pytest.approx(3720.0)
+    assert parse_duration("soon") is None
+
+
+def test_429_blocks_model_until_reported_reset():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBucketStore(), {"m": {"rpm": 100, "tpm": 10000}}, clock=clock)
+
+    wait_time = limiter.observe_headers("m", {"Retry-After": "4"}, 429, default_wait=1.0)
+    assert wait_time == 4.0
+    assert limiter.try_acquire("m", 10) == pytest.approx(4.0)
+
+    clock.now += 4
+    assert limiter.try_acquire("m", 10) == 0
+
+
+def test_exhausted_server_quota_is_respected_before_a_429():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBucketStore(), {"m": {"rpm": 100, "tpm": 10000}}, clock=clock)
+
+    limiter.observe_headers("m", {
+        "x-ratelimit-remaining-requests": "1",
+        "x-ratelimit-reset-requests": "30s",
+        "x-ratelimit-remaining-tokens": "5000",
+        "x-ratelimit-reset-tokens": "6s",
+    })
+    assert limiter.try_acquire("m", 100) == 0
+    # The last reported request was just used; wait for the reset instead of sending a doomed call
+    assert limiter.try_acquire("m", 100) == pytest.approx(30.0)
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("m", 100, max_wait=5)
+
+    clock.now += 30
+    assert limiter.try_acquire("m", 100) == 0
+
+
+
+def test_zero_reset_does_not_block():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBucketStore(), {"m": {"rpm": 100, "tpm": 10000}}, clock=clock)
+
+    limiter.observe_headers("m", {
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "0s",
+    })
+
+    assert limiter.try_acquire("m", 100) == 0
+
+
+@pytest.mark.skipif(fcntl is None, reason="file store requires fcntl")
+def test_file_store_shares_budget_between_limiters(tmp_path):
+    clock = FakeClock()
+    state_file = str(tmp_path / "limits.json")
+    limits = {"m": {"rpm": 1, "tpm": 1000}}
+    first = RateLimiter(FileBucketStore(state_file), limits, clock=clock)
+    second = RateLimiter(FileBucketStore(state_file), limits, clock=clock)
+
+    assert first.try_acquire("m", 1) == 0
+    assert second.try_acquire("m", 1) > 0
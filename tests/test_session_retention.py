@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+from backend.session_retention import prune_user_sessions, sweep_old_sessions
+
+
+def matches(doc, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(field)
+            if value is None or not value < condition["$lt"]:
+                return False
+        elif doc.get(field) != condition:  # None also matches a missing field
+            return False
+    return True
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        # Mongo sorts null lowest, so descending order puts it last
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda d: (d.get(field) is not None, d.get(field) or 0), reverse=direction < 0)
+        return self
+
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.docs:
+            raise StopIteration
+        return self.docs.pop(0)
+
+
+class DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class FakeSessions:
+    """Evaluates the retention queries in memory and records every delete."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.deletes = []
+
+    def count_documents(self, query):
+        return sum(1 for doc in self.docs if matches(doc, query))
+
+    def find(self, query, projection=None):
+        return Cursor([doc for doc in self.docs if matches(doc, query)])
+
+    def aggregate(self, pipeline):
+        counts = {}
+        for doc in self.docs:
+            counts[doc.get("user_email")] = counts.get(doc.get("user_email"), 0) + 1
+        limit = pipeline[1]["$match"]["count"]["$gt"]
+        return [{"_id": email, "count": count} for email, count in counts.items() if count > limit]
+
+    def delete_many(self, query):
+        self.deletes.append(query)
+        kept = [doc for doc in self.docs if not matches(doc, query)]
+        deleted = len(self.docs) - len(kept)
+        self.docs = kept
+        return DeleteResult(deleted)
+
+    def delete_one(self, query):
+        raise AssertionError("retention must not delete documents one at a time")
+
+
+START = datetime(2026, 1, 1)
+
+
+def session(_id, user="a@x.com", minutes=None):
+    doc = {"_id": _id, "user_email": user}
+    if minutes is not None:
+        doc["created_at"] = START + timedelta(minutes=minutes)
+    return doc
+
+
+def test_keeps_most_recent_sessions_with_one_delete():
+    sessions = FakeSessions([session(i, minutes=i) for i in range(10)] + [session(100, user="b@x.com", minutes=0)])
+
+    assert prune_user_sessions(sessions, "a@x.com", keep=6) == (10, 4)
+
+    assert sorted(doc["_id"] for doc in sessions.docs) == [4, 5, 6, 7, 8, 9, 100]
+    assert len(sessions.deletes) == 1
+
+
+def test_cutoff_ties_are_broken_by_id_and_missing_dates_go_first():
+    # Three sessions share the cutoff timestamp; two have no created_at at all
+    docs = [session(1, minutes=0), session(2, minutes=5), session(3, minutes=5), session(4, minutes=5),
+            session(5, minutes=9), session(6), session(7)]
+    sessions = FakeSessions(docs)
+
+    assert prune_user_sessions(sessions, "a@x.com", keep=3) == (7, 4)
+
+    assert sorted(doc["_id"] for doc in sessions.docs) == [3, 4, 5]
+    assert len(sessions.deletes) == 1
+
+
+def test_cutoff_among_sessions_without_created_at():
+    sessions = FakeSessions([session(1, minutes=0), session(2), session(3), session(4)])
+
+    assert prune_user_sessions(sessions, "a@x.com", keep=3) == (4, 1)
+
+    assert sorted(doc["_id"] for doc in sessions.docs) == [1, 3, 4]
+
+
+def test_under_the_cap_deletes_nothing():
+    sessions = FakeSessions([session(i, minutes=i) for i in range(3)])
+
+    assert prune_user_sessions(sessions, "a@x.com", keep=6) == (3, 0)
+    assert sessions.deletes == []
+
+
+def test_sweep_prunes_every_user_over_the_cap():
+    docs = [session(i, minutes=i) for i in range(5)] + [session(10 + i, user="b@x.com", minutes=i) for i in range(2)]
+    sessions = FakeSessions(docs)
+
+    assert sweep_old_sessions(sessions, keep=2) == 3
+
+    assert sorted(doc["_id"] for doc in sessions.docs) == [3, 4, 10, 11]
+    assert len(sessions.deletes) == 1
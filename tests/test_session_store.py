@@ -0,0 +1,71 @@
+import pytest
+
+from backend.session_store import SessionStore, MemorySessionBackend, SessionConflict
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_workers_see_each_others_updates():
+    shared = MemorySessionBackend()
+    worker_a, worker_b = SessionStore(shared), SessionStore(shared)
+    worker_a.create("s1", {"index": 0, "transcript": [{"question": "Q1"}]})
+    assert worker_b.get("s1")["index"] == 0
+
+    worker_a.set_fields("s1", index=1)
+
+    # No per-worker copy: B reads A's write right away
+    assert worker_b.get("s1")["index"] == 1
+
+
+def test_concurrent_updates_from_two_workers_are_not_lost():
+    shared = MemorySessionBackend()
+    worker_a, worker_b = SessionStore(shared), SessionStore(shared)
+    worker_a.create("s1", {"index": 0, "transcript": [{"question": "Q1"}]})
+
+    def advance(session):
+        session["transcript"].append({"question": f"Q{session['index'] + 2}"})
+        session["index"] += 1
+
+    def advance_after_a(session):
+        if session["index"] == 0:
+            worker_a.update("s1", advance)  # A writes between B's read and B's compare-and-set
+        advance(session)
+
+    # B's first compare-and-set fails; it retries on A's version
+    data = worker_b.update("s1", advance_after_a)
+
+    assert data["index"] == 2
+    assert [t["question"] for t in data["transcript"]] == ["Q1", "Q2", "Q3"]
+    assert worker_a.get("s1") == data
+
+
+def test_update_can_reject_the_current_state():
+    store = SessionStore(MemorySessionBackend())
+    store.create("s1", {"index": 1})
+
+    def expect_index_zero(session):
+        if session["index"] != 0:
+            raise SessionConflict("already advanced")
+        session["index"] = 1
+
+    with pytest.raises(SessionConflict):
+        store.update("s1", expect_index_zero)
+    with pytest.raises(KeyError):
+        store.update("missing", expect_index_zero)
+
+
+def test_memory_backend_is_bounded_and_expires_idle_sessions():
+    clock = FakeClock()
+    store = SessionStore(MemorySessionBackend(max_entries=2, ttl=100, clock=clock))
+    for sid in ("a", "b", "c"):
+        store.create(sid, {"index": 0})
+    assert store.get("a") is None  # Evicted, least recently used
+
+    clock.now += 101
+    assert store.get("c") is None
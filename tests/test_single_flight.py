@@ -0,0 +1,89 @@
+import time
+import asyncio
+import threading
+
+from backend.single_flight import SingleFlight
+
+
+def test_concurrent_sync_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", work))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert not flight.in_flight("k")
+
+
+def test_async_callers_share_one_call_and_errors_propagate():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_leader_hands_over_to_a_waiter():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.create_task(flight.do_async("k", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.do_async("k", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        try:
+            await leader
+        except asyncio.CancelledError:
+            pass
+        return await follower
+
+    assert asyncio.run(main()) == 2
+    assert len(calls) == 2
+    assert not flight.in_flight("k")
+
+
+def test_cancelled_waiter_does_not_cancel_the_call():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def main():
+        leader = asyncio.create_task(flight.do_async("k", work))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.do_async("k", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await leader, await waiters[1], waiters[0].cancelled() or waiters[0].exception()
+
+    leader, waiter, first = asyncio.run(main())
+    assert leader == waiter == "ok"
+    assert first is True
@@ -0,0 +1,75 @@
+from backend.single_flight import SingleFlight
+from backend.skills_comparison import SkillsComparer, text_hash
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = []
+
+    def _match(self, query):
+        return next((doc for doc in self.docs if all(doc.get(k) == v for k, v in query.items())), None)
+
+    def find_one(self, query, projection=None):
+        return self._match(query)
+
+    def update_one(self, query, update, upsert=False):
+        doc = self._match(query)
+        if doc is None:
+            doc = dict(query)
+            self.docs.append(doc)
+        doc.update(update["$set"])
+
+
+def make_comparer(results, version="v1"):
+    calls = []
+
+    def compare(resume_text, jd_text, priority=None, cache=True):
+        calls.append({"priority": priority, "cache": cache})
+        return next(results)
+
+    collection = FakeCollection()
+    comparer = SkillsComparer(collection, SingleFlight(), compare, lambda: version)
+    return comparer, collection, calls
+
+
+def test_miss_compares_and_stores_then_hit_reuses_it():
+    comparer, collection, calls = make_comparer(iter([{"matched_skills": ["Python"]}]))
+
+    assert comparer.get("resume", "jd", priority="batch") == {"matched_skills": ["Python"]}
+    assert comparer.get("resume", "jd") == {"matched_skills": ["Python"]}
+
+    assert calls == [{"priority": "batch", "cache": True}]
+    assert len(collection.docs) == 1
+    assert collection.docs[0]["resume_hash"] == text_hash("resume")
+    assert collection.docs[0]["prompt_version"] == "v1"
+
+
+def test_failed_comparison_is_not_stored():
+    comparer, collection, calls = make_comparer(iter([{"error": "all models failed"}, {"matched_skills": []}]))
+
+    assert "error" in comparer.get("resume", "jd")
+    assert collection.docs == []
+    assert comparer.get("resume", "jd") == {"matched_skills": []}
+    assert len(calls) == 2
+
+
+def test_force_refresh_skips_and_replaces_the_stored_result():
+    comparer, collection, calls = make_comparer(iter([{"summary": "old"}, {"summary": "new"}]))
+    comparer.get("resume", "jd")
+
+    assert comparer.get("resume", "jd", force_refresh=True) == {"summary": "new"}
+
+    # The LLM response cache is bypassed too, and the refreshed result replaces the old one
+    assert calls[1]["cache"] is False
+    assert len(collection.docs) == 1
+    assert comparer.get("resume", "jd") == {"summary": "new"}
+
+
+def test_new_prompt_version_misses_the_cache():
+    comparer, collection, calls = make_comparer(iter([{"summary": "v1"}, {"summary": "v2"}]))
+    comparer.get("resume", "jd")
+
+    comparer.prompt_version = lambda: "v2"
+
+    assert comparer.get("resume", "jd") == {"summary": "v2"}
+    assert len(collection.docs) == 2
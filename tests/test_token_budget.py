@@ -0,0 +1,60 @@
+from backend.token_budget import count_tokens, trim_to_budget, truncate_words, trim_transcript
+
+
+RESUME = """Jane Doe
+jane@example.com
+
+SKILLS
+Python, SQL, AWS, Docker
+
+EXPERIENCE
+Backend engineer at Acme. """ + "Reduced API latency by forty percent. " * 80 + """
+
+HOBBIES
+""" + "Chess, hiking, reading. " * 80
+
+
+def test_short_text_is_untouched():
+    assert trim_to_budget("Python developer.", 100) == "Python developer."
+
+
+def test_trim_keeps_high_priority_sections_first():
+    trimmed = trim_to_budget(RESUME, 300)
+    assert count_tokens(trimmed) <= 300
+    assert "SKILLS" in trimmed
+    assert "EXPERIENCE" in trimmed
+    assert "HOBBIES" not in trimmed
+
+
+def test_truncate_words_never_cuts_mid_word():
+    text = "alpha beta gamma delta. " * 50
+    truncated = truncate_words(text, 30)
+    assert count_tokens(truncated) <= 30
+    assert truncated.endswith("delta.")
+
+
+def test_transcript_keeps_latest_answer():
+    transcript = [
+        {"question": "First question?", "answer": "old answer " * 300},
+        {"question": "Second question?", "answer": "recent answer " * 50},
+    ]
+    formatted = trim_transcript(transcript, 200)
+    assert "Q: First question?" in formatted
+    assert "old answer" not in formatted
+    assert "A: recent answer" in formatted
+
+
+def test_budgets_use_the_rate_limiter_estimate():
+    from backend.rate_limiter import estimate_tokens
+
+    text = "Reduced API latency by forty percent. " * 20
+    assert count_tokens(text) == estimate_tokens(text)
+    assert count_tokens("") == 0
+
+
+def test_parse_outputs_fit_a_long_resume():
+    from backend.token_budget import budget_for
+
+    # A parse repeats most of the resume as JSON, so its output cap can't be far below the input
+    assert budget_for("resume_parsing")["max_tokens"] >= budget_for("resume_parsing")["resume"]
+    assert budget_for("jd_parsing")["max_tokens"] >= 1500
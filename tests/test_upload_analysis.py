@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.executors import BoundedExecutor, ExecutorSaturated
+from backend.upload_analysis import UploadAnalyzer
+
+
+def test_parsing_and_comparison_run_concurrently():
+    # Each call only returns once all three are running at the same time
+    barrier = threading.Barrier(3, timeout=5)
+
+    def parse_resume(file_hash, text):
+        barrier.wait()
+        return {"resume": file_hash}
+
+    def parse_jd(file_hash, text):
+        barrier.wait()
+        return {"jd": file_hash}
+
+    def compare_skills(resume_text, jd_text):
+        barrier.wait()
+        return {"summary": f"{resume_text} vs {jd_text}"}
+
+    analyzer = UploadAnalyzer(BoundedExecutor("test", 3, 0), parse_resume, parse_jd, compare_skills)
+
+    result = asyncio.run(analyzer.analyze("r-hash", "resume", "j-hash", "jd"))
+
+    assert result == [{"resume": "r-hash"}, {"jd": "j-hash"}, {"summary": "resume vs jd"}]
+
+
+def test_event_loop_stays_responsive_during_analysis():
+    def slow(*args):
+        time.sleep(0.2)
+        return {}
+
+    analyzer = UploadAnalyzer(BoundedExecutor("test", 3, 0), slow, slow, slow)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await analyzer.analyze("r", "resume", "j", "jd")
+        elapsed = time.perf_counter() - start
+        task.cancel()
+        return ticks, elapsed
+
+    ticks, elapsed = asyncio.run(main())
+    assert ticks >= 5
+    assert elapsed < 0.5  # Roughly the slowest call, not the sum
+
+
+def test_saturated_executor_rejects_the_upload():
+    analyzer = UploadAnalyzer(BoundedExecutor("test", 1, 0), lambda *a: {}, lambda *a: {}, lambda *a: {})
+
+    with pytest.raises(ExecutorSaturated):
+        asyncio.run(analyzer.analyze("r", "resume", "j", "jd"))